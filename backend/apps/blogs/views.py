@@ -1,6 +1,6 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 from .models import Blog
 from .serializers import (
     BlogListSerializer, 
@@ -10,10 +10,11 @@ from .serializers import (
 from .permissions import IsAuthorOrReadOnly
 
 
-class BlogPagination(PageNumberPagination):
+class BlogPagination(CursorPagination):
     page_size = 5
     page_size_query_param = 'page_size'
     max_page_size = 20
+    ordering = ('-created_at', '-id')
 
 
 class BlogListCreateView(generics.ListCreateAPIView):
@@ -0,0 +1,143 @@
+import uuid
+
+from django.db import migrations
+
+# Database-side defaults for the added NOT NULL columns, so rows inserted
+# outside Django (Supabase, SQL scripts) keep working
+COLUMN_DEFAULTS = {
+    'first_name': "''",
+    'last_name': "''",
+    'is_staff': 'false',
+    'is_superuser': 'false',
+    'date_joined': 'now()',
+}
+
+
+def add_auth_columns(apps, schema_editor):
+    """Give an existing public.users the columns and join tables AbstractUser expects"""
+    User = apps.get_model('users', 'User')
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        existing = {column.name for column in
+                    connection.introspection.get_table_description(cursor, User._meta.db_table)}
+    added = []
+    for field in User._meta.local_fields:
+        if field.column not in existing:
+            schema_editor.add_field(User, field)
+            added.append(field.column)
+    if 'date_joined' in added:
+        schema_editor.execute("UPDATE users SET date_joined = created_at")
+    if connection.vendor == 'postgresql':
+        for column in added:
+            if column in COLUMN_DEFAULTS:
+                schema_editor.execute(
+                    f'ALTER TABLE users ALTER COLUMN {column} SET DEFAULT {COLUMN_DEFAULTS[column]}')
+
+    tables = connection.introspection.table_names()
+    for field in User._meta.local_many_to_many:
+        through = field.remote_field.through
+        if through._meta.db_table not in tables:
+            schema_editor.create_model(through)
+
+
+def copy_legacy_auth_users(apps, schema_editor):
+    """
+    Carry staff flags, admin accounts, groups and admin history over from
+    auth_user, matching accounts by email. auth_user itself is left in place.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql' or 'auth_user' not in connection.introspection.table_names():
+        return
+
+    schema_editor.execute("""
+        UPDATE users u
+        SET is_staff = a.is_staff, is_superuser = a.is_superuser,
+            last_login = GREATEST(u.last_login, a.last_login)
+        FROM auth_user a
+        WHERE a.email <> '' AND lower(a.email) = lower(u.email)
+    """)
+    # Admin-only accounts (createsuperuser) never had a public.users row
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT a.username, a.email, a.password, a.first_name, a.last_name, a.is_superuser,
+                   a.is_active, a.last_login, a.date_joined
+            FROM auth_user a
+            WHERE a.is_staff AND a.email <> ''
+              AND NOT EXISTS (SELECT 1 FROM users u WHERE lower(u.email) = lower(a.email))
+        """)
+        for row in cursor.fetchall():
+            cursor.execute("""
+                INSERT INTO users (id, username, email, password, name, first_name, last_name,
+                                   is_staff, is_superuser, is_active, last_login, date_joined, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, true, %s, %s, %s, %s, %s)
+                ON CONFLICT DO NOTHING
+            """, [str(uuid.uuid4()), row[0], row[1], row[2], f'{row[3]} {row[4]}'.strip(),
+                  *row[3:], row[8]])
+
+    schema_editor.execute("""
+        INSERT INTO users_groups (user_id, group_id)
+        SELECT u.id, g.group_id
+        FROM auth_user_groups g
+        JOIN auth_user a ON a.id = g.user_id
+        JOIN users u ON lower(u.email) = lower(a.email)
+        WHERE a.email <> ''
+        ON CONFLICT DO NOTHING
+    """)
+    schema_editor.execute("""
+        INSERT INTO users_user_permissions (user_id, permission_id)
+        SELECT u.id, p.permission_id
+        FROM auth_user_user_permissions p
+        JOIN auth_user a ON a.id = p.user_id
+        JOIN users u ON lower(u.email) = lower(a.email)
+        WHERE a.email <> ''
+        ON CONFLICT DO NOTHING
+    """)
+
+    # django_admin_log was created against auth_user's integer ids
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'django_admin_log' AND column_name = 'user_id'
+        """)
+        row = cursor.fetchone()
+        if not row or row[0] == 'uuid':
+            return
+        cursor.execute("""
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = 'public.django_admin_log'::regclass AND contype = 'f'
+              AND confrelid = 'public.auth_user'::regclass
+        """)
+        constraints = [name for name, in cursor.fetchall()]
+    for name in constraints:
+        schema_editor.execute(f'ALTER TABLE django_admin_log DROP CONSTRAINT "{name}"')
+    schema_editor.execute("ALTER TABLE django_admin_log ADD COLUMN user_uuid uuid")
+    schema_editor.execute("""
+        UPDATE django_admin_log l
+        SET user_uuid = u.id
+        FROM auth_user a
+        JOIN users u ON lower(u.email) = lower(a.email)
+        WHERE a.id = l.user_id AND a.email <> ''
+    """)
+    # Entries by accounts that could not be matched have no one to point at
+    schema_editor.execute("DELETE FROM django_admin_log WHERE user_uuid IS NULL")
+    schema_editor.execute("ALTER TABLE django_admin_log DROP COLUMN user_id")
+    schema_editor.execute("ALTER TABLE django_admin_log RENAME COLUMN user_uuid TO user_id")
+    schema_editor.execute("ALTER TABLE django_admin_log ALTER COLUMN user_id SET NOT NULL")
+    schema_editor.execute("""
+        ALTER TABLE django_admin_log ADD CONSTRAINT django_admin_log_user_id_fk_users_id
+        FOREIGN KEY (user_id) REFERENCES users(id) DEFERRABLE INITIALLY DEFERRED
+    """)
+    schema_editor.execute("CREATE INDEX django_admin_log_user_id_idx ON django_admin_log (user_id)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('admin', '0003_logentry_add_action_flag_choices'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_auth_columns, migrations.RunPython.noop),
+        migrations.RunPython(copy_legacy_auth_users, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,10 @@
 ASGI config for blog_api project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Served with blog_api.asgi_urls, where the feed, blog detail and wishlist
+GETs are async views on asyncpg:
+
+    uvicorn blog_api.asgi:application --workers 4
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +16,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_api.settings')
+os.environ.setdefault('ROOT_URLCONF', 'blog_api.asgi_urls')
 
 application = get_asgi_application()
\ No newline at end of file
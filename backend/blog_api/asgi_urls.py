@@ -0,0 +1,18 @@
+from django.urls import path
+
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+# ========================================
+# 🌐 URL PATTERNS (ASGI)
+# ========================================
+#
+# blog_api.urls with the hot read endpoints swapped for their async
+# versions. asgi.py selects this urlconf; WSGI keeps blog_api.urls.
+
+urlpatterns = [
+    path('api/blogs/', async_views.blogs_view, name='blogs'),
+    path('api/blogs/<uuid:blog_id>/', async_views.blog_detail_view, name='blog-detail'),
+    path('api/user/wishlist/', async_views.user_wishlist_view, name='user-wishlist'),
+    *sync_urlpatterns,
+]
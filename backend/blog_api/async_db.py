@@ -0,0 +1,142 @@
+import asyncio
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncpg
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from . import request_timing
+from .queries import numbered, row_type
+
+# ========================================
+# ⚡ ASYNC DATABASE ACCESS (ASGI)
+# ========================================
+#
+# The async read views (async_views.py) query Postgres through asyncpg on
+# its own pool, one per event loop, so a request waiting on the database
+# holds no thread. The pool is separate from the psycopg2 pool in
+# db_pool.py: ASYNC_DB_POOL_MIN..ASYNC_DB_POOL_MAX connections per ASGI
+# worker, idle ones closed after ASYNC_DB_IDLE_LIFETIME seconds.
+#
+# Anything still synchronous (per-user flags, the DRF views for writes,
+# file/redis cache lookups) goes through run_sync: a fixed pool of
+# SYNC_TO_ASYNC_THREADS threads, instead of a thread per request.
+# Connections those calls open are handed back to db_pool when each call
+# returns.
+
+ASYNC_DB_POOL_MIN = getattr(settings, 'ASYNC_DB_POOL_MIN', 1)
+ASYNC_DB_POOL_MAX = getattr(settings, 'ASYNC_DB_POOL_MAX', 10)
+ASYNC_DB_IDLE_LIFETIME = getattr(settings, 'ASYNC_DB_IDLE_LIFETIME', 300)
+ASYNC_DB_TIMEOUT = getattr(settings, 'DB_POOL_TIMEOUT', 10)
+SYNC_TO_ASYNC_THREADS = getattr(settings, 'SYNC_TO_ASYNC_THREADS', 8)
+# locmem is an in-process dict: reading it never blocks the event loop
+LOCAL_CACHE = getattr(settings, 'CACHE_BACKEND', 'locmem') == 'locmem'
+
+_executor = ThreadPoolExecutor(max_workers=SYNC_TO_ASYNC_THREADS, thread_name_prefix='sync-to-async')
+
+# event loop -> task creating (then holding) that loop's pool
+_pools = weakref.WeakKeyDictionary()
+
+def _connect_kwargs():
+    db = settings.DATABASES['default']
+    kwargs = {
+        'host': db.get('HOST') or None,
+        'port': int(db['PORT']) if db.get('PORT') else None,
+        'user': db.get('USER') or None,
+        'password': db.get('PASSWORD') or None,
+        'database': db.get('NAME'),
+    }
+    sslmode = db.get('OPTIONS', {}).get('sslmode')
+    if sslmode:
+        kwargs['ssl'] = sslmode
+    return kwargs
+
+
+async def _create_pool():
+    return await asyncpg.create_pool(
+        min_size=ASYNC_DB_POOL_MIN,
+        max_size=ASYNC_DB_POOL_MAX,
+        max_inactive_connection_lifetime=ASYNC_DB_IDLE_LIFETIME,
+        **_connect_kwargs(),
+    )
+
+
+async def get_pool():
+    loop = asyncio.get_running_loop()
+    task = _pools.get(loop)
+    if task is None:
+        task = _pools[loop] = loop.create_task(_create_pool())
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        # Let the next request retry instead of caching the failure
+        if _pools.get(loop) is task:
+            del _pools[loop]
+        raise
+
+
+def _record_query(started):
+    # Counted into the request's Server-Timing like Django's queries are
+    timing = request_timing.current()
+    if timing is not None:
+        timing.add_query(time.perf_counter() - started)
+
+
+async def fetch_all(query, params=(), **fragments):
+    """All rows of a queries.py ``query`` as typed tuples, like queries.fetch_all"""
+    pool = await get_pool()
+    async with pool.acquire(timeout=ASYNC_DB_TIMEOUT) as connection:
+        started = time.perf_counter()
+        records = await connection.fetch(numbered(query.render(**fragments)), *params)
+        _record_query(started)
+    if not records:
+        return []
+    make = row_type(tuple(records[0].keys()))._make
+    return [make(record) for record in records]
+
+
+async def fetch_one(query, params=(), **fragments):
+    pool = await get_pool()
+    async with pool.acquire(timeout=ASYNC_DB_TIMEOUT) as connection:
+        started = time.perf_counter()
+        record = await connection.fetchrow(numbered(query.render(**fragments)), *params)
+        _record_query(started)
+    return row_type(tuple(record.keys()))._make(record) if record is not None else None
+
+
+def _call_and_release(fn, *args, **kwargs):
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+async def run_sync(fn, *args, **kwargs):
+    """Run blocking ``fn`` on the bounded sync-to-async threads"""
+    return await sync_to_async(_call_and_release, thread_sensitive=False, executor=_executor)(
+        fn, *args, **kwargs)
+
+
+async def run_cache(fn, *args):
+    """Run ``fn``, which only touches the cache: inline on locmem, else via run_sync"""
+    if LOCAL_CACHE:
+        return fn(*args)
+    return await run_sync(fn, *args)
+
+
+def pool_stats():
+    """Sizes of the asyncpg pools in this process"""
+    stats = []
+    for task in list(_pools.values()):
+        if task.done() and not task.cancelled() and task.exception() is None:
+            pool = task.result()
+            stats.append({
+                'size': pool.get_size(),
+                'idle': pool.get_idle_size(),
+                'min_size': pool.get_min_size(),
+                'max_size': pool.get_max_size(),
+            })
+    return stats
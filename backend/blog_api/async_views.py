@@ -0,0 +1,238 @@
+from functools import wraps
+
+from django.conf import settings
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.request import Request
+
+from . import urls
+from .async_db import fetch_all, fetch_one, run_cache, run_sync
+from .authentication import ClaimsJWTAuthentication, current_user
+from .conditional import compute_etag, compute_last_modified, is_conditional, not_modified_response, set_validators
+from .fields import (
+    VALIDATOR_COLUMNS, InvalidFields, parse_fields, project, row_to_dict, select_fragments, selected_columns,
+)
+from .health import get_table_stats
+from .pagination import InvalidCursor, build_page_link, get_page_size, keyset_clause
+from .personalization import overlay_user_flags
+from .queries import BLOG_DETAIL, BLOG_VALIDATORS, FEED_PAGE, WISHLIST_BLOGS, blog_detail
+from .renderers import FastJSONResponse
+from .response_cache import blog_detail_key, feed_page_key, get_cached, set_cached, set_cached_feed_page
+from .view_counts import view_buffer
+
+# ========================================
+# ⚡ ASYNC READ VIEWS (ASGI)
+# ========================================
+#
+# Async GET paths for the feed, blog detail and wishlist, routed by
+# asgi_urls.py when the app runs under an ASGI server. They return the
+# same JSON as the DRF views in urls.py; other methods (and ?ids= bulk
+# reads) are handed to those DRF views on the sync_to_async threads.
+# DRF 3.14 has no async views, so these are plain Django async views that
+# borrow DRF's Request for query_params and JWT authentication.
+
+
+def _authenticate(request):
+    """DRF Request for ``request``; raises APIException for a bad token"""
+    drf_request = Request(request, authenticators=[ClaimsJWTAuthentication()])
+    drf_request.user  # authenticate now, not at first use
+    return drf_request
+
+
+def _error_response(exc):
+    detail = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+    response = FastJSONResponse(detail, status=exc.status_code)
+    if exc.status_code == 401:
+        response['WWW-Authenticate'] = ClaimsJWTAuthentication().authenticate_header(None)
+    return response
+
+
+def _rendered(view, request, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+def async_get(sync_view, fallback=None):
+    """
+    Serve GET with the decorated coroutine and every other method (or any
+    request ``fallback`` picks) with ``sync_view``.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method != 'GET' or (fallback and fallback(request)):
+                return await run_sync(_rendered, sync_view, request, *args, **kwargs)
+            try:
+                drf_request = _authenticate(request)
+            except APIException as e:
+                return _error_response(e)
+            return await handler(drf_request, *args, **kwargs)
+        # DRF's views are CSRF-exempt and so must the write methods passed through be
+        view.csrf_exempt = True
+        return view
+    return decorator
+
+
+def _lookup_feed_page(page_size, page_cursor, columns):
+    page_key = feed_page_key(page_size, page_cursor, variant=','.join(columns))
+    return page_key, get_cached(page_key)
+
+
+def _lookup_blog(blog_id):
+    detail_key = blog_detail_key(blog_id)
+    return detail_key, get_cached(detail_key)
+
+
+def _current_user_id(request):
+    user_data = current_user(request)
+    return user_data['id'] if user_data else None
+
+
+async def _overlay_user_flags(blogs, user_id):
+    # Signed-in readers may need their liked/wishlisted sets loaded from the database
+    if user_id:
+        await run_sync(overlay_user_flags, blogs, user_id)
+    else:
+        overlay_user_flags(blogs, None)
+
+
+async def _not_modified_for(request, blogs, user_id):
+    await _overlay_user_flags(blogs, user_id)
+    return not_modified_response(request, compute_etag(blogs), compute_last_modified(blogs))
+
+
+@async_get(urls.blogs_view, fallback=lambda request: 'ids' in request.GET)
+async def blogs_view(request):
+    """Blog List - GET (async)"""
+    try:
+        current_user_id = _current_user_id(request)
+
+        page_size = get_page_size(request)
+        page_cursor = request.query_params.get('cursor')
+        try:
+            keyset_sql, order_sql, keyset_params, direction = keyset_clause(page_cursor)
+        except InvalidCursor:
+            return FastJSONResponse({'error': 'Invalid cursor'}, status=400)
+
+        try:
+            fields = parse_fields(request.query_params.get('fields'))
+        except InvalidFields as e:
+            return FastJSONResponse({'error': str(e)}, status=400)
+        columns = selected_columns(fields)
+
+        page_key, cached_page = await run_cache(_lookup_feed_page, page_size, page_cursor, columns)
+        if cached_page is not None:
+            blogs, next_cursor, prev_cursor = cached_page
+        else:
+            feed_params = [*keyset_params, page_size + 1]
+            if is_conditional(request):
+                rows = await fetch_all(FEED_PAGE, feed_params, keyset=keyset_sql, order=order_sql,
+                                       **select_fragments(VALIDATOR_COLUMNS))
+                probe, _, _ = urls.feed_page(VALIDATOR_COLUMNS, rows, page_size, direction, page_cursor)
+                not_modified = await _not_modified_for(request, probe, current_user_id)
+                if not_modified is not None:
+                    return not_modified
+
+            rows = await fetch_all(FEED_PAGE, feed_params,
+                                   keyset=keyset_sql, order=order_sql, **select_fragments(columns))
+            blogs, next_cursor, prev_cursor = urls.feed_page(columns, rows, page_size, direction, page_cursor)
+            await run_cache(set_cached_feed_page, page_key, (blogs, next_cursor, prev_cursor))
+
+        await _overlay_user_flags(blogs, current_user_id)
+
+        etag = compute_etag(blogs)
+        last_modified = compute_last_modified(blogs)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        data = {
+            'count': len(blogs),
+            'next': build_page_link(request, next_cursor),
+            'previous': build_page_link(request, prev_cursor),
+            'page_size': page_size,
+            'results': [project(blog, fields) for blog in blogs],
+        }
+        if settings.FEED_DEBUG_INFO:
+            data['debug_info'] = {
+                'message': f'Successfully loaded {len(blogs)} blogs from Supabase!',
+                'table_stats': await run_sync(get_table_stats),
+                'current_user_authenticated': bool(current_user_id),
+                'current_user_id': current_user_id
+            }
+
+        return set_validators(FastJSONResponse(data), etag, last_modified)
+
+    except Exception as e:
+        return FastJSONResponse({
+            'count': 0,
+            'results': [],
+            'error': {
+                'message': 'Database connection failed',
+                'details': str(e),
+                'suggestion': 'Check your DATABASE_URL in .env file'
+            }
+        }, status=500)
+
+
+@async_get(urls.blog_detail_view)
+async def blog_detail_view(request, blog_id):
+    """Blog Detail - GET (async)"""
+    current_user_id = _current_user_id(request)
+
+    detail_key, blog = await run_cache(_lookup_blog, blog_id)
+    if blog is None:
+        if is_conditional(request):
+            row = await fetch_one(BLOG_VALIDATORS, [blog_id])
+            if not row:
+                return FastJSONResponse({'error': 'Blog not found'}, status=404)
+            not_modified = await _not_modified_for(request, [row._asdict()], current_user_id)
+            if not_modified is not None:
+                view_buffer.record(blog_id)
+                return not_modified
+
+        row = await fetch_one(BLOG_DETAIL, [blog_id])
+        if not row:
+            return FastJSONResponse({'error': 'Blog not found'}, status=404)
+        blog = blog_detail(row)
+        await run_cache(set_cached, detail_key, blog)
+
+    # In-memory only: the flusher thread writes the counts
+    view_buffer.record(blog_id)
+
+    await _overlay_user_flags([blog], current_user_id)
+
+    etag = compute_etag([blog])
+    last_modified = compute_last_modified([blog])
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    return set_validators(FastJSONResponse(blog), etag, last_modified)
+
+
+@async_get(urls.user_wishlist_view)
+async def user_wishlist_view(request):
+    """User Wishlist - GET (async)"""
+    user_data = current_user(request)
+    if not user_data:
+        return _error_response(NotAuthenticated())
+
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except InvalidFields as e:
+        return FastJSONResponse({'error': str(e)}, status=400)
+    columns = selected_columns(fields)
+
+    rows = await fetch_all(WISHLIST_BLOGS, [user_data['id']], **select_fragments(columns))
+    blogs = [row_to_dict(columns, row) for row in rows]
+
+    await _overlay_user_flags(blogs, user_data['id'])
+    blogs = [project(blog, fields) for blog in blogs]
+
+    return FastJSONResponse({
+        'count': len(blogs),
+        'results': blogs,
+        'message': f'Found {len(blogs)} blogs in your wishlist'
+    })
@@ -0,0 +1,48 @@
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# ========================================
+# 🔐 STATELESS JWT AUTHENTICATION
+# ========================================
+#
+# Tokens carry the public.users id, username, name and email as claims,
+# so authenticating a request is a signature check: no auth_user lookup
+# and no get_user_by_email. request.user is simplejwt's TokenUser, which
+# reads the claims straight from the token. A deactivated account keeps
+# working until its access token expires (ACCESS_TOKEN_LIFETIME).
+
+USER_CLAIMS = ('username', 'name', 'email')
+
+
+def tokens_for_user(user_data):
+    """Refresh token (and, via .access_token, access token) for a public.users row dict"""
+    refresh = RefreshToken()
+    refresh[api_settings.USER_ID_CLAIM] = user_data['id']
+    for claim in USER_CLAIMS:
+        refresh[claim] = user_data[claim] or ''
+    return refresh
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """JWT authentication that builds request.user from the token alone"""
+
+    def get_user(self, validated_token):
+        # Tokens minted before the claims existed point at auth_user ids
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            raise InvalidToken('Token has no user claims - please log in again')
+        return super().get_user(validated_token)
+
+
+def current_user(request):
+    """The signed-in user as a user_data-style dict, or None - no database access"""
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    return {
+        'id': str(user.id),
+        'username': user.username,
+        'name': user.name,
+        'email': user.email,
+    }
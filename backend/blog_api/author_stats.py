@@ -0,0 +1,83 @@
+from .fields import row_to_dict, select_fragments
+from .pagination import keyset_clause, paginate_rows
+from .queries import (
+    ADD_AUTHOR_VIEWS, ADJUST_AUTHOR_STATS, AUTHOR_POSTS, AUTHOR_PROFILE, LOCK_AUTHOR_STATS,
+    RECOUNT_AUTHORS, execute, fetch_all, fetch_one,
+)
+
+# ========================================
+# 📊 AUTHOR STATS
+# ========================================
+#
+# public.author_stats keeps per-author totals next to the writes that move
+# them, so the author page reads one row instead of COUNT/SUM over blogs:
+#   * posts_count    - blog create / delete (adjust_author_stats)
+#   * likes_received - like / unlike, in the counters.py CTEs
+#   * total_views    - every view_counts flush (add_author_views)
+# Totals cover the author's current posts; deleting a post takes its likes
+# and views with it. `python manage.py reconcile_counters` repairs drift.
+
+
+def adjust_author_stats(cursor, author_id, posts=0, likes=0, views=0):
+    """Shift an author's totals; run in the same transaction as the change"""
+    execute(cursor, ADJUST_AUTHOR_STATS, [author_id, posts, likes, views, posts, likes, views])
+
+
+def add_author_views(cursor, view_rows):
+    """
+    Fold a view-count flush into the authors' totals.
+
+    ``view_rows`` is the flush's sorted [(blog_id, views)]; authors are
+    upserted in id order so concurrent flushes lock rows in the same order.
+    """
+    blog_ids, views = zip(*view_rows)
+    execute(cursor, ADD_AUTHOR_VIEWS, [list(blog_ids), list(views)])
+
+
+def fetch_author_profile(cursor, username):
+    """Public profile plus totals for an active user, or None - one indexed read"""
+    row = fetch_one(cursor, AUTHOR_PROFILE, [username])
+    if not row:
+        return None
+    return {
+        'id': row.id,
+        'username': row.username,
+        'name': row.name,
+        'created_at': row.created_at,
+        'posts_count': row.posts_count,
+        'likes_received': row.likes_received,
+        'total_views': row.total_views,
+        'followers_count': row.followers_count,
+    }
+
+
+def fetch_author_posts(cursor, author_id, columns, page_cursor, page_size):
+    """
+    One keyset page of an author's published posts, newest first.
+
+    Served by the partial blogs_author_published_created_id_idx. Returns
+    (blogs, next_cursor, prev_cursor); raises InvalidCursor for foreign
+    cursors.
+    """
+    keyset_sql, order_sql, keyset_params, direction = keyset_clause(page_cursor)
+    rows = fetch_all(cursor, AUTHOR_POSTS, [author_id, *keyset_params, page_size + 1],
+                     keyset=keyset_sql, order=order_sql, **select_fragments(columns))
+
+    rows, next_cursor, prev_cursor = paginate_rows(
+        rows, page_size, direction,
+        has_cursor=page_cursor is not None,
+        position=lambda row: (row.created_at, row.id),
+    )
+    return [row_to_dict(columns, row) for row in rows], next_cursor, prev_cursor
+
+
+def reconcile_author_batch(cursor, user_ids):
+    """
+    Recompute totals for a batch of users and fix rows that drifted.
+
+    Existing rows are locked first, so a like committed during the recount
+    waits and then applies its +1 on top of the fixed value. Returns the
+    ids that were corrected.
+    """
+    execute(cursor, LOCK_AUTHOR_STATS, [user_ids])
+    return [row.user_id for row in fetch_all(cursor, RECOUNT_AUTHORS, [user_ids])]
@@ -0,0 +1,114 @@
+import numpy as np
+
+# ========================================
+# 🤝 CO-LIKE COUNTS (OFFLINE)
+# ========================================
+#
+# Offline half of "readers who liked this also liked" (see colikes.py for
+# the read side). public.likes is a sparse user x blog matrix; the job
+# keeps it as two int32 arrays (user, blog) sorted by user, newest like
+# first, and counts how often each ordered pair of blogs shares a reader.
+#
+# Memory is bounded twice over:
+#   * pairs are generated for a slice of users at a time, at most
+#     pair_budget pairs per slice;
+#   * pair counts are accumulated as sorted int64 keys (a * n_blogs + b)
+#     plus int32 counts, for one partition of first-blogs (a % partitions)
+#     at a time, so the accumulator holds ~1/partitions of all pairs.
+# Very active readers only contribute their max_per_user newest likes,
+# which stops a single account from generating quadratic noise.
+
+
+def cap_per_user(users, items, max_per_user):
+    """Keep each user's first ``max_per_user`` likes (arrays sorted by user, newest first)"""
+    if len(users) == 0:
+        return users, items
+    starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]])
+    sizes = np.diff(np.r_[starts, len(users)])
+    rank = np.arange(len(users)) - np.repeat(starts, sizes)
+    keep = rank < max_per_user
+    return users[keep], items[keep]
+
+
+def iter_pairs(users, items, pair_budget):
+    """
+    Yield (left, right) arrays of every ordered blog pair liked by one user.
+
+    Whole users are grouped so each yield holds at most ``pair_budget``
+    pairs (a single user larger than that is yielded alone).
+    """
+    if len(users) == 0:
+        return
+    starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]])
+    sizes = np.diff(np.r_[starts, len(users)])
+    pair_totals = np.cumsum(sizes.astype(np.int64) ** 2)
+
+    first = 0
+    while first < len(starts):
+        done = pair_totals[first - 1] if first else 0
+        last = max(first + 1, int(np.searchsorted(pair_totals, done + pair_budget, side='right')))
+        group_sizes = sizes[first:last]
+        begin = starts[first]
+        end = starts[last] if last < len(starts) else len(users)
+        chunk = items[begin:end]
+
+        # Every like is paired with every like of the same user
+        repeats = np.repeat(group_sizes, group_sizes)
+        left = np.repeat(chunk, repeats)
+        group_starts = np.repeat(starts[first:last] - begin, group_sizes)
+        offsets = np.arange(len(left)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        right = chunk[np.repeat(group_starts, repeats) + offsets]
+
+        distinct = left != right
+        yield left[distinct], right[distinct]
+        first = last
+
+
+def merge_counts(keys, counts, new_keys, new_counts):
+    """Add (new_keys, new_counts) into sorted (keys, counts); returns the merged pair"""
+    all_keys = np.concatenate([keys, new_keys])
+    all_counts = np.concatenate([counts, new_counts])
+    order = np.argsort(all_keys, kind='stable')
+    all_keys, all_counts = all_keys[order], all_counts[order]
+    if len(all_keys) == 0:
+        return all_keys, all_counts
+    starts = np.flatnonzero(np.r_[True, all_keys[1:] != all_keys[:-1]])
+    return all_keys[starts], np.add.reduceat(all_counts, starts).astype(np.int32)
+
+
+def count_partition(users, items, n_items, partition, partitions, pair_budget):
+    """Co-like counts for pairs whose first blog falls in ``partition``"""
+    keys = np.zeros(0, dtype=np.int64)
+    counts = np.zeros(0, dtype=np.int32)
+    for left, right in iter_pairs(users, items, pair_budget):
+        mine = left % partitions == partition
+        pair_keys = left[mine].astype(np.int64) * n_items + right[mine]
+        pair_keys, pair_counts = np.unique(pair_keys, return_counts=True)
+        keys, counts = merge_counts(keys, counts, pair_keys, pair_counts.astype(np.int32))
+    return keys, counts
+
+
+def top_n(keys, counts, n_items, n, min_count):
+    """
+    Best ``n`` partners per first blog, by count then partner index.
+
+    Returns (blog, partner, count) arrays grouped by blog, best first.
+    """
+    blogs, partners = keys // n_items, keys % n_items
+    order = np.lexsort((partners, -counts, blogs))
+    blogs, partners, counts = blogs[order], partners[order], counts[order]
+    if len(blogs) == 0:
+        return blogs, partners, counts
+    starts = np.flatnonzero(np.r_[True, blogs[1:] != blogs[:-1]])
+    rank = np.arange(len(blogs)) - np.repeat(starts, np.diff(np.r_[starts, len(blogs)]))
+    keep = (rank < n) & (counts >= min_count)
+    return blogs[keep], partners[keep], counts[keep]
+
+
+def estimated_pairs(users):
+    """Upper bound on ordered pairs the (capped) likes can generate"""
+    if len(users) == 0:
+        return 0
+    starts = np.flatnonzero(np.r_[True, users[1:] != users[:-1]])
+    sizes = np.diff(np.r_[starts, len(users)]).astype(np.int64)
+    return int(np.sum(sizes * (sizes - 1)))
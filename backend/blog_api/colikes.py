@@ -0,0 +1,61 @@
+from django.conf import settings
+
+from .queries import (
+    COLIKE_WATERMARK, COLIKES_FOR_BLOG, INSERT_COLIKES, SET_COLIKE_WATERMARK, TRIM_COLIKES,
+    execute, fetch_all, fetch_one,
+)
+
+# ========================================
+# 🤝 "READERS WHO LIKED THIS ALSO LIKED"
+# ========================================
+#
+# public.blog_colikes holds each blog's top-N co-liked blogs, built by
+# `python manage.py build_colikes` (NumPy, see colike_matrix.py). Serving
+# them is one index range scan; the lists only change when the job runs,
+# so responses are publicly cacheable for COLIKE_CACHE_SECONDS.
+#
+# `--incremental` folds in likes created since the last run (tracked by a
+# (created_at, id) watermark). Unlikes are not subtracted and pairs that
+# were below a list's cut-off restart from the new likes only, so a
+# periodic full build remains the source of truth.
+
+COLIKE_TOP_N = getattr(settings, 'COLIKE_TOP_N', 20)
+COLIKE_CACHE_SECONDS = getattr(settings, 'COLIKE_CACHE_SECONDS', 900)
+
+
+def fetch_colikes(cursor, blog_id, limit):
+    """[(related_id, co_likes)] best first, from blog_colikes_lookup_idx"""
+    return [(row.related_id, row.co_likes)
+            for row in fetch_all(cursor, COLIKES_FOR_BLOG, [blog_id, limit])]
+
+
+def get_watermark(cursor, for_update=False):
+    """(created_at, like_id) of the newest like already counted, or (None, None)"""
+    lock_sql = 'FOR UPDATE' if for_update else ''
+    row = fetch_one(cursor, COLIKE_WATERMARK, lock=lock_sql)
+    return (row.last_created_at, row.last_like_id) if row else (None, None)
+
+
+def set_watermark(cursor, created_at, like_id):
+    execute(cursor, SET_COLIKE_WATERMARK, [created_at, like_id])
+
+
+def insert_colikes(cursor, rows, increment=False, batch_size=1000):
+    """
+    Write (blog_id, related_id, co_likes) rows.
+
+    With ``increment`` the counts are added to existing pairs. Rows for
+    blogs deleted since the likes were read are skipped.
+    """
+    conflict_sql = ('ON CONFLICT (blog_id, related_id) DO UPDATE '
+                    'SET co_likes = blog_colikes.co_likes + EXCLUDED.co_likes'
+                    if increment else '')
+    for start in range(0, len(rows), batch_size):
+        blog_ids, related_ids, co_likes = zip(*rows[start:start + batch_size])
+        execute(cursor, INSERT_COLIKES, [list(blog_ids), list(related_ids), list(co_likes)],
+                conflict=conflict_sql)
+
+
+def trim_colikes(cursor, blog_ids, n):
+    """Cut the given blogs' lists back to their best ``n``"""
+    execute(cursor, TRIM_COLIKES, [list(blog_ids), n])
@@ -0,0 +1,88 @@
+import uuid
+
+from .counters import adjust_comments_count
+from .pagination import keyset_clause, paginate_rows
+from .queries import COMMENT_AUTHORS, COMMENT_CREATE, COMMENTS_PAGE, fetch_all, fetch_one
+from .trending import COMMENT_WEIGHT, bump_trending
+
+# ========================================
+# 💬 COMMENT THREADS
+# ========================================
+#
+# Comments are listed newest first with the same (created_at, id) keyset
+# cursors as the feed, served by comments_blog_created_id_idx, so page 500
+# of a 100k-comment thread costs the same as page 1. Authors are hydrated
+# with one users query per page, not a JOIN per row.
+
+MAX_COMMENT_LENGTH = 5000
+
+
+def fetch_comments_page(cursor, blog_id, page_cursor, page_size):
+    """
+    One page of a blog's comments.
+
+    Returns (comments, next_cursor, prev_cursor); authors are not attached.
+    Raises InvalidCursor for cursors we did not issue.
+    """
+    keyset_sql, order_sql, keyset_params, direction = keyset_clause(
+        page_cursor, created_col='c.created_at', id_col='c.id')
+    rows = fetch_all(cursor, COMMENTS_PAGE, [blog_id, *keyset_params, page_size + 1],
+                     keyset=keyset_sql, order=order_sql)
+
+    rows, next_cursor, prev_cursor = paginate_rows(
+        rows, page_size, direction,
+        has_cursor=page_cursor is not None,
+        position=lambda row: (row.created_at, row.id),
+    )
+    comments = [{
+        'id': row.id,
+        'content': row.content,
+        'created_at': row.created_at,
+        'author_id': row.author_id,
+    } for row in rows]
+    return comments, next_cursor, prev_cursor
+
+
+def load_authors(cursor, user_ids):
+    """Public author info for a set of user ids, in a single query"""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return {}
+    return {
+        row.id: {
+            'id': row.id,
+            'username': row.username,
+            'name': row.name or row.username,  # Use username if name is empty
+        }
+        for row in fetch_all(cursor, COMMENT_AUTHORS, [user_ids])
+    }
+
+
+def attach_authors(comments, authors):
+    """Replace each comment's author_id with the hydrated author (None if gone)"""
+    for comment in comments:
+        comment['author'] = authors.get(comment.pop('author_id'))
+    return comments
+
+
+def create_comment(cursor, blog_id, user_id, content):
+    """
+    Insert a comment, bump blogs.comments_count and the trending score.
+
+    Call inside transaction.atomic() so the counters and the row commit
+    together. Returns (comment, comments_count), or (None, None) when the
+    blog does not exist.
+    """
+    # Counter first: it doubles as the existence check and locks the blog row
+    comments_count = adjust_comments_count(cursor, blog_id, 1)
+    if comments_count is None:
+        return None, None
+
+    row = fetch_one(cursor, COMMENT_CREATE, [str(uuid.uuid4()), blog_id, user_id, content])
+    bump_trending(cursor, blog_id, COMMENT_WEIGHT)
+    comment = {
+        'id': row.id,
+        'content': row.content,
+        'created_at': row.created_at,
+    }
+    return comment, comments_count
@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+# ========================================
+# 🏷️ CONDITIONAL GET (ETag / Last-Modified)
+# ========================================
+#
+# Validators are computed from the already-assembled (usually cached) blog
+# dicts - id, updated_at, counters and the viewer's flags - so a matching
+# If-None-Match / If-Modified-Since is answered with a 304 before anything
+# is serialized. Content is never hashed. When the response cache misses,
+# a conditional request is first checked against those columns alone
+# (fields.VALIDATOR_COLUMNS, queries.BLOG_VALIDATORS) before the full read.
+
+def compute_etag(blogs, extra=''):
+    """
+    Strong ETag over the fields that can change a rendered blog.
+
+    Anything else rendered next to the blogs (e.g. per-result scores) is
+    passed as ``extra``.
+    """
+    digest = hashlib.md5(extra.encode())
+    for blog in blogs:
+        digest.update('|'.join([
+            blog['id'],
+            _isoformat(blog.get('updated_at')),
+            str(blog.get('likes_count', 0)),
+            str(blog.get('comments_count', 0)),
+            '1' if blog.get('user_liked') else '0',
+            '1' if blog.get('user_wishlisted') else '0',
+        ]).encode())
+        digest.update(b'\n')
+    return f'"{digest.hexdigest()}"'
+
+
+def compute_last_modified(blogs):
+    """Newest updated_at on the page as a unix timestamp, or None"""
+    stamps = [_as_datetime(blog['updated_at']) for blog in blogs if blog.get('updated_at')]
+    if not stamps:
+        return None
+    return int(max(stamps).timestamp())
+
+
+# updated_at is a datetime straight from the driver, or an ISO string (SQLite)
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else (value or '')
+
+
+def _as_datetime(value):
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def is_conditional(request):
+    """True when the client sent validators worth a cheap check before the full read"""
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    Return a 304 if the client's validators still match, otherwise None.
+
+    If-None-Match wins over If-Modified-Since, so counter-only changes
+    (which do not touch updated_at) are still caught by the ETag.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Per-user flags are part of the body
+    patch_vary_headers(response, ('Authorization',))
+    return response
@@ -0,0 +1,58 @@
+import uuid
+
+from .queries import (
+    ADJUST_COMMENTS_COUNT, LIKE_BLOG, LOCK_BLOGS, RECOUNT_BLOGS, UNLIKE_BLOG, execute, fetch_all, fetch_one,
+)
+
+# ========================================
+# 🔢 DENORMALIZED LIKE / COMMENT COUNTERS
+# ========================================
+#
+# blogs.likes_count and blogs.comments_count are maintained in the same
+# statement as the row they count, so feed reads never run COUNT(*). Likes
+# also move the author's author_stats.likes_received (see author_stats.py).
+# `python manage.py reconcile_counters` repairs any drift.
+
+def like_blog(cursor, user_id, blog_id):
+    """
+    Insert a like and bump the counter in one roundtrip.
+
+    Returns (likes_count, created). A blog that does not exist fails the
+    likes foreign key (IntegrityError); one deleted mid-statement gives
+    ``likes_count`` None.
+    """
+    row = fetch_one(cursor, LIKE_BLOG, [str(uuid.uuid4()), user_id, blog_id, blog_id])
+    return row.likes_count, row.created
+
+
+def unlike_blog(cursor, user_id, blog_id):
+    """
+    Delete a like and decrement the counter in one roundtrip.
+
+    Returns (likes_count, deleted, liked_at); ``likes_count`` is None when
+    the blog does not exist, ``liked_at`` is when the removed like was made.
+    """
+    row = fetch_one(cursor, UNLIKE_BLOG, [user_id, blog_id, blog_id])
+    return row.likes_count, row.deleted, row.liked_at
+
+
+def adjust_comments_count(cursor, blog_id, delta):
+    """
+    Shift blogs.comments_count by ``delta``.
+
+    Must run inside the same transaction as the comment INSERT/DELETE.
+    """
+    row = fetch_one(cursor, ADJUST_COMMENTS_COUNT, [delta, blog_id])
+    return row.comments_count if row else None
+
+
+def reconcile_batch(cursor, blog_ids):
+    """
+    Recount likes/comments for a batch of blogs and fix rows that drifted.
+
+    The blog rows are locked before counting, so a like committed during
+    the recount waits and then applies its +1 on top of the fixed value.
+    Returns the ids that were corrected.
+    """
+    execute(cursor, LOCK_BLOGS, [blog_ids])
+    return [row.id for row in fetch_all(cursor, RECOUNT_BLOGS, [blog_ids])]
@@ -0,0 +1,223 @@
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+from django.conf import settings
+
+# ========================================
+# 🏊 DATABASE CONNECTION POOL
+# ========================================
+#
+# Django closes its connection at the end of every request (CONN_MAX_AGE=0),
+# which against a remote Postgres means a new TCP + TLS handshake and
+# backend startup per request. The blog_api.pooled_postgresql engine hands
+# those closes to this pool instead, so every connection.cursor() call
+# site - views, helpers, the view-count flusher, management commands -
+# reuses a warm connection without changing.
+#
+# Per process and per database:
+#   DB_POOL_SIZE          idle connections kept for reuse
+#   DB_POOL_MAX_OVERFLOW  extra connections opened under load, closed on return
+#   DB_POOL_TIMEOUT       seconds to wait for a free connection before failing
+#   DB_POOL_MAX_LIFETIME  connections older than this are replaced
+#   DB_POOL_CHECK_IDLE    connections idle longer than this are pinged
+#                         (SELECT 1) on checkout; 0 pings every checkout
+#
+# Connections come back rolled back and in autocommit; anything in an
+# unknown state is closed rather than reused.
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No connection came free within DB_POOL_TIMEOUT"""
+
+
+class ConnectionPool:
+
+    def __init__(self, size, max_overflow, timeout, max_lifetime, check_idle):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_idle = check_idle
+
+        self._cond = threading.Condition()
+        self._idle = deque()    # (connection, returned_at), most recent last
+        self._born = {}         # connection -> created_at, for every open connection
+        self.checked_out = 0
+
+        self.created_total = 0
+        self.reused_total = 0
+        self.closed_total = 0
+        self.expired_total = 0
+        self.health_check_failures_total = 0
+        self.waits_total = 0
+        self.timeouts_total = 0
+
+    def checkout(self, connect):
+        """A live connection: a pooled one if possible, else ``connect()``"""
+        deadline = None
+        with self._cond:
+            while not self._idle and self.checked_out >= self.size + self.max_overflow:
+                if deadline is None:
+                    deadline = time.monotonic() + self.timeout
+                    self.waits_total += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts_total += 1
+                    raise PoolTimeout(
+                        f'Database pool exhausted: {self.checked_out} connections in use '
+                        f'after waiting {self.timeout}s')
+                self._cond.wait(remaining)
+            # Most recently returned first: the least likely to have been dropped
+            pooled = self._idle.pop() if self._idle else None
+            self.checked_out += 1
+
+        try:
+            if pooled is not None:
+                connection = self._revive(*pooled)
+                if connection is not None:
+                    return connection
+            connection = connect()
+        except BaseException:
+            self._release_slot()
+            raise
+        with self._cond:
+            self._born[connection] = time.monotonic()
+            self.created_total += 1
+        return connection
+
+    def checkin(self, connection, discard=False):
+        """Give a connection back; ``discard`` closes it instead of pooling it"""
+        reusable = not discard and not self._expired(connection) and self._reset(connection)
+        with self._cond:
+            self.checked_out -= 1
+            if reusable and len(self._idle) < self.size:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            self._cond.notify()
+        if connection is not None:
+            self._close(connection)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'checked_out': self.checked_out,
+                'idle': len(self._idle),
+                'open': len(self._born),
+                'created_total': self.created_total,
+                'reused_total': self.reused_total,
+                'closed_total': self.closed_total,
+                'expired_total': self.expired_total,
+                'health_check_failures_total': self.health_check_failures_total,
+                'waits_total': self.waits_total,
+                'timeouts_total': self.timeouts_total,
+            }
+
+    def close_idle(self):
+        with self._cond:
+            idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def _revive(self, connection, returned_at):
+        """The pooled connection if it is still good, else None (and it is closed)"""
+        if connection.closed:
+            self._close(connection)
+            return None
+        if self._expired(connection):
+            with self._cond:
+                self.expired_total += 1
+            self._close(connection)
+            return None
+        if time.monotonic() - returned_at >= self.check_idle:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            except psycopg2.Error:
+                with self._cond:
+                    self.health_check_failures_total += 1
+                self._close(connection)
+                return None
+        with self._cond:
+            self.reused_total += 1
+        return connection
+
+    def _reset(self, connection):
+        """Roll back anything left open; False if the connection cannot be reused"""
+        if connection.closed:
+            return False
+        try:
+            status = connection.info.transaction_status
+            if status == TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            if not connection.autocommit:
+                connection.autocommit = True
+        except psycopg2.Error:
+            return False
+        return True
+
+    def _expired(self, connection):
+        born = self._born.get(connection)
+        return born is None or time.monotonic() - born >= self.max_lifetime
+
+    def _close(self, connection):
+        with self._cond:
+            self._born.pop(connection, None)
+            self.closed_total += 1
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def _release_slot(self):
+        with self._cond:
+            self.checked_out -= 1
+            self._cond.notify()
+
+
+# (pid, alias, connection parameters) -> pool. Pools from before a fork stay
+# referenced but unused: closing their connections in the child would end the
+# parent's sessions too.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, conn_params):
+    key = (os.getpid(), alias, tuple(sorted((k, str(v)) for k, v in conn_params.items())))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    size=getattr(settings, 'DB_POOL_SIZE', 4),
+                    max_overflow=getattr(settings, 'DB_POOL_MAX_OVERFLOW', 4),
+                    timeout=getattr(settings, 'DB_POOL_TIMEOUT', 10),
+                    max_lifetime=getattr(settings, 'DB_POOL_MAX_LIFETIME', 1800),
+                    check_idle=getattr(settings, 'DB_POOL_CHECK_IDLE', 30),
+                )
+    return pool
+
+
+def close_idle(dbname):
+    """Close this process's idle connections to ``dbname`` (before it is dropped or copied)"""
+    pid = os.getpid()
+    for (owner, _, params), pool in list(_pools.items()):
+        if owner == pid and dict(params).get('dbname') == dbname:
+            pool.close_idle()
+
+
+def pool_stats():
+    """Stats for this process's pools, keyed by alias:dbname"""
+    pid = os.getpid()
+    return {
+        f"{alias}:{dict(params).get('dbname', '')}": pool.stats()
+        for (owner, alias, params), pool in list(_pools.items()) if owner == pid
+    }
@@ -0,0 +1,166 @@
+from functools import lru_cache
+from operator import itemgetter
+
+from .queries import BLOGS_BY_IDS, fetch_all
+
+# ========================================
+# 🧩 SPARSE FIELDSETS FOR BLOG LISTS
+# ========================================
+#
+# ?fields=id,title,excerpt,author.name,likes_count picks the response
+# shape, and the SELECT list is built from it - a card that only renders
+# the excerpt never reads `content` (and its TOAST chunks) from disk.
+
+# API field -> SQL expression (b = public.blogs, u = public.users)
+# Ids are read as text so the driver hands back ready-to-render strings
+FIELD_SQL = {
+    'id': 'CAST(b.id AS text)',
+    'title': 'b.title',
+    'content': 'b.content',
+    # Stored excerpt, or the first 200 characters of content when missing
+    'excerpt': """COALESCE(NULLIF(b.excerpt, ''),
+        CASE WHEN length(b.content) > 200 THEN substr(b.content, 1, 200) || '...' ELSE b.content END)""",
+    'image': 'b.image',
+    'created_at': 'b.created_at',
+    'updated_at': 'b.updated_at',
+    'view_count': 'COALESCE(b.view_count, 0)',
+    'is_published': 'b.is_published',
+    'author.id': 'CAST(u.id AS text)',
+    'author.username': 'u.username',
+    'author.name': "COALESCE(NULLIF(u.name, ''), u.username)",  # Use username if name is empty
+    'author.email': 'u.email',
+    'likes_count': 'b.likes_count',
+    'comments_count': 'b.comments_count',
+}
+
+# Filled in per viewer from the cached id sets, never selected
+VIEWER_FIELDS = ('user_liked', 'user_wishlisted')
+
+# Cheap columns always read: keyset position and ETag validators
+ALWAYS_SELECTED = ('id', 'created_at', 'updated_at', 'likes_count', 'comments_count')
+
+ALL_FIELDS = tuple(FIELD_SQL) + VIEWER_FIELDS
+
+# List responses leave out the full post body unless asked for
+DEFAULT_LIST_FIELDS = tuple(field for field in ALL_FIELDS if field != 'content')
+
+
+class InvalidFields(ValueError):
+    """Raised for unknown names in ?fields="""
+
+
+def parse_fields(value, default=DEFAULT_LIST_FIELDS):
+    """Turn ?fields= into a tuple of known fields, in canonical order"""
+    if not value:
+        return default
+    requested = set()
+    for name in value.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if name == 'author':
+            requested.update(field for field in FIELD_SQL if field.startswith('author.'))
+        elif name in ALL_FIELDS:
+            requested.add(name)
+        else:
+            raise InvalidFields(f'Unknown field: {name}')
+    if not requested:
+        return default
+    return tuple(field for field in ALL_FIELDS if field in requested)
+
+
+def selected_columns(fields):
+    """Field names to SELECT for a projection: requested plus ALWAYS_SELECTED"""
+    wanted = set(fields) | set(ALWAYS_SELECTED)
+    return [field for field in FIELD_SQL if field in wanted]
+
+
+# Just what compute_etag/compute_last_modified read - the conditional GET probe
+VALIDATOR_COLUMNS = selected_columns(())
+
+
+def select_sql(columns):
+    return ',\n'.join(f'{FIELD_SQL[column]} AS "{column}"' for column in columns)
+
+
+def needs_author(columns):
+    return any(column.startswith('author.') for column in columns)
+
+
+def select_fragments(columns):
+    """{select} and {join} for the blog list queries in queries.py"""
+    return {
+        'select': select_sql(columns),
+        'join': 'JOIN public.users u ON b.author_id = u.id' if needs_author(columns) else '',
+    }
+
+
+def row_to_dict(columns, row):
+    """Map a row selected with `columns` to a (nested) blog dict"""
+    return _row_mapper(tuple(columns))(row)
+
+
+@lru_cache(maxsize=128)
+def _row_mapper(columns):
+    """
+    Build the row -> dict function for one column list.
+
+    Values pass through as the driver returns them - datetimes, numbers -
+    and the JSON renderer encodes them. Ids are selected as text; a UUID
+    from elsewhere is still turned into the string flags and caches use.
+    """
+    top = [(i, column) for i, column in enumerate(columns) if not column.startswith('author.')]
+    author = [(i, column[7:]) for i, column in enumerate(columns) if column.startswith('author.')]
+    top_names, top_values = _picker(top)
+    author_names, author_values = _picker(author)
+    top_id, author_id = 'id' in top_names, 'id' in author_names
+
+    def to_dict(row):
+        blog = dict(zip(top_names, top_values(row)))
+        if top_id and type(blog['id']) is not str and blog['id'] is not None:
+            blog['id'] = str(blog['id'])
+        if author_names:
+            blog['author'] = dict(zip(author_names, author_values(row)))
+            if author_id and type(blog['author']['id']) is not str and blog['author']['id'] is not None:
+                blog['author']['id'] = str(blog['author']['id'])
+        return blog
+
+    return to_dict
+
+
+def _picker(indexed):
+    """(names, row -> tuple of those columns' values) for [(index, name), ...]"""
+    names = tuple(name for _, name in indexed)
+    if not indexed:
+        return names, lambda row: ()
+    if len(indexed) == 1:
+        index = indexed[0][0]
+        return names, lambda row: (row[index],)
+    return names, itemgetter(*(index for index, _ in indexed))
+
+
+def fetch_blogs_by_ids(cursor, blog_ids, columns):
+    """Published blogs for ``blog_ids`` in one query, as {id: blog}"""
+    rows = fetch_all(cursor, BLOGS_BY_IDS, [list(blog_ids)], **select_fragments(columns))
+    return {blog['id']: blog for blog in (row_to_dict(columns, row) for row in rows)}
+
+
+def project(blog, fields):
+    """Drop everything the client did not ask for"""
+    return _projector(tuple(fields))(blog)
+
+
+@lru_cache(maxsize=128)
+def _projector(fields):
+    # Keys in request order, with 'author' where its first sub-field was asked for
+    order = tuple(dict.fromkeys('author' if field.startswith('author.') else field for field in fields))
+    author_fields = tuple(field[7:] for field in fields if field.startswith('author.'))
+
+    def to_response(blog):
+        out = {field: blog[field] for field in order if field in blog}
+        if 'author' in out:
+            author = out['author']
+            out['author'] = {field: author[field] for field in author_fields}
+        return out
+
+    return to_response
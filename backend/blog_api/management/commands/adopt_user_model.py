@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+
+
+class Command(BaseCommand):
+    help = 'Record users.0001_initial on databases migrated before AUTH_USER_MODEL was users.User (run before migrate)'
+
+    def handle(self, *args, **options):
+        recorder = MigrationRecorder(connection)
+        if not recorder.has_table():
+            self.stdout.write(self.style.SUCCESS('✅ Fresh database - migrate will set up users'))
+            return
+
+        applied = recorder.applied_migrations()
+        if ('users', '0001_initial') in applied:
+            self.stdout.write(self.style.SUCCESS('✅ users app already adopted'))
+            return
+        if ('admin', '0001_initial') not in applied:
+            # Nothing depends on the user model yet, so migrate runs users.0001 normally
+            self.stdout.write(self.style.SUCCESS('✅ No swappable dependents yet - migrate will set up users'))
+            return
+
+        # admin.0001 now depends on users.0001; Django refuses to migrate while that
+        # dependency is unapplied. 0001 only declares the model for an existing
+        # public.users - users.0002 adds the auth columns during migrate.
+        if 'users' not in connection.introspection.table_names():
+            raise CommandError('No public.users table to adopt')
+        recorder.record_applied('users', '0001_initial')
+        self.stdout.write(self.style.SUCCESS(
+            '✅ Recorded users.0001_initial - now run `python manage.py migrate`'
+        ))
@@ -0,0 +1,108 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Throughput and latency of running servers (e.g. gunicorn vs uvicorn) at several in-flight request counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='+',
+                            help='label=base URL, e.g. wsgi=http://127.0.0.1:8000 asgi=http://127.0.0.1:8001')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Request path, repeatable; clients cycle through them (default: /api/blogs/)')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 100, 1000],
+                            help='In-flight request counts to measure (default: 10 100 1000)')
+        parser.add_argument('--seconds', type=float, default=10.0,
+                            help='Measurement time per target and concurrency (default: 10)')
+        parser.add_argument('--token', help='Bearer token sent with every request')
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['targets']:
+            label, sep, url = target.partition('=')
+            if not sep or urlsplit(url).scheme != 'http':
+                raise CommandError(f'Expected label=http://host:port, got {target!r}')
+            targets.append((label, urlsplit(url)))
+        paths = options['paths'] or ['/api/blogs/']
+        headers = f'Authorization: Bearer {options["token"]}\r\n' if options['token'] else ''
+
+        self.stdout.write(f'{"target":<10} {"in-flight":>9} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"errors":>7}')
+        for concurrency in options['concurrency']:
+            for label, url in targets:
+                result = asyncio.run(measure(url, paths, headers, concurrency, options['seconds']))
+                self.stdout.write(
+                    f'{label:<10} {concurrency:>9} {result["rate"]:>9.1f} {result["p50"]:>8.1f} '
+                    f'{result["p99"]:>8.1f} {result["errors"]:>7}'
+                )
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark complete'))
+
+
+async def measure(url, paths, headers, concurrency, seconds):
+    """Keep ``concurrency`` requests in flight on keep-alive connections for ``seconds``"""
+    latencies, errors = [], [0]
+    deadline = time.monotonic() + seconds
+
+    async def client(slot):
+        connection = None
+        index = slot
+        while time.monotonic() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started = time.monotonic()
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(url.hostname, url.port or 80)
+                status, keep_alive = await request(*connection, url.netloc, path, headers)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors[0] += 1
+                status, keep_alive = None, False
+            else:
+                if status < 400:
+                    latencies.append(time.monotonic() - started)
+                else:
+                    errors[0] += 1
+            if not keep_alive and connection is not None:
+                connection[1].close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    started = time.monotonic()
+    await asyncio.gather(*(client(slot) for slot in range(concurrency)))
+    elapsed = time.monotonic() - started
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    return {
+        'rate': len(latencies) / elapsed,
+        'p50': quantiles[49] * 1000,
+        'p99': quantiles[98] * 1000,
+        'errors': errors[0],
+    }
+
+
+async def request(reader, writer, host, path, headers):
+    """One GET; returns (status, whether the connection can be reused)"""
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\n{headers}\r\n'.encode())
+    await writer.drain()
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    status = int(head[0].split()[1])
+    fields = {}
+    for line in head[1:]:
+        name, _, value = line.partition(':')
+        fields[name.strip().lower()] = value.strip().lower()
+
+    if 'content-length' in fields:
+        await reader.readexactly(int(fields['content-length']))
+    elif fields.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        return status, False
+    return status, fields.get('connection') != 'close'
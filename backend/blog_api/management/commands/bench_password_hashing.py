@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers_by_algorithm, make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_api.passwords import PasswordHashPool
+
+
+def usable_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class Command(BaseCommand):
+    help = 'Measure login password checks per second (and per core) through the hashing pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hasher', action='append', dest='hashers',
+                            help='Algorithm to measure, e.g. pbkdf2_sha256, scrypt (repeatable; '
+                                 'default: the PASSWORD_HASHER setting)')
+        parser.add_argument('--workers', type=int, default=settings.PASSWORD_HASH_WORKERS,
+                            help='Hashing pool threads (default: PASSWORD_HASH_WORKERS)')
+        parser.add_argument('--seconds', type=float, default=5.0,
+                            help='How long to run each hasher (default: 5)')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 1:
+            raise CommandError('--workers must be at least 1')
+        available = get_hashers_by_algorithm()
+        hashers = options['hashers'] or [settings.PASSWORD_HASHER]
+        cores = usable_cores()
+        self.stdout.write(f'{workers} hashing threads, {cores} usable cores, {options["seconds"]:g}s per hasher')
+
+        for algorithm in hashers:
+            if algorithm not in available:
+                raise CommandError(f'Unknown hasher {algorithm!r} - choose from {", ".join(available)}')
+            try:
+                encoded = make_password('benchmark-password', hasher=algorithm)
+            except ValueError as e:
+                # Library-backed hashers (argon2, bcrypt) without their package installed
+                self.stdout.write(self.style.WARNING(f'  {algorithm}: skipped - {e}'))
+                continue
+
+            rate = self.measure(encoded, workers, options['seconds'])
+            per_core = rate / min(workers, cores)
+            self.stdout.write(f'  {algorithm}: {rate:.1f} logins/s, {per_core:.1f} logins/s per core')
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark complete'))
+
+    def measure(self, encoded, workers, seconds):
+        """Keep the pool full from `workers` client threads for `seconds`"""
+        pool = PasswordHashPool(workers=workers, max_queue=workers, timeout=None)
+        deadline = time.monotonic() + seconds
+        counts = [0] * workers
+
+        def client(slot):
+            while time.monotonic() < deadline:
+                matches, _ = pool.verify('benchmark-password', encoded)
+                assert matches
+                counts[slot] += 1
+
+        threads = [threading.Thread(target=client, args=(slot,)) for slot in range(workers)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sum(counts) / (time.monotonic() - started)
@@ -0,0 +1,89 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from blog_api.fields import parse_fields, select_fragments, selected_columns
+from blog_api.pagination import keyset_clause
+from blog_api.queries import (
+    BLOG_DETAIL, FEED_PAGE, LIKE_BLOG, UNLIKE_BLOG, UNLIKED_OWN_BLOG, USER_FOR_LOGIN, execute, fetch_one,
+)
+
+
+class Command(BaseCommand):
+    help = 'Per-query latency of the hot raw SQL, plain vs server-side prepared, on one connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000,
+                            help='Executions per query and mode (default: 2000)')
+        parser.add_argument('--page-size', type=int, default=15, help='Feed page size (default: 15)')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Prepared statements need PostgreSQL - set DATABASE_URL')
+
+        with connection.cursor() as cursor:
+            # A blog its author has not liked: each like is undone by the unlike after it
+            row = fetch_one(cursor, UNLIKED_OWN_BLOG)
+        if row is None:
+            raise CommandError('No published blogs to query - load the sample data first '
+                               '(loaddata fixtures/sample_data.json, load_sample_blogs fixtures/sample_blogs.json)')
+        blog_id, user_id, email = row.blog_id, row.user_id, row.email
+
+        columns = selected_columns(parse_fields(None))
+        keyset_sql, order_sql, keyset_params, _ = keyset_clause(None)
+        feed = (FEED_PAGE, [*keyset_params, options['page_size'] + 1],
+                dict(keyset=keyset_sql, order=order_sql, **select_fragments(columns)))
+        cases = [
+            ('feed page', [feed]),
+            ('blog detail', [(BLOG_DETAIL, [blog_id], {})]),
+            # One like plus the unlike that reverts it
+            ('like toggle', [(LIKE_BLOG, [str(uuid.uuid4()), user_id, blog_id, blog_id], {}),
+                             (UNLIKE_BLOG, [user_id, blog_id, blog_id], {})]),
+            ('login lookup', [(USER_FOR_LOGIN, [email], {})]),
+        ]
+
+        iterations = options['iterations']
+        self.stdout.write(f'{iterations} executions per query and mode, one connection')
+        self.stdout.write(f'  {"query":<14} {"plain µs":>9} {"prepared µs":>12} {"saved µs":>9} {"saved":>7}')
+        with connection.cursor() as cursor:
+            for label, statements in cases:
+                plain, prepared = measure(cursor, statements, iterations)
+                self.stdout.write(
+                    f'  {label:<14} {plain:>9.1f} {prepared:>12.1f} {plain - prepared:>9.1f} '
+                    f'{(plain - prepared) / plain:>7.1%}'
+                )
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark complete'))
+
+
+def run_plain(cursor, statements):
+    for query, params, fragments in statements:
+        cursor.execute(query.render(**fragments), params)
+        cursor.fetchall()
+
+
+def run_prepared(cursor, statements):
+    for query, params, fragments in statements:
+        execute(cursor, query, params, **fragments)
+        cursor.fetchall()
+
+
+def measure(cursor, statements, iterations):
+    """
+    Median wall-clock µs per run, plain and prepared.
+
+    The two modes alternate run by run (autocommit, so row versions left
+    by the like toggle are pruned), keeping drift out of the comparison.
+    """
+    for _ in range(20):
+        run_plain(cursor, statements)
+        run_prepared(cursor, statements)
+    samples = {run_plain: [], run_prepared: []}
+    for i in range(iterations):
+        for run in (run_plain, run_prepared) if i % 2 else (run_prepared, run_plain):
+            started = time.perf_counter()
+            run(cursor, statements)
+            samples[run].append(time.perf_counter() - started)
+    return statistics.median(samples[run_plain]) * 1e6, statistics.median(samples[run_prepared]) * 1e6
@@ -0,0 +1,104 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from blog_api.fields import parse_fields, project, row_to_dict, selected_columns
+from blog_api.renderers import FastJSONRenderer
+
+
+def legacy_row_to_dict(columns, row):
+    """row_to_dict before FastJSONRenderer: every value type-checked, timestamps formatted"""
+    blog = {}
+    for column, value in zip(columns, row):
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        if column.startswith('author.'):
+            blog.setdefault('author', {})[column[7:]] = value
+        else:
+            blog[column] = value
+    return blog
+
+
+def legacy_project(blog, fields):
+    """project() before it was compiled per field list"""
+    out = {}
+    for field in fields:
+        if field.startswith('author.'):
+            if 'author' in blog:
+                out.setdefault('author', {})[field[7:]] = blog['author'][field[7:]]
+        elif field in blog:
+            out[field] = blog[field]
+    return out
+
+
+def sample_rows(columns, count):
+    """Feed rows shaped like the driver returned them before ids were cast to text"""
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    values = {
+        'title': 'Keyset pagination in Postgres, explained',
+        'excerpt': 'Offsets get slower with every page; a (created_at, id) keyset does not. ' * 2,
+        'image': 'https://example.com/cover.jpg',
+        'view_count': 1234,
+        'is_published': True,
+        'author.username': 'ann',
+        'author.name': 'Ann Example',
+        'author.email': 'ann@example.com',
+        'likes_count': 42,
+        'comments_count': 7,
+    }
+    rows = []
+    for n in range(count):
+        created = started + timedelta(minutes=n, microseconds=n * 37)
+        row = []
+        for column in columns:
+            if column in ('id', 'author.id'):
+                row.append(uuid.uuid4())
+            elif column in ('created_at', 'updated_at'):
+                row.append(created)
+            else:
+                row.append(values[column])
+        rows.append(tuple(row))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'CPU time to turn one feed page of rows into JSON: legacy path vs FastJSONRenderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=100, help='Blogs per page (default: 100)')
+        parser.add_argument('--iterations', type=int, default=2000, help='Pages per measurement (default: 2000)')
+        parser.add_argument('--fields', help='?fields= value (default: the feed default)')
+
+    def handle(self, *args, **options):
+        fields = parse_fields(options['fields'])
+        columns = selected_columns(fields)
+        legacy_rows = sample_rows(columns, options['items'])
+        # The same rows as FIELD_SQL now selects them, ids already text
+        rows = [tuple(str(v) if isinstance(v, uuid.UUID) else v for v in row) for row in legacy_rows]
+        legacy_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+
+        def legacy():
+            results = [legacy_project(legacy_row_to_dict(columns, row), fields) for row in legacy_rows]
+            return legacy_renderer.render({'count': len(results), 'results': results})
+
+        def fast():
+            results = [project(row_to_dict(columns, row), fields) for row in rows]
+            return fast_renderer.render({'count': len(results), 'results': results})
+
+        identical = legacy() == fast()
+        timings = {}
+        for name, build in (('legacy', legacy), ('fast', fast)):
+            started = time.process_time()
+            for _ in range(options['iterations']):
+                build()
+            timings[name] = (time.process_time() - started) / options['iterations'] * 1e6
+            self.stdout.write(f'  {name:<7} {timings[name]:8.1f} µs CPU per {options["items"]}-item page')
+
+        self.stdout.write(f'  speedup {timings["legacy"] / timings["fast"]:.1f}x, '
+                          f'output {"identical" if identical else "DIFFERS"}')
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark complete'))
@@ -0,0 +1,145 @@
+import math
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog_api.colike_matrix import cap_per_user, count_partition, estimated_pairs, top_n
+from blog_api.colikes import (
+    COLIKE_TOP_N, get_watermark, insert_colikes, set_watermark, trim_colikes,
+)
+from blog_api.queries import (
+    CLEAR_COLIKES, EARLIER_COLIKES, LIKES_AFTER, LIKES_BETWEEN, LIKES_UP_TO, NEWEST_LIKE,
+    execute, fetch_all, fetch_one,
+)
+
+
+class Command(BaseCommand):
+    help = 'Build "readers who liked this also liked" lists from the likes table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true',
+                            help='Only fold in likes created since the last run (run from cron)')
+        parser.add_argument('--batch-size', type=int, default=50000,
+                            help='Likes read per query (default: 50000)')
+        parser.add_argument('--pair-budget', type=int, default=20_000_000,
+                            help='Blog pairs held in memory at once (default: 20M)')
+
+    def handle(self, *args, **options):
+        if options['incremental']:
+            self.incremental(options['batch_size'])
+        else:
+            self.rebuild(options['batch_size'], options['pair_budget'])
+
+    def rebuild(self, batch_size, pair_budget):
+        max_per_user = settings.COLIKE_MAX_PER_USER
+        with connection.cursor() as cursor:
+            newest = fetch_one(cursor, NEWEST_LIKE)
+        if newest is None:
+            self.stdout.write(self.style.SUCCESS('✅ No likes yet - nothing to build'))
+            return
+
+        # Likes as int32 arrays; uuids are mapped to dense indices on the way in
+        user_index, blog_index, blog_ids = {}, {}, []
+        user_chunks, blog_chunks = [], []
+        position = (None, None)
+        while True:
+            with connection.cursor() as cursor:
+                if position[0] is None:
+                    rows = fetch_all(cursor, LIKES_UP_TO, [*newest, batch_size])
+                else:
+                    rows = fetch_all(cursor, LIKES_BETWEEN, [*position, *newest, batch_size])
+            if not rows:
+                break
+            users = np.empty(len(rows), dtype=np.int32)
+            blogs = np.empty(len(rows), dtype=np.int32)
+            for i, row in enumerate(rows):
+                users[i] = user_index.setdefault(row.user_id, len(user_index))
+                if row.blog_id not in blog_index:
+                    blog_index[row.blog_id] = len(blog_ids)
+                    blog_ids.append(row.blog_id)
+                blogs[i] = blog_index[row.blog_id]
+            user_chunks.append(users)
+            blog_chunks.append(blogs)
+            position = (rows[-1].created_at, rows[-1].id)
+            self.stdout.write(f'Loaded {sum(map(len, user_chunks))} likes')
+
+        users = np.concatenate(user_chunks)
+        blogs = np.concatenate(blog_chunks)
+        # Group by user, newest like first (rows were read oldest first)
+        order = np.lexsort((-np.arange(len(users)), users))
+        users, blogs = cap_per_user(users[order], blogs[order], max_per_user)
+
+        n_blogs = len(blog_ids)
+        partitions = max(1, math.ceil(estimated_pairs(users) / pair_budget))
+        self.stdout.write(f'{len(users)} likes, {n_blogs} blogs, {partitions} partition(s)')
+
+        written = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Incremental runs that started before this build fail their watermark check
+            get_watermark(cursor, for_update=True)
+            execute(cursor, CLEAR_COLIKES)
+            for partition in range(partitions):
+                keys, counts = count_partition(users, blogs, n_blogs, partition, partitions, pair_budget)
+                firsts, partners, co_likes = top_n(keys, counts, n_blogs, COLIKE_TOP_N,
+                                                   settings.COLIKE_MIN_COUNT)
+                insert_colikes(cursor, [
+                    (blog_ids[a], blog_ids[b], int(c)) for a, b, c in zip(firsts, partners, co_likes)
+                ])
+                written += len(firsts)
+                self.stdout.write(f'Partition {partition + 1}/{partitions}: {len(firsts)} pairs')
+            set_watermark(cursor, *newest)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Built co-like lists: {written} pairs over {n_blogs} blogs'
+        ))
+
+    def incremental(self, batch_size):
+        with connection.cursor() as cursor:
+            watermark = get_watermark(cursor)
+        if watermark[0] is None:
+            raise CommandError('No co-like lists yet - run build_colikes without --incremental first')
+
+        folded = 0
+        while True:
+            with connection.cursor() as cursor:
+                new_likes = fetch_all(cursor, LIKES_AFTER, [*watermark, batch_size])
+                if not new_likes:
+                    break
+
+                pairs = fetch_all(cursor, EARLIER_COLIKES, [
+                    [row.created_at for row in new_likes], [row.id for row in new_likes],
+                    [row.user_id for row in new_likes], [row.blog_id for row in new_likes],
+                    settings.COLIKE_MAX_PER_USER,
+                ])
+
+            deltas = self.count_pairs(pairs)
+            with transaction.atomic(), connection.cursor() as cursor:
+                # Another run moved the watermark meanwhile - these likes are counted already
+                if get_watermark(cursor, for_update=True) != tuple(watermark):
+                    raise CommandError('Co-like lists changed during this run - run it again')
+                insert_colikes(cursor, deltas, increment=True)
+                trim_colikes(cursor, sorted({blog_id for blog_id, _, _ in deltas}), COLIKE_TOP_N)
+                watermark = (new_likes[-1].created_at, new_likes[-1].id)
+                set_watermark(cursor, *watermark)
+
+            folded += len(new_likes)
+            self.stdout.write(f'Folded in {folded} likes')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Co-like lists updated incrementally with {folded} likes'
+        ))
+
+    def count_pairs(self, pairs):
+        """Both directions of each (new, earlier) pair, summed per ordered pair"""
+        if not pairs:
+            return []
+        blog_ids = sorted({blog_id for pair in pairs for blog_id in pair})
+        index = {blog_id: i for i, blog_id in enumerate(blog_ids)}
+        left = np.array([index[pair.blog_id] for pair in pairs], dtype=np.int64)
+        right = np.array([index[pair.related_id] for pair in pairs], dtype=np.int64)
+        keys = np.concatenate([left * len(blog_ids) + right, right * len(blog_ids) + left])
+        keys, counts = np.unique(keys, return_counts=True)
+        return [(blog_ids[k // len(blog_ids)], blog_ids[k % len(blog_ids)], int(c))
+                for k, c in zip(keys, counts)]
@@ -0,0 +1,163 @@
+import fcntl
+import os
+import shutil
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog_api.queries import (
+    CLEAR_RELATED, DB_NOW, NIL_UUID, RELATED_QUEUE_BATCH, RELATED_QUEUE_CLEAR_BEFORE,
+    RELATED_QUEUE_DONE, RELATED_SOURCE_BLOGS, execute, fetch_all, fetch_one,
+)
+from blog_api.related import RELATED_TOP_K, add_reverse_neighbors, replace_neighbors
+from blog_api.related_model import (
+    RelatedModel, build_vocabulary, document_frequencies, kth_floor, neighbor_pairs,
+    tokenize, top_k_similar, vectorize,
+)
+
+# Pairs below this cosine similarity are not worth showing
+MIN_SCORE = 0.05
+
+
+class Command(BaseCommand):
+    help = 'Build the TF-IDF related-posts neighbour lists (--incremental: only queued posts)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true',
+                            help='Only add/update posts queued since the last run (run from cron)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Blogs read and vectorised per batch (default: 1000)')
+
+    def handle(self, *args, **options):
+        path = str(settings.RELATED_MODEL_DIR)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One writer at a time: cron runs must not interleave with a rebuild
+        with open(f'{path}.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if options['incremental']:
+                self.incremental(path, options['batch_size'])
+            else:
+                self.rebuild(path, options['batch_size'])
+
+    def iter_blogs(self, batch_size):
+        """(id, title, content) of every published blog, walked by primary key"""
+        last_id = NIL_UUID
+        while True:
+            with connection.cursor() as cursor:
+                rows = fetch_all(cursor, RELATED_SOURCE_BLOGS, [last_id, batch_size])
+            if not rows:
+                return
+            for row in rows:
+                yield row.id, row.title, row.content
+            last_id = rows[-1].id
+
+    def rebuild(self, path, batch_size):
+        with connection.cursor() as cursor:
+            started_at = fetch_one(cursor, DB_NOW).now
+
+        # Pass 1: document frequencies -> vocabulary and idf
+        df, n_docs = document_frequencies(self.iter_blogs(batch_size))
+        terms, idf = build_vocabulary(df, n_docs, settings.RELATED_MAX_FEATURES)
+        self.stdout.write(f'Vocabulary: {len(terms)} terms over {n_docs} blogs')
+
+        # Pass 2: vectors, streamed straight to disk
+        new_path = f'{path}.new'
+        shutil.rmtree(new_path, ignore_errors=True)
+        model = RelatedModel.create(new_path, terms, idf)
+        batch = []
+        for document in self.iter_blogs(batch_size):
+            batch.append(document)
+            if len(batch) == batch_size:
+                self.add_vectors(model, batch)
+                batch = []
+        self.add_vectors(model, batch)
+
+        # Pass 3: top-k for every row, a block of rows at a time
+        vectors, floors = model.vectors(), model.floors()
+        with transaction.atomic(), connection.cursor() as cursor:
+            execute(cursor, CLEAR_RELATED)
+            for start in range(0, len(model.ids), batch_size):
+                rows = np.arange(start, min(start + batch_size, len(model.ids)))
+                indices, scores = top_k_similar(vectors[rows], vectors, RELATED_TOP_K, query_rows=rows)
+                neighbors = {}
+                for row, row_indices, row_scores in zip(rows, indices, scores):
+                    neighbors[model.ids[row]] = neighbor_pairs(model.ids, row_indices, row_scores, MIN_SCORE)
+                    floors[row] = kth_floor(row_scores, MIN_SCORE)
+                replace_neighbors(cursor, neighbors)
+                self.stdout.write(f'Ranked {rows[-1] + 1} of {len(model.ids)} blogs')
+            execute(cursor, RELATED_QUEUE_CLEAR_BEFORE, [started_at])
+        if isinstance(floors, np.memmap):
+            floors.flush()
+
+        # Swap the finished model in
+        old_path = f'{path}.old'
+        shutil.rmtree(old_path, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, old_path)
+        os.rename(new_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Built related posts for {len(model.ids)} blogs'
+        ))
+
+    def add_vectors(self, model, documents):
+        if not documents:
+            return []
+        token_lists = [tokenize(title, content) for _, title, content in documents]
+        return model.upsert([blog_id for blog_id, _, _ in documents],
+                            vectorize(token_lists, model.vocabulary, model.idf))
+
+    def incremental(self, path, batch_size):
+        if not os.path.exists(os.path.join(path, 'ids.txt')):
+            raise CommandError('No related-posts model yet - run build_related_posts without --incremental first')
+        model = RelatedModel.load(path)
+        processed = 0
+
+        while True:
+            with connection.cursor() as cursor:
+                queued = fetch_all(cursor, RELATED_QUEUE_BATCH, [batch_size])
+            if not queued:
+                break
+
+            documents = [(row.blog_id, row.title, row.content) for row in queued if row.is_published]
+            rows = self.add_vectors(model, documents)
+            vectors, floors = model.vectors(), model.floors()
+
+            neighbors, reverse = {}, []
+            if rows:
+                new_vectors = np.asarray(vectors[rows])
+                # Forward: the queued posts' own top-k
+                indices, scores = top_k_similar(new_vectors, vectors, RELATED_TOP_K, query_rows=rows)
+                for row, row_indices, row_scores in zip(rows, indices, scores):
+                    neighbors[model.ids[row]] = neighbor_pairs(model.ids, row_indices, row_scores, MIN_SCORE)
+                    floors[row] = kth_floor(row_scores, MIN_SCORE)
+                # Reverse: existing posts whose k-th score a queued post beats
+                queued_rows = set(rows)
+                for start in range(0, len(model.ids), 8192):
+                    sims = np.asarray(vectors[start:start + 8192]) @ new_vectors.T
+                    bar = np.maximum(np.asarray(floors[start:start + 8192]), MIN_SCORE)
+                    for offset, column in zip(*np.nonzero(sims > bar[:, None])):
+                        row = start + offset
+                        if row not in queued_rows:
+                            reverse.append((model.ids[row], model.ids[rows[column]],
+                                            round(float(sims[offset, column]), 6)))
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                replace_neighbors(cursor, neighbors)
+                new_floors = add_reverse_neighbors(cursor, reverse, RELATED_TOP_K)
+                execute(cursor, RELATED_QUEUE_DONE,
+                        [[row.blog_id for row in queued], [row.queued_at for row in queued]])
+            for blog_id, floor in new_floors.items():
+                floors[model.rows[blog_id]] = max(floor, MIN_SCORE)
+            if isinstance(floors, np.memmap):
+                floors.flush()
+
+            processed += len(queued)
+            self.stdout.write(f'Processed {processed} queued blogs')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Related posts updated incrementally for {processed} blogs'
+        ))
@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog_api.author_stats import adjust_author_stats
+from blog_api.queries import SAMPLE_BLOG_INSERT, execute
+from blog_api.related import enqueue_related
+
+
+class Command(BaseCommand):
+    help = 'Insert sample public.blogs rows from a JSON file (load the users with loaddata first)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON list of {id, author_id, title, content, created_at}')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('public.blogs needs PostgreSQL - set DATABASE_URL')
+        with open(options['path']) as f:
+            blogs = json.load(f)
+
+        created = 0
+        # Rows already present are skipped, so the command can run on every start
+        with transaction.atomic(), connection.cursor() as cursor:
+            for blog in blogs:
+                content = blog['content']
+                excerpt = content[:200] + '...' if len(content) > 200 else content
+                inserted = execute(cursor, SAMPLE_BLOG_INSERT, [
+                    blog['id'], blog['title'], content, excerpt, blog['author_id'],
+                    blog['created_at'], blog['created_at'],
+                ]).rowcount
+                if inserted:
+                    adjust_author_stats(cursor, blog['author_id'], posts=1)
+                    enqueue_related(cursor, blog['id'])
+                    created += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Loaded {created} sample blogs ({len(blogs) - created} already present)'
+        ))
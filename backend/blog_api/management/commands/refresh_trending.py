@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from blog_api.trending import decay_trending, rebuild_trending
+
+
+class Command(BaseCommand):
+    help = 'Apply the periodic trending decay (run from cron, e.g. hourly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Recompute all scores from likes, comments and view counts')
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            if options['rebuild']:
+                ranked = rebuild_trending(cursor)
+                message = f'✅ Rebuilt trending scores for {ranked} blogs'
+            else:
+                rescaled, pruned = decay_trending(cursor)
+                message = f'✅ Decayed trending scores: {rescaled} kept, {pruned} pruned'
+
+        self.stdout.write(self.style.SUCCESS(message))
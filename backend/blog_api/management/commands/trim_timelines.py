@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from blog_api.queries import NIL_UUID, USER_IDS_AFTER, fetch_all
+from blog_api.timeline import TIMELINE_MAX_LENGTH, trim_timelines
+
+
+class Command(BaseCommand):
+    help = 'Trim home timelines to TIMELINE_MAX_LENGTH entries (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Users trimmed per transaction (default: 500)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = NIL_UUID
+        scanned = removed = 0
+
+        while True:
+            # Walk the users primary key so each batch is an index range scan
+            with connection.cursor() as cursor:
+                user_ids = [row.id for row in fetch_all(cursor, USER_IDS_AFTER, [last_id, batch_size])]
+
+            if not user_ids:
+                break
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                removed += trim_timelines(cursor, user_ids)
+
+            scanned += len(user_ids)
+            last_id = user_ids[-1]
+            self.stdout.write(f'Scanned {scanned} users, removed {removed} entries')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Trimmed timelines to {TIMELINE_MAX_LENGTH}: {removed} entries removed'
+        ))
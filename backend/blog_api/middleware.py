@@ -0,0 +1,82 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from . import request_timing
+
+# ========================================
+# 🧩 MIDDLEWARE
+# ========================================
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs natively under ASGI.
+
+    WhiteNoise 6.6 is sync-only, and one sync middleware makes Django run
+    the rest of the chain, async views included, through thread hops on
+    every request. Non-static requests only need a dict lookup here.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=None):
+        if settings is None:
+            super().__init__(get_response)
+        else:
+            super().__init__(get_response, settings)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class ServerTimingMiddleware:
+    """
+    Server-Timing header (db, app, render) and per-route totals for every
+    request; see request_timing.py. Off with SERVER_TIMING=False.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVER_TIMING', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # Decided once: this runs on every request, static files included
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timing, token = request_timing.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_timing.finish(token)
+        return request_timing.record(request, response, timing)
+
+    async def __acall__(self, request):
+        timing, token = request_timing.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_timing.finish(token)
+        return request_timing.record(request, response, timing)
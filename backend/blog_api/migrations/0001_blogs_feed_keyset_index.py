@@ -0,0 +1,88 @@
+from django.db import migrations
+
+# The core tables as the views read them. Production databases already have
+# them (created in Supabase); only a fresh PostgreSQL - the docker-compose
+# db service, the test database - gets them here. public.users comes from
+# users.0001, and 0013 points the user columns at it once it exists.
+CORE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS public.blogs (
+        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+        title text NOT NULL,
+        content text NOT NULL,
+        excerpt text,
+        image text,
+        author_id uuid NOT NULL,
+        view_count integer NOT NULL DEFAULT 0,
+        is_published boolean NOT NULL DEFAULT true,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        updated_at timestamptz NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.likes (
+        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id uuid NOT NULL,
+        blog_id uuid NOT NULL REFERENCES public.blogs(id) ON DELETE CASCADE,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        UNIQUE (user_id, blog_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.wishlist (
+        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id uuid NOT NULL,
+        blog_id uuid NOT NULL REFERENCES public.blogs(id) ON DELETE CASCADE,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        UNIQUE (user_id, blog_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.comments (
+        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+        blog_id uuid NOT NULL REFERENCES public.blogs(id) ON DELETE CASCADE,
+        user_id uuid NOT NULL,
+        content text NOT NULL,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        updated_at timestamptz NOT NULL DEFAULT now()
+    )
+    """,
+]
+
+
+def create_core_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in CORE_TABLES:
+        schema_editor.execute(statement)
+
+
+def create_feed_index(apps, schema_editor):
+    # The blogs table lives in Supabase, so this only applies on PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS blogs_published_created_id_idx
+        ON public.blogs (created_at DESC, id DESC)
+        WHERE is_published = true
+    """)
+
+
+def drop_feed_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS public.blogs_published_created_id_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = []
+
+    operations = [
+        # Not reversed: the tables hold the application's data
+        migrations.RunPython(create_core_tables, migrations.RunPython.noop),
+        migrations.RunPython(create_feed_index, drop_feed_index),
+    ]
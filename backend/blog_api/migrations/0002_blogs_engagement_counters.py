@@ -0,0 +1,74 @@
+from django.db import migrations
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def add_counter_columns(apps, schema_editor):
+    # Adding a column with a constant default is metadata-only on PostgreSQL 11+.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        ALTER TABLE public.blogs
+            ADD COLUMN IF NOT EXISTS likes_count integer NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS comments_count integer NOT NULL DEFAULT 0
+    """)
+    backfill_counters(schema_editor.connection)
+
+
+def backfill_counters(connection):
+    """
+    Count existing likes/comments into the new columns, one id range at a time.
+
+    The migration is non-atomic so each batch commits on its own and holds
+    its row locks briefly; it is idempotent, so a failed run can be retried.
+    """
+    last_id = None
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute("""
+                WITH batch AS (
+                    SELECT id FROM public.blogs
+                    WHERE %s::uuid IS NULL OR id > %s::uuid
+                    ORDER BY id
+                    LIMIT %s
+                ), counted AS (
+                    SELECT
+                        batch.id,
+                        (SELECT count(*) FROM public.likes l WHERE l.blog_id = batch.id) AS likes_count,
+                        (SELECT count(*) FROM public.comments c WHERE c.blog_id = batch.id) AS comments_count
+                    FROM batch
+                ), upd AS (
+                    UPDATE public.blogs b
+                    SET likes_count = counted.likes_count, comments_count = counted.comments_count
+                    FROM counted
+                    WHERE b.id = counted.id
+                )
+                SELECT CAST(id AS text) FROM batch ORDER BY id DESC LIMIT 1
+            """, [last_id, last_id, BACKFILL_BATCH_SIZE])
+            row = cursor.fetchone()
+            if row is None:
+                return
+            last_id = row[0]
+
+
+def drop_counter_columns(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        ALTER TABLE public.blogs
+            DROP COLUMN IF EXISTS likes_count,
+            DROP COLUMN IF EXISTS comments_count
+    """)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('blog_api', '0001_blogs_feed_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_counter_columns, drop_counter_columns),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+from blog_api.search import ensure_sqlite_fts
+
+
+def add_search_vector(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        # Stored generated column: PostgreSQL keeps it current on every write
+        schema_editor.execute("""
+            ALTER TABLE public.blogs
+            ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(content, '')), 'B')
+            ) STORED
+        """)
+    elif connection.vendor == 'sqlite':
+        # Local development only has a blogs table if one was created by hand
+        with connection.cursor() as cursor:
+            if 'blogs' in connection.introspection.table_names(cursor):
+                ensure_sqlite_fts(cursor)
+
+
+def drop_search_vector(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute("ALTER TABLE public.blogs DROP COLUMN IF EXISTS search_vector")
+    elif connection.vendor == 'sqlite':
+        for name in ('blogs_fts_ai', 'blogs_fts_ad', 'blogs_fts_au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        schema_editor.execute("DROP TABLE IF EXISTS blogs_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_api', '0002_blogs_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
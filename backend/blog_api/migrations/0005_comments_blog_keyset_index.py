@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_comments_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # id is the keyset tie-breaker, so it is part of the index too
+    schema_editor.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS comments_blog_created_id_idx
+        ON public.comments (blog_id, created_at DESC, id DESC)
+    """)
+
+
+def drop_comments_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS public.comments_blog_created_id_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('blog_api', '0004_blogs_search_vector_gin'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_comments_index, drop_comments_index),
+    ]
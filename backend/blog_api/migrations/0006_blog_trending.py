@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+def create_trending_tables(apps, schema_editor):
+    # New, empty tables - run `manage.py refresh_trending --rebuild` to backfill
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.blog_trending (
+            blog_id uuid PRIMARY KEY REFERENCES public.blogs(id) ON DELETE CASCADE,
+            score double precision NOT NULL,
+            updated_at timestamptz NOT NULL DEFAULT now()
+        )
+    """)
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS blog_trending_score_idx
+        ON public.blog_trending (score DESC, blog_id DESC)
+    """)
+    # Single-row table holding the decay epoch shared by every worker
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.blog_trending_epoch (
+            id boolean PRIMARY KEY DEFAULT true CHECK (id),
+            epoch timestamptz NOT NULL
+        )
+    """)
+    schema_editor.execute("""
+        INSERT INTO public.blog_trending_epoch (id, epoch) VALUES (true, now())
+        ON CONFLICT (id) DO NOTHING
+    """)
+
+
+def drop_trending_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS public.blog_trending, public.blog_trending_epoch")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_api', '0005_comments_blog_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trending_tables, drop_trending_tables),
+    ]
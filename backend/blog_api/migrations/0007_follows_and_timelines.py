@@ -0,0 +1,64 @@
+from django.db import migrations
+
+
+def create_follow_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.follows (
+            follower_id uuid NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+            followee_id uuid NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (follower_id, followee_id),
+            CHECK (follower_id <> followee_id)
+        )
+    """)
+    # Fan-out walks an author's followers
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS follows_followee_idx
+        ON public.follows (followee_id, follower_id)
+    """)
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.follower_counts (
+            user_id uuid PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+            followers_count integer NOT NULL DEFAULT 0
+        )
+    """)
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.timeline_entries (
+            user_id uuid NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+            blog_id uuid NOT NULL REFERENCES public.blogs(id) ON DELETE CASCADE,
+            author_id uuid NOT NULL,
+            created_at timestamptz NOT NULL,
+            PRIMARY KEY (user_id, blog_id)
+        )
+    """)
+    # Home feed pages are keyset range scans on this index
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS timeline_entries_user_created_idx
+        ON public.timeline_entries (user_id, created_at DESC, blog_id DESC)
+    """)
+    # Lets a blog delete cascade without scanning every timeline
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS timeline_entries_blog_idx
+        ON public.timeline_entries (blog_id)
+    """)
+
+
+def drop_follow_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        DROP TABLE IF EXISTS public.timeline_entries, public.follower_counts, public.follows
+    """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_api', '0006_blog_trending'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_follow_tables, drop_follow_tables),
+    ]
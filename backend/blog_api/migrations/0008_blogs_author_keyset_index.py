@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_author_index(apps, schema_editor):
+    # Serves fan-out-on-read: one author's newest published posts by keyset
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS blogs_author_published_created_id_idx
+        ON public.blogs (author_id, created_at DESC, id DESC)
+        WHERE is_published = true
+    """)
+
+
+def drop_author_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS public.blogs_author_published_created_id_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('blog_api', '0007_follows_and_timelines'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_author_index, drop_author_index),
+    ]
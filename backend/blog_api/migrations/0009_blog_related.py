@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+def create_related_tables(apps, schema_editor):
+    # New, empty tables - run `manage.py build_related_posts` to fill them
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.blog_related (
+            blog_id uuid NOT NULL REFERENCES public.blogs(id) ON DELETE CASCADE,
+            related_id uuid NOT NULL REFERENCES public.blogs(id) ON DELETE CASCADE,
+            score real NOT NULL,
+            PRIMARY KEY (blog_id, related_id)
+        )
+    """)
+    # Reads are "top k for this blog": one range scan
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS blog_related_lookup_idx
+        ON public.blog_related (blog_id, score DESC, related_id)
+    """)
+    # Lets a blog delete cascade to the lists it appears in
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS blog_related_related_idx
+        ON public.blog_related (related_id)
+    """)
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.blog_related_queue (
+            blog_id uuid PRIMARY KEY REFERENCES public.blogs(id) ON DELETE CASCADE,
+            queued_at timestamptz NOT NULL DEFAULT now()
+        )
+    """)
+
+
+def drop_related_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS public.blog_related, public.blog_related_queue")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_api', '0008_blogs_author_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_related_tables, drop_related_tables),
+    ]
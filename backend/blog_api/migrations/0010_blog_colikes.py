@@ -0,0 +1,51 @@
+from django.db import migrations
+
+
+def create_colike_tables(apps, schema_editor):
+    # New, empty tables - run `manage.py build_colikes` to fill them
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.blog_colikes (
+            blog_id uuid NOT NULL REFERENCES public.blogs(id) ON DELETE CASCADE,
+            related_id uuid NOT NULL REFERENCES public.blogs(id) ON DELETE CASCADE,
+            co_likes integer NOT NULL,
+            PRIMARY KEY (blog_id, related_id)
+        )
+    """)
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS blog_colikes_lookup_idx
+        ON public.blog_colikes (blog_id, co_likes DESC, related_id)
+    """)
+    schema_editor.execute("""
+        CREATE INDEX IF NOT EXISTS blog_colikes_related_idx
+        ON public.blog_colikes (related_id)
+    """)
+    # Single row: the newest like the lists already include
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.colike_state (
+            id boolean PRIMARY KEY DEFAULT true CHECK (id),
+            last_created_at timestamptz,
+            last_like_id uuid
+        )
+    """)
+    schema_editor.execute("""
+        INSERT INTO public.colike_state (id) VALUES (true) ON CONFLICT (id) DO NOTHING
+    """)
+
+
+def drop_colike_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS public.blog_colikes, public.colike_state")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_api', '0009_blog_related'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_colike_tables, drop_colike_tables),
+    ]
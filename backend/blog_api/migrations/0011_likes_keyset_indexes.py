@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+def create_likes_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # build_colikes walks likes in creation order from its watermark
+    schema_editor.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS likes_created_id_idx
+        ON public.likes (created_at, id)
+    """)
+    # ...and looks up each reader's earlier likes, newest first
+    schema_editor.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS likes_user_created_id_idx
+        ON public.likes (user_id, created_at DESC, id DESC)
+    """)
+
+
+def drop_likes_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS public.likes_created_id_idx")
+    schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS public.likes_user_created_id_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('blog_api', '0010_blog_colikes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_likes_indexes, drop_likes_indexes),
+    ]
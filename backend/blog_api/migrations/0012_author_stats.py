@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def create_author_stats(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        CREATE TABLE IF NOT EXISTS public.author_stats (
+            user_id uuid PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+            posts_count integer NOT NULL DEFAULT 0,
+            likes_received bigint NOT NULL DEFAULT 0,
+            total_views bigint NOT NULL DEFAULT 0
+        )
+    """)
+    # Backfill from the blog counters (0002), so author pages are right from the first read
+    schema_editor.execute("""
+        INSERT INTO public.author_stats (user_id, posts_count, likes_received, total_views)
+        SELECT b.author_id,
+               COUNT(*) FILTER (WHERE b.is_published),
+               COALESCE(SUM(b.likes_count), 0),
+               COALESCE(SUM(b.view_count), 0)
+        FROM public.blogs b
+        GROUP BY b.author_id
+        ON CONFLICT (user_id) DO NOTHING
+    """)
+
+
+def drop_author_stats(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS public.author_stats")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_api', '0011_likes_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_author_stats, drop_author_stats),
+    ]
@@ -0,0 +1,59 @@
+from django.db import IntegrityError, migrations, transaction
+
+# Columns holding a public.users id. Some databases still reference
+# public.profiles (an older Supabase schema) here.
+USER_COLUMNS = [
+    ('blogs', 'author_id'),
+    ('likes', 'user_id'),
+    ('wishlist', 'user_id'),
+    ('comments', 'user_id'),
+]
+
+
+def point_foreign_keys_at_users(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in USER_COLUMNS:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [f'public.{table}'])
+            if cursor.fetchone()[0] is None:
+                continue
+            cursor.execute("""
+                SELECT c.conname, c.confrelid = 'public.users'::regclass
+                FROM pg_constraint c
+                JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)
+                WHERE c.conrelid = %s::regclass AND c.contype = 'f' AND a.attname = %s
+            """, [f'public.{table}', column])
+            constraints = cursor.fetchall()
+
+        for name, references_users in constraints:
+            if not references_users:
+                schema_editor.execute(f'ALTER TABLE public.{table} DROP CONSTRAINT "{name}"')
+        if any(references_users for _, references_users in constraints):
+            continue
+
+        name = f'{table}_{column}_users_fkey'
+        # NOT VALID: enforced for new rows straight away, without a long lock
+        schema_editor.execute(f"""
+            ALTER TABLE public.{table} ADD CONSTRAINT {name}
+            FOREIGN KEY ({column}) REFERENCES public.users(id) ON DELETE CASCADE NOT VALID
+        """)
+        try:
+            with transaction.atomic():
+                schema_editor.execute(f"ALTER TABLE public.{table} VALIDATE CONSTRAINT {name}")
+        except IntegrityError:
+            # Rows left over from the profiles era: the constraint stays NOT VALID
+            # until they are cleaned up and VALIDATE CONSTRAINT is run by hand
+            pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_api', '0012_author_stats'),
+        ('users', '0002_adopt_public_users'),
+    ]
+
+    operations = [
+        migrations.RunPython(point_foreign_keys_at_users, migrations.RunPython.noop),
+    ]
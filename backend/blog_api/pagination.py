@@ -0,0 +1,107 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+
+# ========================================
+# 🔖 KEYSET (CURSOR) PAGINATION HELPERS
+# ========================================
+
+DEFAULT_PAGE_SIZE = getattr(settings, 'FEED_PAGE_SIZE', 15)
+MAX_PAGE_SIZE = getattr(settings, 'FEED_MAX_PAGE_SIZE', 50)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+def encode_cursor(created_at, row_id, direction='next'):
+    """Pack a (created_at, id) position into an opaque, URL-safe token"""
+    payload = json.dumps({
+        't': created_at.isoformat(),
+        'id': str(row_id),
+        'd': direction,
+    }, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Unpack a cursor token into (created_at, id, direction)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload['t'])
+        direction = payload.get('d', 'next')
+        if direction not in ('next', 'prev'):
+            raise ValueError(direction)
+        # Validated here so a forged id is a 400, not a failed ::uuid cast
+        row_id = str(uuid.UUID(payload['id']))
+        return created_at, row_id, direction
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise InvalidCursor(str(e))
+
+
+def get_page_size(request):
+    """Read ?page_size= from the request, clamped to MAX_PAGE_SIZE"""
+    try:
+        page_size = int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def keyset_clause(cursor, created_col='b.created_at', id_col='b.id'):
+    """
+    Build the WHERE fragment, ORDER BY and params for a page.
+
+    Returns (where_sql, order_sql, params, direction). Walking backwards
+    flips the comparison and the sort so Postgres can still use the
+    (created_at DESC, id DESC) index; the caller reverses the rows.
+    """
+    if cursor is None:
+        return '', f'{created_col} DESC, {id_col} DESC', [], 'next'
+
+    created_at, row_id, direction = decode_cursor(cursor)
+    if direction == 'next':
+        where = f'AND ({created_col}, {id_col}) < (%s, %s::uuid)'
+        order = f'{created_col} DESC, {id_col} DESC'
+    else:
+        where = f'AND ({created_col}, {id_col}) > (%s, %s::uuid)'
+        order = f'{created_col} ASC, {id_col} ASC'
+    return where, order, [created_at, row_id], direction
+
+
+def paginate_rows(rows, page_size, direction, has_cursor, position):
+    """
+    Trim the LIMIT page_size + 1 probe row and work out which links exist.
+
+    ``position`` is a callable returning (created_at, id) for a row.
+    Returns (rows, next_cursor, prev_cursor).
+    """
+    has_more = len(rows) > page_size
+    rows = list(rows[:page_size])
+    if direction == 'prev':
+        rows.reverse()
+
+    if not rows:
+        return rows, None, None
+
+    if direction == 'next':
+        has_next, has_prev = has_more, has_cursor
+    else:
+        has_next, has_prev = True, has_more
+
+    next_cursor = encode_cursor(*position(rows[-1]), 'next') if has_next else None
+    prev_cursor = encode_cursor(*position(rows[0]), 'prev') if has_prev else None
+    return rows, next_cursor, prev_cursor
+
+
+def build_page_link(request, cursor, param='cursor'):
+    """Absolute URL for the same endpoint with ?cursor= (or ?<param>=) swapped in"""
+    if cursor is None:
+        return None
+    params = request.query_params.copy()
+    params[param] = cursor
+    return request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
@@ -0,0 +1,123 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+# ========================================
+# 🔑 OFF-THREAD PASSWORD HASHING
+# ========================================
+#
+# Password hashes are slow on purpose (PBKDF2 at Django 4.2's iteration
+# count is hundreds of milliseconds of CPU). Logins and signups hash on a
+# small per-process pool instead: at most PASSWORD_HASH_WORKERS hashes run
+# at once and PASSWORD_HASH_MAX_QUEUE more may wait. Anything beyond that
+# is refused immediately with HashingBusy (a 503), so a login burst waits
+# in front of the pool rather than inside every worker thread. hashlib
+# releases the GIL while hashing, so request threads keep running. The
+# bound needs several requests in flight per process to bite, which is why
+# gunicorn runs threaded workers (gunicorn.conf.py).
+#
+# New hashes use settings.PASSWORD_HASHERS[0] (the PASSWORD_HASHER env);
+# a hash made by an older algorithm or cost is replaced on the next
+# successful login.
+
+
+class HashingBusy(Exception):
+    """Raised when the pool and its queue are full, or a hash waits too long"""
+
+
+class PasswordHashPool:
+
+    def __init__(self, workers, max_queue, timeout):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        # One slot per running or queued hash; released when the hash finishes
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+        self.in_flight = 0
+        self.completed_total = 0
+        self.rejected_total = 0
+
+    def run(self, fn, *args):
+        """Run ``fn(*args)`` on the pool and wait for it; raises HashingBusy"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected_total += 1
+            raise HashingBusy()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # Still queued: drop it. Already running: it finishes and frees its slot.
+            future.cancel()
+            with self._lock:
+                self.rejected_total += 1
+            raise HashingBusy()
+
+    def verify(self, password, encoded):
+        """
+        Check a password against a stored hash.
+
+        Returns (matches, upgraded) where ``upgraded`` is a fresh hash to
+        store when ``encoded`` uses an outdated algorithm or cost, else None.
+        """
+        return self.run(_verify, password, encoded)
+
+    def hash(self, password):
+        return self.run(make_password, password)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'completed_total': self.completed_total,
+                'rejected_total': self.rejected_total,
+                'hasher': settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1],
+            }
+
+    def _done(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            if future is not None and not future.cancelled():
+                self.completed_total += 1
+        self._slots.release()
+
+    def _get_executor(self):
+        # Created lazily and per process, so it survives gunicorn's fork
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix='password-hash')
+        return self._executor
+
+
+def _verify(password, encoded):
+    upgraded = []
+    # The setter only runs for a correct password whose hash must change
+    matches = check_password(password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return matches, (upgraded[0] if upgraded else None)
+
+
+password_pool = PasswordHashPool(
+    workers=getattr(settings, 'PASSWORD_HASH_WORKERS', os.cpu_count() or 2),
+    max_queue=getattr(settings, 'PASSWORD_HASH_MAX_QUEUE', 2),
+    timeout=getattr(settings, 'PASSWORD_HASH_TIMEOUT', 5),
+)
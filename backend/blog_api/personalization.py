@@ -0,0 +1,96 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .queries import USER_ENGAGEMENT, fetch_all
+
+# ========================================
+# 👤 PER-USER LIKED / WISHLISTED ID SETS
+# ========================================
+#
+# Feed rows are identical for every viewer; only user_liked and
+# user_wishlisted differ. Instead of two EXISTS subqueries per row we keep
+# each user's liked and wishlisted blog ids in the cache and overlay the
+# flags in memory.
+#
+# The sets are stamped with a per-user version that every like/wishlist
+# toggle bumps once its transaction commits. A reader takes the version
+# before it queries, so a set loaded before a toggle committed carries the
+# old stamp and is reloaded instead of served - even if it reached the
+# cache after the bump.
+
+ENGAGEMENT_CACHE_TIMEOUT = getattr(settings, 'ENGAGEMENT_CACHE_TIMEOUT', 300)
+
+
+def _cache_key(user_id):
+    return f'engagement:{user_id}'
+
+
+def _version_key(user_id):
+    return f'engagement:{user_id}:version'
+
+
+def _get_version(user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seeded from the clock, so an evicted version is never re-issued
+        # with a number an older cached set was stamped with
+        cache.add(key, time.time_ns(), timeout=ENGAGEMENT_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(user_id):
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), timeout=ENGAGEMENT_CACHE_TIMEOUT)
+
+
+def load_user_engagement(user_id):
+    """Fetch both id sets for a user in a single query"""
+    liked, wishlisted = set(), set()
+    with connection.cursor() as cursor:
+        for row in fetch_all(cursor, USER_ENGAGEMENT, [user_id, user_id]):
+            (liked if row.kind == 'l' else wishlisted).add(row.blog_id)
+    return liked, wishlisted
+
+
+def get_user_engagement(user_id):
+    """Return (liked_ids, wishlisted_ids), loading them lazily on a cache miss"""
+    version = _get_version(user_id)
+    cached = cache.get(_cache_key(user_id))
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+
+    liked, wishlisted = load_user_engagement(user_id)
+    cache.set(_cache_key(user_id), (version, liked, wishlisted), timeout=ENGAGEMENT_CACHE_TIMEOUT)
+    return liked, wishlisted
+
+
+def record_engagement(user_id):
+    """
+    Invalidate a user's cached id sets after a like/wishlist toggle.
+
+    The version is bumped when the surrounding transaction commits (right
+    away in autocommit), never before the change is visible to a reload.
+    """
+    transaction.on_commit(lambda: _bump_version(user_id))
+
+
+def overlay_user_flags(blogs, user_id):
+    """Set user_liked / user_wishlisted on serialized blogs in place"""
+    if not user_id:
+        for blog in blogs:
+            blog['user_liked'] = False
+            blog['user_wishlisted'] = False
+        return blogs
+
+    liked, wishlisted = get_user_engagement(user_id)
+    for blog in blogs:
+        blog['user_liked'] = blog['id'] in liked
+        blog['user_wishlisted'] = blog['id'] in wishlisted
+    return blogs
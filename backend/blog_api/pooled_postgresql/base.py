@@ -0,0 +1,19 @@
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+
+from ..db_pool import get_pool
+from .creation import DatabaseCreation
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """The stock PostgreSQL backend, taking connections from blog_api.db_pool"""
+
+    creation_class = DatabaseCreation
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.alias, conn_params)
+        return self.pool.checkout(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            # Still flagged after close_if_unusable_or_obsolete means it failed is_usable()
+            self.pool.checkin(self.connection, discard=self.errors_occurred)
@@ -0,0 +1,17 @@
+from django.db.backends.postgresql.creation import DatabaseCreation as PostgresDatabaseCreation
+
+from ..db_pool import close_idle
+
+
+class DatabaseCreation(PostgresDatabaseCreation):
+    # DROP DATABASE and CREATE DATABASE ... TEMPLATE refuse while pooled
+    # connections to the test database are still open
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        self.connection.close()
+        close_idle(self.connection.settings_dict['NAME'])
+        super()._clone_test_db(suffix, verbosity, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_idle(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
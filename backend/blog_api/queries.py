@@ -0,0 +1,937 @@
+import hashlib
+import itertools
+import re
+import textwrap
+import weakref
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DatabaseError
+from psycopg2 import errorcodes
+
+# ========================================
+# 🗂️ NAMED QUERIES
+# ========================================
+#
+# The SQL the app runs against its tables lives here, once, under a name -
+# the sync views (urls.py), the async views (async_views.py), the feature
+# modules (comments, timeline, trending, ...) and the management commands
+# all run these instead of their own copies, so a schema change touches
+# this file. Rows come back as tuples typed from cursor.description, so
+# callers read row.title, not row[1].
+#
+# Parameters are always %s placeholders (a few statements take a dict of
+# %(name)s ones). Some queries take SQL fragments (the sparse-fieldset
+# SELECT list, keyset conditions, an ON CONFLICT clause) as {name} slots,
+# filled by Query.render from trusted code - never from request input;
+# fragments a query has no slot for are ignored. Batched writes take one
+# array per column and unnest() them, so every batch size is the same
+# statement.
+#
+# Queries registered with prepare=True run on Postgres as server-side
+# prepared statements: PREPARE once per connection, then EXECUTE, so the
+# hot paths skip parsing and planning. Each rendered variant (one per
+# sparse fieldset / keyset direction) is its own statement. A connection
+# the pool replaces starts with none and prepares again on first use.
+# The async views need none of this - asyncpg caches prepared statements
+# per connection itself.
+
+PREPARED_STATEMENTS = getattr(settings, 'DB_PREPARED_STATEMENTS', True)
+PREPARED_STATEMENTS_MAX = getattr(settings, 'DB_PREPARED_STATEMENTS_MAX', 64)
+
+
+class Query:
+    """A named SQL statement, optionally with {fragment} slots"""
+
+    __slots__ = ('name', 'sql', 'prepare')
+
+    def __init__(self, name, sql, prepare=False):
+        self.name = name
+        self.sql = textwrap.dedent(sql).strip()
+        self.prepare = prepare
+
+    def render(self, **fragments):
+        return self.sql.format(**fragments) if fragments else self.sql
+
+    def __repr__(self):
+        return f'<Query {self.name}>'
+
+
+QUERIES = {}
+
+
+def register(name, sql, prepare=False):
+    if name in QUERIES:
+        raise ValueError(f'Query {name!r} is already registered')
+    query = QUERIES[name] = Query(name, sql, prepare)
+    return query
+
+
+@lru_cache(maxsize=256)
+def row_type(names):
+    """namedtuple class for a tuple of column names; odd names become _0, _1, ..."""
+    return namedtuple('Row', names, rename=True)
+
+
+def _maker(cursor):
+    return row_type(tuple(column[0] for column in cursor.description))._make
+
+
+def execute(cursor, query, params=(), **fragments):
+    sql = query.render(**fragments)
+    if query.prepare and PREPARED_STATEMENTS and cursor.db.vendor == 'postgresql':
+        _execute_prepared(cursor, query.name, sql, params)
+    else:
+        cursor.execute(sql, params)
+    return cursor
+
+
+_PLACEHOLDER = re.compile(r'%s')
+
+# raw DB-API connection -> names of the statements prepared on it
+_prepared = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=256)
+def numbered(sql):
+    """Rewrite psycopg2-style %s placeholders as Postgres' $1, $2, ..."""
+    counter = itertools.count(1)
+    return _PLACEHOLDER.sub(lambda _: f'${next(counter)}', sql)
+
+
+@lru_cache(maxsize=256)
+def prepared_statement(name, sql):
+    """(statement name, PREPARE sql, EXECUTE sql) for one rendered query"""
+    statement = f'{name}_{hashlib.md5(sql.encode()).hexdigest()[:12]}'
+    placeholders = ', '.join(['%s'] * len(_PLACEHOLDER.findall(sql)))
+    return (
+        statement,
+        f'PREPARE {statement} AS {numbered(sql).replace("%%", "%")}',
+        f'EXECUTE {statement} ({placeholders})' if placeholders else f'EXECUTE {statement}',
+    )
+
+
+def _execute_prepared(cursor, name, sql, params):
+    statement, prepare_sql, execute_sql = prepared_statement(name, sql)
+    prepared = _prepared.setdefault(cursor.db.connection, set())
+    if statement not in prepared:
+        if len(prepared) >= PREPARED_STATEMENTS_MAX:
+            cursor.execute(sql, params)
+            return
+        cursor.execute(prepare_sql)
+        prepared.add(statement)
+    try:
+        cursor.execute(execute_sql, params)
+    except DatabaseError as e:
+        if getattr(e.__cause__, 'pgcode', None) != errorcodes.INVALID_SQL_STATEMENT_NAME:
+            raise
+        # Deallocated behind our back (DISCARD ALL, a transaction-mode pooler):
+        # forget them all and, outside a transaction, prepare this one again
+        prepared.clear()
+        if cursor.db.in_atomic_block:
+            raise
+        cursor.execute(prepare_sql)
+        prepared.add(statement)
+        cursor.execute(execute_sql, params)
+
+
+def fetch_all(cursor, query, params=(), **fragments):
+    """All rows of ``query`` as typed tuples"""
+    execute(cursor, query, params, **fragments)
+    rows = cursor.fetchall()
+    if not rows:
+        return []
+    make = _maker(cursor)
+    return [make(row) for row in rows]
+
+
+def fetch_one(cursor, query, params=(), **fragments):
+    """First row of ``query`` as a typed tuple, or None"""
+    execute(cursor, query, params, **fragments)
+    row = cursor.fetchone()
+    return _maker(cursor)(row) if row is not None else None
+
+
+# ----------------------------------------
+# Blog lists (SELECT list from fields.select_fragments)
+# ----------------------------------------
+
+FEED_PAGE = register('feed_page', prepare=True, sql="""
+    SELECT {select}
+    FROM public.blogs b
+    {join}
+    WHERE b.is_published = true
+    {keyset}
+    ORDER BY {order}
+    LIMIT %s
+""")
+
+BLOGS_BY_IDS = register('blogs_by_ids', """
+    SELECT {select}
+    FROM public.blogs b
+    {join}
+    WHERE b.id = ANY(%s::uuid[]) AND b.is_published = true
+""")
+
+WISHLIST_BLOGS = register('wishlist_blogs', """
+    SELECT {select}
+    FROM public.wishlist w
+    JOIN public.blogs b ON w.blog_id = b.id
+    JOIN public.users u ON b.author_id = u.id
+    WHERE w.user_id = %s
+    ORDER BY w.created_at DESC
+""")
+
+BLOG_STATUS = register('blog_status', """
+    SELECT CAST(id AS text) AS id, likes_count, comments_count
+    FROM public.blogs
+    WHERE id = ANY(%s::uuid[]) AND is_published = true
+""")
+
+# ----------------------------------------
+# One blog
+# ----------------------------------------
+
+BLOG_DETAIL = register('blog_detail', prepare=True, sql="""
+    SELECT
+        CAST(b.id AS text) AS id, b.title, b.content, b.excerpt, b.image,
+        b.created_at, b.updated_at, b.view_count,
+        CAST(u.id AS text) AS author_id, u.username, u.name, u.email,
+        b.likes_count, b.comments_count
+    FROM public.blogs b
+    JOIN public.users u ON b.author_id = u.id
+    WHERE b.id = %s AND b.is_published = true
+""")
+
+# The detail's validators only - checked before BLOG_DETAIL on a conditional GET
+BLOG_VALIDATORS = register('blog_validators', prepare=True, sql="""
+    SELECT CAST(id AS text) AS id, updated_at, likes_count, comments_count
+    FROM public.blogs
+    WHERE id = %s AND is_published = true
+""")
+
+
+def blog_detail(row):
+    """BLOG_DETAIL row -> the blog detail response (before per-user flags)"""
+    return {
+        'id': row.id,
+        'title': row.title,
+        'content': row.content,
+        'excerpt': row.excerpt,
+        'image': row.image,
+        'created_at': row.created_at,
+        'updated_at': row.updated_at,
+        'view_count': row.view_count,
+        'author': {
+            'id': row.author_id,
+            'username': row.username,
+            'name': row.name or row.username,
+            'email': row.email,
+        },
+        'likes_count': row.likes_count,
+        'comments_count': row.comments_count,
+    }
+
+
+BLOG_EXISTS = register('blog_exists', """
+    SELECT 1 FROM public.blogs WHERE id = %s
+""")
+
+BLOG_AUTHOR = register('blog_author', """
+    SELECT CAST(author_id AS text) AS author_id FROM public.blogs WHERE id = %s
+""")
+
+BLOG_CREATE = register('blog_create', """
+    INSERT INTO public.blogs (id, title, content, excerpt, image, author_id, is_published, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s, true, NOW(), NOW())
+    RETURNING CAST(id AS text) AS id, title, content, excerpt, image, created_at, updated_at
+""")
+
+BLOG_UPDATE = register('blog_update', """
+    UPDATE public.blogs
+    SET title = %s, content = %s, excerpt = %s, image = %s, updated_at = NOW()
+    WHERE id = %s
+    RETURNING CAST(id AS text) AS id, title, content, excerpt, image, updated_at
+""")
+
+BLOG_DELETE = register('blog_delete', """
+    DELETE FROM public.blogs WHERE id = %s
+    RETURNING is_published, likes_count, view_count
+""")
+
+# ----------------------------------------
+# Likes and counters (see counters.py)
+# ----------------------------------------
+
+LIKE_BLOG = register('like_blog', prepare=True, sql="""
+    WITH ins AS (
+        INSERT INTO public.likes (id, user_id, blog_id, created_at)
+        VALUES (%s, %s, %s, NOW())
+        ON CONFLICT (user_id, blog_id) DO NOTHING
+        RETURNING blog_id
+    ), upd AS (
+        UPDATE public.blogs
+        SET likes_count = likes_count + 1
+        WHERE id IN (SELECT blog_id FROM ins)
+        RETURNING likes_count, author_id
+    ), stats AS (
+        INSERT INTO public.author_stats (user_id, likes_received)
+        SELECT author_id, 1 FROM upd
+        ON CONFLICT (user_id) DO UPDATE
+        SET likes_received = author_stats.likes_received + 1
+    )
+    SELECT
+        COALESCE((SELECT likes_count FROM upd),
+                 (SELECT likes_count FROM public.blogs WHERE id = %s)) AS likes_count,
+        EXISTS(SELECT 1 FROM ins) AS created
+""")
+
+UNLIKE_BLOG = register('unlike_blog', prepare=True, sql="""
+    WITH del AS (
+        DELETE FROM public.likes
+        WHERE user_id = %s AND blog_id = %s
+        RETURNING blog_id, created_at
+    ), upd AS (
+        UPDATE public.blogs
+        SET likes_count = GREATEST(likes_count - 1, 0)
+        WHERE id IN (SELECT blog_id FROM del)
+        RETURNING likes_count, author_id
+    ), stats AS (
+        UPDATE public.author_stats
+        SET likes_received = GREATEST(likes_received - 1, 0)
+        WHERE user_id IN (SELECT author_id FROM upd)
+    )
+    SELECT
+        COALESCE((SELECT likes_count FROM upd),
+                 (SELECT likes_count FROM public.blogs WHERE id = %s)) AS likes_count,
+        EXISTS(SELECT 1 FROM del) AS deleted,
+        (SELECT created_at FROM del) AS liked_at
+""")
+
+ADJUST_COMMENTS_COUNT = register('adjust_comments_count', """
+    UPDATE public.blogs
+    SET comments_count = GREATEST(comments_count + %s, 0)
+    WHERE id = %s
+    RETURNING comments_count
+""")
+
+LOCK_BLOGS = register('lock_blogs', """
+    SELECT id FROM public.blogs WHERE id = ANY(%s::uuid[]) FOR UPDATE
+""")
+
+RECOUNT_BLOGS = register('recount_blogs', """
+    UPDATE public.blogs b
+    SET likes_count = c.likes_count, comments_count = c.comments_count
+    FROM (
+        SELECT
+            b2.id,
+            (SELECT COUNT(*) FROM public.likes l WHERE l.blog_id = b2.id) AS likes_count,
+            (SELECT COUNT(*) FROM public.comments c WHERE c.blog_id = b2.id) AS comments_count
+        FROM public.blogs b2
+        WHERE b2.id = ANY(%s::uuid[])
+    ) c
+    WHERE b.id = c.id
+      AND (b.likes_count <> c.likes_count OR b.comments_count <> c.comments_count)
+    RETURNING CAST(b.id AS text) AS id
+""")
+
+# ----------------------------------------
+# Wishlist and per-user engagement
+# ----------------------------------------
+
+WISHLIST_ADD = register('wishlist_add', """
+    INSERT INTO public.wishlist (id, user_id, blog_id, created_at)
+    VALUES (%s, %s, %s, NOW())
+""")
+
+WISHLIST_REMOVE = register('wishlist_remove', """
+    DELETE FROM public.wishlist
+    WHERE user_id = %s AND blog_id = %s
+""")
+
+USER_ENGAGEMENT = register('user_engagement', """
+    SELECT 'l' AS kind, CAST(blog_id AS text) AS blog_id FROM public.likes WHERE user_id = %s
+    UNION ALL
+    SELECT 'w', CAST(blog_id AS text) FROM public.wishlist WHERE user_id = %s
+""")
+
+# ----------------------------------------
+# Users
+# ----------------------------------------
+
+USER_FOR_LOGIN = register('user_for_login', prepare=True, sql="""
+    SELECT CAST(id AS text) AS id, username, email, password, name
+    FROM public.users
+    WHERE email = %s AND is_active = true
+""")
+
+USER_BY_USERNAME = register('user_by_username', """
+    SELECT CAST(id AS text) AS id, username, name
+    FROM public.users
+    WHERE username = %s AND is_active = true
+""")
+
+USER_PROFILE = register('user_profile', """
+    SELECT u.created_at, COALESCE(s.posts_count, 0) AS blogs_count
+    FROM public.users u
+    LEFT JOIN public.author_stats s ON s.user_id = u.id
+    WHERE u.id = %s AND u.is_active = true
+""")
+
+# Primary-key walks for batch jobs: pass NIL_UUID for the first batch
+NIL_UUID = '00000000-0000-0000-0000-000000000000'
+
+BLOG_IDS_AFTER = register('blog_ids_after', """
+    SELECT CAST(id AS text) AS id FROM public.blogs WHERE id > %s ORDER BY id LIMIT %s
+""")
+
+USER_IDS_AFTER = register('user_ids_after', """
+    SELECT CAST(id AS text) AS id FROM public.users WHERE id > %s ORDER BY id LIMIT %s
+""")
+
+SAMPLE_BLOG_INSERT = register('sample_blog_insert', """
+    INSERT INTO public.blogs (id, title, content, excerpt, author_id, is_published, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s, true, %s, %s)
+    ON CONFLICT (id) DO NOTHING
+""")
+
+# A published blog its author has not liked (bench_prepared_statements)
+UNLIKED_OWN_BLOG = register('unliked_own_blog', """
+    SELECT CAST(b.id AS text) AS blog_id, CAST(b.author_id AS text) AS user_id, u.email
+    FROM public.blogs b JOIN public.users u ON b.author_id = u.id
+    WHERE b.is_published = true
+      AND NOT EXISTS (SELECT 1 FROM public.likes l WHERE l.blog_id = b.id AND l.user_id = u.id)
+    ORDER BY b.created_at DESC LIMIT 1
+""")
+
+DB_NOW = register('db_now', """
+    SELECT NOW() AS now
+""")
+
+# ----------------------------------------
+# Comments (see comments.py)
+# ----------------------------------------
+
+COMMENTS_PAGE = register('comments_page', """
+    SELECT CAST(c.id AS text) AS id, c.content, c.created_at, CAST(c.user_id AS text) AS author_id
+    FROM public.comments c
+    WHERE c.blog_id = %s
+    {keyset}
+    ORDER BY {order}
+    LIMIT %s
+""")
+
+COMMENT_AUTHORS = register('comment_authors', """
+    SELECT CAST(id AS text) AS id, username, name
+    FROM public.users
+    WHERE id = ANY(%s::uuid[])
+""")
+
+COMMENT_CREATE = register('comment_create', """
+    INSERT INTO public.comments (id, blog_id, user_id, content, created_at)
+    VALUES (%s, %s, %s, %s, NOW())
+    RETURNING CAST(id AS text) AS id, content, created_at
+""")
+
+# ----------------------------------------
+# Author stats (see author_stats.py)
+# ----------------------------------------
+
+ADJUST_AUTHOR_STATS = register('adjust_author_stats', """
+    INSERT INTO public.author_stats (user_id, posts_count, likes_received, total_views)
+    VALUES (%s, GREATEST(%s, 0), GREATEST(%s, 0), GREATEST(%s, 0))
+    ON CONFLICT (user_id) DO UPDATE SET
+        posts_count = GREATEST(author_stats.posts_count + %s, 0),
+        likes_received = GREATEST(author_stats.likes_received + %s, 0),
+        total_views = GREATEST(author_stats.total_views + %s, 0)
+""")
+
+ADD_AUTHOR_VIEWS = register('add_author_views', """
+    INSERT INTO public.author_stats (user_id, total_views)
+    SELECT b.author_id, SUM(v.views)
+    FROM unnest(%s::uuid[], %s::integer[]) AS v(id, views)
+    JOIN public.blogs b ON b.id = v.id
+    GROUP BY b.author_id
+    ORDER BY b.author_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET total_views = author_stats.total_views + EXCLUDED.total_views
+""")
+
+AUTHOR_PROFILE = register('author_profile', """
+    SELECT CAST(u.id AS text) AS id, u.username, COALESCE(NULLIF(u.name, ''), u.username) AS name,
+           u.created_at,
+           COALESCE(s.posts_count, 0) AS posts_count,
+           COALESCE(s.likes_received, 0) AS likes_received,
+           COALESCE(s.total_views, 0) AS total_views,
+           COALESCE(f.followers_count, 0) AS followers_count
+    FROM public.users u
+    LEFT JOIN public.author_stats s ON s.user_id = u.id
+    LEFT JOIN public.follower_counts f ON f.user_id = u.id
+    WHERE u.username = %s AND u.is_active = true
+""")
+
+AUTHOR_POSTS = register('author_posts', """
+    SELECT {select}
+    FROM public.blogs b
+    {join}
+    WHERE b.author_id = %s AND b.is_published = true
+    {keyset}
+    ORDER BY {order}
+    LIMIT %s
+""")
+
+LOCK_AUTHOR_STATS = register('lock_author_stats', """
+    SELECT user_id FROM public.author_stats WHERE user_id = ANY(%s::uuid[]) FOR UPDATE
+""")
+
+RECOUNT_AUTHORS = register('recount_authors', """
+    INSERT INTO public.author_stats AS s (user_id, posts_count, likes_received, total_views)
+    SELECT u.id,
+           COUNT(b.id) FILTER (WHERE b.is_published),
+           COALESCE(SUM(b.likes_count), 0),
+           COALESCE(SUM(b.view_count), 0)
+    FROM public.users u
+    LEFT JOIN public.blogs b ON b.author_id = u.id
+    WHERE u.id = ANY(%s::uuid[])
+    GROUP BY u.id
+    ON CONFLICT (user_id) DO UPDATE SET
+        posts_count = EXCLUDED.posts_count,
+        likes_received = EXCLUDED.likes_received,
+        total_views = EXCLUDED.total_views
+    WHERE (s.posts_count, s.likes_received, s.total_views)
+          IS DISTINCT FROM (EXCLUDED.posts_count, EXCLUDED.likes_received, EXCLUDED.total_views)
+    RETURNING CAST(s.user_id AS text) AS user_id
+""")
+
+# ----------------------------------------
+# View counts (see view_counts.py)
+# ----------------------------------------
+
+FLUSH_VIEW_COUNTS = register('flush_view_counts', """
+    UPDATE public.blogs b
+    SET view_count = b.view_count + v.views
+    FROM unnest(%s::uuid[], %s::integer[]) AS v(id, views)
+    WHERE b.id = v.id
+""")
+
+# ----------------------------------------
+# Trending (see trending.py)
+# ----------------------------------------
+
+# Event weight scaled to the current epoch. KEY SHARE only conflicts with
+# the FOR UPDATE taken by decay/rebuild, so bumps never block each other but
+# wait out a rebase and then see the new epoch.
+_TRENDING_EPOCH = "(SELECT epoch FROM public.blog_trending_epoch FOR KEY SHARE) m"
+_TRENDING_BOOST = "%s * power(2, extract(epoch FROM now() - m.epoch) / %s)"
+
+
+def _trending_decay(age):
+    # 2 ** x underflows to an error in PostgreSQL for very negative x; anything
+    # older than 60 half-lives (trending.MIN_HALF_LIVES) is worth nothing anyway
+    return f"power(2, GREATEST(extract(epoch FROM {age}) / %(half_life)s, -60))"
+
+
+BUMP_TRENDING = register('bump_trending', f"""
+    INSERT INTO public.blog_trending (blog_id, score, updated_at)
+    SELECT %s, {_TRENDING_BOOST}, now()
+    FROM {_TRENDING_EPOCH}
+    ON CONFLICT (blog_id) DO UPDATE
+    SET score = blog_trending.score + EXCLUDED.score, updated_at = now()
+""")
+
+UNBUMP_TRENDING = register('unbump_trending', f"""
+    UPDATE public.blog_trending t
+    SET score = GREATEST(t.score - %s * power(2, extract(epoch FROM %s - m.epoch) / %s), 0),
+        updated_at = now()
+    FROM {_TRENDING_EPOCH}
+    WHERE t.blog_id = %s
+""")
+
+# Only blogs that still exist; sorted input keeps the lock order stable
+BUMP_TRENDING_VIEWS = register('bump_trending_views', f"""
+    INSERT INTO public.blog_trending (blog_id, score, updated_at)
+    SELECT v.id, v.views * {_TRENDING_BOOST}, now()
+    FROM unnest(%s::uuid[], %s::integer[]) AS v(id, views)
+    JOIN public.blogs b ON b.id = v.id
+    CROSS JOIN {_TRENDING_EPOCH}
+    ORDER BY v.id
+    ON CONFLICT (blog_id) DO UPDATE
+    SET score = blog_trending.score + EXCLUDED.score, updated_at = now()
+""")
+
+# Bumps wait on this lock, so none is scaled to the old epoch after a rescale
+LOCK_TRENDING_EPOCH = register('lock_trending_epoch', """
+    SELECT extract(epoch FROM m.epoch - now()) AS age
+    FROM public.blog_trending_epoch m
+    FOR UPDATE
+""")
+
+PRUNE_TRENDING = register('prune_trending', """
+    DELETE FROM public.blog_trending WHERE score * %s < %s
+""")
+
+RESCALE_TRENDING = register('rescale_trending', """
+    UPDATE public.blog_trending SET score = score * %s
+""")
+
+RESET_TRENDING_EPOCH = register('reset_trending_epoch', """
+    UPDATE public.blog_trending_epoch SET epoch = now()
+""")
+
+CLEAR_TRENDING = register('clear_trending', """
+    DELETE FROM public.blog_trending
+""")
+
+# view_count has no timestamps, so views decay from the blog's created_at
+REBUILD_TRENDING = register('rebuild_trending', f"""
+    INSERT INTO public.blog_trending (blog_id, score, updated_at)
+    SELECT blog_id, SUM(score), now()
+    FROM (
+        SELECT l.blog_id, %(like)s * {_trending_decay('l.created_at - now()')} AS score
+        FROM public.likes l
+        UNION ALL
+        SELECT c.blog_id, %(comment)s * {_trending_decay('c.created_at - now()')}
+        FROM public.comments c
+        UNION ALL
+        SELECT b.id, %(view)s * COALESCE(b.view_count, 0) * {_trending_decay('b.created_at - now()')}
+        FROM public.blogs b
+        WHERE b.view_count > 0
+    ) events
+    GROUP BY blog_id
+    HAVING SUM(score) >= %(prune)s
+""")
+
+# Walks blog_trending_score_idx and joins each hit by primary key
+TRENDING_BLOGS = register('trending_blogs', f"""
+    SELECT {{select}},
+           t.score * {_trending_decay('m.epoch - now()')} AS trending_score
+    FROM public.blog_trending t
+    JOIN public.blogs b ON b.id = t.blog_id
+    {{join}}
+    CROSS JOIN public.blog_trending_epoch m
+    WHERE b.is_published = true
+    ORDER BY t.score DESC, t.blog_id DESC
+    LIMIT %(limit)s
+""")
+
+# ----------------------------------------
+# Follows and home timelines (see timeline.py)
+# ----------------------------------------
+
+FOLLOW_AUTHOR = register('follow_author', """
+    WITH ins AS (
+        INSERT INTO public.follows (follower_id, followee_id, created_at)
+        VALUES (%s, %s, NOW())
+        ON CONFLICT (follower_id, followee_id) DO NOTHING
+        RETURNING followee_id
+    ), upd AS (
+        INSERT INTO public.follower_counts (user_id, followers_count)
+        SELECT followee_id, 1 FROM ins
+        ON CONFLICT (user_id) DO UPDATE
+        SET followers_count = follower_counts.followers_count + 1
+        RETURNING followers_count
+    )
+    SELECT
+        COALESCE((SELECT followers_count FROM upd),
+                 (SELECT followers_count FROM public.follower_counts WHERE user_id = %s), 0) AS followers_count,
+        EXISTS(SELECT 1 FROM ins) AS created
+""")
+
+UNFOLLOW_AUTHOR = register('unfollow_author', """
+    WITH del AS (
+        DELETE FROM public.follows
+        WHERE follower_id = %s AND followee_id = %s
+        RETURNING followee_id
+    ), upd AS (
+        UPDATE public.follower_counts
+        SET followers_count = GREATEST(followers_count - 1, 0)
+        WHERE user_id IN (SELECT followee_id FROM del)
+        RETURNING followers_count
+    )
+    SELECT
+        COALESCE((SELECT followers_count FROM upd),
+                 (SELECT followers_count FROM public.follower_counts WHERE user_id = %s), 0) AS followers_count,
+        EXISTS(SELECT 1 FROM del) AS deleted
+""")
+
+BACKFILL_TIMELINE = register('backfill_timeline', """
+    INSERT INTO public.timeline_entries (user_id, blog_id, author_id, created_at)
+    SELECT %s, b.id, b.author_id, b.created_at
+    FROM public.blogs b
+    WHERE b.author_id = %s AND b.is_published = true
+    ORDER BY b.created_at DESC, b.id DESC
+    LIMIT %s
+    ON CONFLICT (user_id, blog_id) DO NOTHING
+""")
+
+DROP_TIMELINE_AUTHOR = register('drop_timeline_author', """
+    DELETE FROM public.timeline_entries
+    WHERE user_id = %s AND author_id = %s
+""")
+
+FAN_OUT_POST = register('fan_out_post', """
+    INSERT INTO public.timeline_entries (user_id, blog_id, author_id, created_at)
+    SELECT f.follower_id, %s, %s, %s
+    FROM public.follows f
+    WHERE f.followee_id = %s
+      AND COALESCE((SELECT followers_count FROM public.follower_counts WHERE user_id = %s), 0) <= %s
+    ON CONFLICT (user_id, blog_id) DO NOTHING
+""")
+
+# Fanned-out entries (keyset on t.created_at, t.blog_id)
+TIMELINE_PUSHED = register('timeline_pushed', """
+    SELECT t.created_at, CAST(t.blog_id AS text) AS blog_id
+    FROM public.timeline_entries t
+    WHERE t.user_id = %s
+    {keyset}
+    ORDER BY {order}
+    LIMIT %s
+""")
+
+# High-follower authors: one bounded index scan per author (keyset on b.*)
+TIMELINE_PULLED = register('timeline_pulled', """
+    SELECT p.created_at, CAST(p.id AS text) AS blog_id
+    FROM public.follows f
+    JOIN public.follower_counts c ON c.user_id = f.followee_id
+    CROSS JOIN LATERAL (
+        SELECT b.created_at, b.id
+        FROM public.blogs b
+        WHERE b.author_id = f.followee_id AND b.is_published = true
+        {keyset}
+        ORDER BY {order}
+        LIMIT %s
+    ) p
+    WHERE f.follower_id = %s AND c.followers_count > %s
+""")
+
+TRIM_TIMELINES = register('trim_timelines', """
+    DELETE FROM public.timeline_entries t
+    USING (
+        SELECT u.id AS user_id, cut.created_at, cut.blog_id
+        FROM unnest(%s::uuid[]) AS u(id)
+        CROSS JOIN LATERAL (
+            SELECT e.created_at, e.blog_id
+            FROM public.timeline_entries e
+            WHERE e.user_id = u.id
+            ORDER BY e.created_at DESC, e.blog_id DESC
+            OFFSET %s LIMIT 1
+        ) cut
+    ) c
+    WHERE t.user_id = c.user_id
+      AND (t.created_at, t.blog_id) <= (c.created_at, c.blog_id)
+""")
+
+# ----------------------------------------
+# Related posts (see related.py, build_related_posts)
+# ----------------------------------------
+
+ENQUEUE_RELATED = register('enqueue_related', """
+    INSERT INTO public.blog_related_queue (blog_id, queued_at)
+    VALUES (%s, NOW())
+    ON CONFLICT (blog_id) DO UPDATE SET queued_at = EXCLUDED.queued_at
+""")
+
+RELATED_FOR_BLOG = register('related_for_blog', """
+    SELECT CAST(related_id AS text) AS related_id, score
+    FROM public.blog_related
+    WHERE blog_id = %s
+    ORDER BY score DESC, related_id
+    LIMIT %s
+""")
+
+DELETE_RELATED = register('delete_related', """
+    DELETE FROM public.blog_related WHERE blog_id = ANY(%s::uuid[])
+""")
+
+CLEAR_RELATED = register('clear_related', """
+    DELETE FROM public.blog_related
+""")
+
+# {conflict}: '' to insert, or an ON CONFLICT clause to upsert. The model can
+# still hold blogs deleted since it was built; the joins skip those.
+INSERT_RELATED = register('insert_related', """
+    INSERT INTO public.blog_related (blog_id, related_id, score)
+    SELECT v.blog_id, v.related_id, v.score
+    FROM unnest(%s::uuid[], %s::uuid[], %s::real[]) AS v(blog_id, related_id, score)
+    JOIN public.blogs b ON b.id = v.blog_id
+    JOIN public.blogs r ON r.id = v.related_id
+    {conflict}
+""")
+
+TRIM_RELATED = register('trim_related', """
+    DELETE FROM public.blog_related r
+    USING (
+        SELECT blog_id, related_id,
+               row_number() OVER (PARTITION BY blog_id ORDER BY score DESC, related_id) AS position
+        FROM public.blog_related
+        WHERE blog_id = ANY(%s::uuid[])
+    ) ranked
+    WHERE r.blog_id = ranked.blog_id AND r.related_id = ranked.related_id
+      AND ranked.position > %s
+""")
+
+# Each list's k-th score, 0 while it holds fewer than k
+RELATED_FLOORS = register('related_floors', """
+    SELECT CAST(blog_id AS text) AS blog_id, CASE WHEN COUNT(*) >= %s THEN MIN(score) ELSE 0 END AS floor
+    FROM public.blog_related
+    WHERE blog_id = ANY(%s::uuid[])
+    GROUP BY blog_id
+""")
+
+RELATED_SOURCE_BLOGS = register('related_source_blogs', """
+    SELECT CAST(id AS text) AS id, title, content FROM public.blogs
+    WHERE id > %s AND is_published = true
+    ORDER BY id LIMIT %s
+""")
+
+RELATED_QUEUE_BATCH = register('related_queue_batch', """
+    SELECT CAST(q.blog_id AS text) AS blog_id, q.queued_at, b.title, b.content, b.is_published
+    FROM public.blog_related_queue q
+    JOIN public.blogs b ON b.id = q.blog_id
+    ORDER BY q.queued_at
+    LIMIT %s
+""")
+
+# Entries re-queued (a newer queued_at) since they were read stay queued
+RELATED_QUEUE_DONE = register('related_queue_done', """
+    DELETE FROM public.blog_related_queue q
+    USING unnest(%s::uuid[], %s::timestamptz[]) AS done(blog_id, queued_at)
+    WHERE q.blog_id = done.blog_id AND q.queued_at = done.queued_at
+""")
+
+RELATED_QUEUE_CLEAR_BEFORE = register('related_queue_clear_before', """
+    DELETE FROM public.blog_related_queue WHERE queued_at <= %s
+""")
+
+# ----------------------------------------
+# Co-likes (see colikes.py, build_colikes)
+# ----------------------------------------
+
+COLIKES_FOR_BLOG = register('colikes_for_blog', """
+    SELECT CAST(related_id AS text) AS related_id, co_likes
+    FROM public.blog_colikes
+    WHERE blog_id = %s
+    ORDER BY co_likes DESC, related_id
+    LIMIT %s
+""")
+
+# {lock}: '' or FOR UPDATE
+COLIKE_WATERMARK = register('colike_watermark', """
+    SELECT last_created_at, CAST(last_like_id AS text) AS last_like_id FROM public.colike_state {lock}
+""")
+
+SET_COLIKE_WATERMARK = register('set_colike_watermark', """
+    UPDATE public.colike_state SET last_created_at = %s, last_like_id = %s
+""")
+
+# {conflict}: '' for a fresh build, or an ON CONFLICT clause that adds counts.
+# Rows for blogs deleted since the likes were read are skipped.
+INSERT_COLIKES = register('insert_colikes', """
+    INSERT INTO public.blog_colikes (blog_id, related_id, co_likes)
+    SELECT v.blog_id, v.related_id, v.co_likes
+    FROM unnest(%s::uuid[], %s::uuid[], %s::integer[]) AS v(blog_id, related_id, co_likes)
+    JOIN public.blogs b ON b.id = v.blog_id
+    JOIN public.blogs r ON r.id = v.related_id
+    {conflict}
+""")
+
+TRIM_COLIKES = register('trim_colikes', """
+    DELETE FROM public.blog_colikes c
+    USING (
+        SELECT blog_id, related_id,
+               row_number() OVER (PARTITION BY blog_id ORDER BY co_likes DESC, related_id) AS position
+        FROM public.blog_colikes
+        WHERE blog_id = ANY(%s::uuid[])
+    ) ranked
+    WHERE c.blog_id = ranked.blog_id AND c.related_id = ranked.related_id
+      AND ranked.position > %s
+""")
+
+CLEAR_COLIKES = register('clear_colikes', """
+    DELETE FROM public.blog_colikes
+""")
+
+NEWEST_LIKE = register('newest_like', """
+    SELECT created_at, CAST(id AS text) AS id FROM public.likes ORDER BY created_at DESC, id DESC LIMIT 1
+""")
+
+# Likes in (created_at, id) order: those up to a position, and those after one
+LIKES_UP_TO = register('likes_up_to', """
+    SELECT created_at, CAST(id AS text) AS id, CAST(user_id AS text) AS user_id,
+           CAST(blog_id AS text) AS blog_id
+    FROM public.likes
+    WHERE (created_at, id) <= (%s, %s)
+    ORDER BY created_at, id LIMIT %s
+""")
+
+LIKES_BETWEEN = register('likes_between', """
+    SELECT created_at, CAST(id AS text) AS id, CAST(user_id AS text) AS user_id,
+           CAST(blog_id AS text) AS blog_id
+    FROM public.likes
+    WHERE (created_at, id) > (%s, %s) AND (created_at, id) <= (%s, %s)
+    ORDER BY created_at, id LIMIT %s
+""")
+
+LIKES_AFTER = register('likes_after', """
+    SELECT created_at, CAST(id AS text) AS id, CAST(user_id AS text) AS user_id,
+           CAST(blog_id AS text) AS blog_id
+    FROM public.likes
+    WHERE (created_at, id) > (%s, %s)
+    ORDER BY created_at, id LIMIT %s
+""")
+
+# Each new like paired with the reader's earlier likes only, so a pair of
+# new likes is counted once (by the later one)
+EARLIER_COLIKES = register('earlier_colikes', """
+    SELECT CAST(n.blog_id AS text) AS blog_id, CAST(o.blog_id AS text) AS related_id
+    FROM unnest(%s::timestamptz[], %s::uuid[], %s::uuid[], %s::uuid[])
+         AS n(created_at, id, user_id, blog_id)
+    CROSS JOIN LATERAL (
+        SELECT l.blog_id
+        FROM public.likes l
+        WHERE l.user_id = n.user_id AND (l.created_at, l.id) < (n.created_at, n.id)
+        ORDER BY l.created_at DESC, l.id DESC
+        LIMIT %s
+    ) o
+""")
+
+# ----------------------------------------
+# Search (see search.py)
+# ----------------------------------------
+
+# Rank over the GIN matches first, then join/headline only the page
+SEARCH_BLOGS = register('search_blogs', """
+    WITH q AS (
+        SELECT websearch_to_tsquery('english', %s) AS query
+    ), hits AS (
+        SELECT b.id, ts_rank(b.search_vector, q.query) AS rank
+        FROM public.blogs b, q
+        WHERE b.search_vector @@ q.query AND b.is_published = true
+        ORDER BY rank DESC, b.id
+        LIMIT %s OFFSET %s
+    )
+    SELECT {select},
+           hits.rank,
+           ts_headline('english', b.title, q.query, %s) AS title_highlight,
+           ts_headline('english', b.content, q.query, %s) AS content_highlight
+    FROM hits
+    JOIN public.blogs b ON b.id = hits.id
+    {join}
+    CROSS JOIN q
+    ORDER BY hits.rank DESC, b.id
+""")
+
+# SQLite FTS5 fallback: no schema prefix, so {join} names plain `users`
+SEARCH_BLOGS_FTS5 = register('search_blogs_fts5', """
+    SELECT {select},
+           -bm25(blogs_fts, 10.0, 1.0) AS rank,
+           snippet(blogs_fts, 0, %s, %s, '...', 10) AS title_highlight,
+           snippet(blogs_fts, 1, %s, %s, '...', 20) AS content_highlight
+    FROM blogs_fts
+    JOIN blogs b ON b.rowid = blogs_fts.rowid
+    {join}
+    WHERE blogs_fts MATCH %s AND b.is_published
+    ORDER BY bm25(blogs_fts, 10.0, 1.0), b.id
+    LIMIT %s OFFSET %s
+""")
@@ -0,0 +1,69 @@
+from django.conf import settings
+
+from .queries import (
+    DELETE_RELATED, ENQUEUE_RELATED, INSERT_RELATED, RELATED_FLOORS, RELATED_FOR_BLOG, TRIM_RELATED,
+    execute, fetch_all,
+)
+
+# ========================================
+# 🧭 RELATED POSTS (READ SIDE)
+# ========================================
+#
+# public.blog_related holds each blog's precomputed top-k neighbours by
+# TF-IDF cosine similarity; reading them is one index range scan. The
+# vectors and the similarity search live in related_model.py and run in
+# `python manage.py build_related_posts`, never in a request. Created or
+# edited posts are queued here and picked up by `--incremental` runs.
+
+RELATED_TOP_K = getattr(settings, 'RELATED_TOP_K', 10)
+
+
+def enqueue_related(cursor, blog_id):
+    """Queue a created/edited blog for the next incremental neighbour update"""
+    execute(cursor, ENQUEUE_RELATED, [blog_id])
+
+
+def fetch_related_ids(cursor, blog_id, limit):
+    """[(related_id, score)] best first, from blog_related_lookup_idx"""
+    return [(row.related_id, float(row.score))
+            for row in fetch_all(cursor, RELATED_FOR_BLOG, [blog_id, limit])]
+
+
+def replace_neighbors(cursor, neighbors):
+    """
+    Overwrite the neighbour lists of the given blogs.
+
+    ``neighbors`` maps blog_id -> [(related_id, score)].
+    """
+    if not neighbors:
+        return
+    execute(cursor, DELETE_RELATED, [list(neighbors)])
+    _insert_rows(cursor, [
+        (blog_id, related_id, score)
+        for blog_id, pairs in neighbors.items()
+        for related_id, score in pairs
+    ], upsert=False)
+
+
+def add_reverse_neighbors(cursor, rows, k):
+    """
+    Offer (blog_id, related_id, score) rows to existing neighbour lists.
+
+    Each affected list is cut back to its best ``k``. Returns the new k-th
+    score per affected blog (0.0 while a list holds fewer than k).
+    """
+    if not rows:
+        return {}
+    _insert_rows(cursor, rows, upsert=True)
+    blog_ids = sorted({blog_id for blog_id, _, _ in rows})
+    execute(cursor, TRIM_RELATED, [blog_ids, k])
+    return {row.blog_id: float(row.floor) for row in fetch_all(cursor, RELATED_FLOORS, [k, blog_ids])}
+
+
+def _insert_rows(cursor, rows, upsert, batch_size=1000):
+    conflict_sql = ('ON CONFLICT (blog_id, related_id) DO UPDATE SET score = EXCLUDED.score'
+                    if upsert else '')
+    for start in range(0, len(rows), batch_size):
+        blog_ids, related_ids, scores = zip(*rows[start:start + batch_size])
+        execute(cursor, INSERT_RELATED, [list(blog_ids), list(related_ids), list(scores)],
+                conflict=conflict_sql)
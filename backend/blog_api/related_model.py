@@ -0,0 +1,206 @@
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+# ========================================
+# 🧮 TF-IDF MODEL FOR RELATED POSTS
+# ========================================
+#
+# Offline half of related posts (see related.py for the read side).
+#
+# Every published blog becomes one L2-normalised float32 TF-IDF row over a
+# capped vocabulary, so cosine similarity is a plain dot product and top-k
+# search is blocked matrix products plus argpartition. The model lives in
+# RELATED_MODEL_DIR as raw, memory-mapped files:
+#
+#   terms.json    vocabulary, in column order
+#   idf.npy       idf weight per column
+#   ids.txt       blog id per row
+#   vectors.f32   rows x columns float32, row major (appended to in place)
+#   floors.f32    each row's current k-th neighbour score
+#
+# The floors make incremental updates exact: a new post enters an existing
+# blog's list only if it beats that blog's k-th score, so an incremental
+# run is one pass over the matrix instead of a rebuild. New posts are
+# vectorised with the stored vocabulary; words it has never seen are
+# ignored until the next full rebuild.
+
+TOKEN_RE = re.compile(r'[a-z][a-z0-9]+')
+
+STOP_WORDS = frozenset("""
+    a about above after again against all am an and any are as at be because been before
+    being below between both but by can could did do does doing down during each few for
+    from further had has have having he her here hers herself him himself his how if in
+    into is it its itself just me more most my myself no nor not now of off on once only
+    or other our ours ourselves out over own same she should so some such than that the
+    their theirs them themselves then there these they this those through to too under
+    until up very was we were what when where which while who whom why will with you
+    your yours yourself yourselves also would one two get got like use using used
+""".split())
+
+# Title words count this many times as often as body words
+TITLE_WEIGHT = 3
+
+
+def tokenize(title, content):
+    """Lowercased word tokens without stop words, title words repeated"""
+    title_tokens = [t for t in TOKEN_RE.findall((title or '').lower()) if t not in STOP_WORDS]
+    body_tokens = [t for t in TOKEN_RE.findall((content or '').lower()) if t not in STOP_WORDS]
+    return title_tokens * TITLE_WEIGHT + body_tokens
+
+
+def build_vocabulary(document_frequencies, n_docs, max_features, min_df=2, max_df_ratio=0.5):
+    """
+    Pick the vocabulary and its smoothed idf weights.
+
+    Terms in fewer than ``min_df`` documents (typos, ids) or in more than
+    ``max_df_ratio`` of them (boilerplate) carry no signal and are dropped;
+    the ``max_features`` most frequent of the rest are kept.
+    """
+    min_df = min(min_df, n_docs)
+    max_df = max(1, int(max_df_ratio * n_docs)) if n_docs > 2 else n_docs
+    candidates = [(df, term) for term, df in document_frequencies.items() if min_df <= df <= max_df]
+    candidates.sort(key=lambda item: (-item[0], item[1]))
+    terms = [term for _, term in candidates[:max_features]]
+    df = np.array([document_frequencies[term] for term in terms], dtype=np.float64)
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+    return terms, idf
+
+
+def vectorize(token_lists, vocabulary, idf):
+    """Sublinear-tf TF-IDF rows, L2-normalised, as an (n, len(vocabulary)) float32 array"""
+    matrix = np.zeros((len(token_lists), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(token_lists):
+        columns = [vocabulary[token] for token in tokens if token in vocabulary]
+        if columns:
+            matrix[row] = np.bincount(columns, minlength=len(vocabulary))
+    present = matrix > 0
+    matrix[present] = 1 + np.log(matrix[present])
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+    return matrix
+
+
+def top_k_similar(queries, matrix, k, query_rows=None, block_size=8192):
+    """
+    Best ``k`` rows of ``matrix`` for each query row, by dot product.
+
+    ``matrix`` may be a memmap; it is read ``block_size`` rows at a time
+    and a running top-k is kept, so memory stays at queries x (k + block).
+    ``query_rows`` gives each query's own row in ``matrix`` to exclude it.
+    Returns (indices, scores), each (len(queries), k), best first; unused
+    slots have index -1 and score -inf.
+    """
+    n_queries = len(queries)
+    best_idx = np.full((n_queries, k), -1, dtype=np.int64)
+    best_scores = np.full((n_queries, k), -np.inf, dtype=np.float32)
+    for start in range(0, len(matrix), block_size):
+        block = np.asarray(matrix[start:start + block_size])
+        scores = queries @ block.T
+        if query_rows is not None:
+            own = np.asarray(query_rows) - start
+            inside = (own >= 0) & (own < len(block))
+            scores[np.nonzero(inside)[0], own[inside]] = -np.inf
+        block_idx = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+        candidate_scores = np.concatenate([best_scores, scores], axis=1)
+        candidate_idx = np.concatenate([best_idx, block_idx], axis=1)
+        keep = np.argpartition(-candidate_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(candidate_scores, keep, axis=1)
+        best_idx = np.take_along_axis(candidate_idx, keep, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+def neighbor_pairs(ids, indices, scores, min_score):
+    """Turn one top_k_similar() result row into [(related_id, score)]"""
+    return [(ids[i], round(float(s), 6)) for i, s in zip(indices, scores) if i >= 0 and s > min_score]
+
+
+def kth_floor(scores, min_score):
+    """A row's entry bar: its k-th score, or min_score while the list is not full"""
+    return float(scores[-1]) if np.isfinite(scores[-1]) and scores[-1] > min_score else min_score
+
+
+class RelatedModel:
+    """The on-disk TF-IDF model (see module comment for the file layout)"""
+
+    def __init__(self, path, terms, idf, ids):
+        self.path = path
+        self.terms = terms
+        self.vocabulary = {term: column for column, term in enumerate(terms)}
+        self.idf = idf
+        self.ids = ids
+        self.rows = {blog_id: row for row, blog_id in enumerate(ids)}
+
+    @classmethod
+    def create(cls, path, terms, idf):
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'terms.json'), 'w') as f:
+            json.dump(terms, f)
+        np.save(os.path.join(path, 'idf.npy'), idf)
+        for name in ('ids.txt', 'vectors.f32', 'floors.f32'):
+            open(os.path.join(path, name), 'wb').close()
+        return cls(path, terms, idf, [])
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, 'terms.json')) as f:
+            terms = json.load(f)
+        idf = np.load(os.path.join(path, 'idf.npy'))
+        with open(os.path.join(path, 'ids.txt')) as f:
+            ids = f.read().split()
+        return cls(path, terms, idf, ids)
+
+    def vectors(self):
+        if not self.ids or not self.terms:
+            # Nothing on disk to map yet
+            return np.zeros((len(self.ids), len(self.terms)), dtype=np.float32)
+        return np.memmap(os.path.join(self.path, 'vectors.f32'), dtype=np.float32, mode='r+',
+                         shape=(len(self.ids), len(self.terms)))
+
+    def floors(self):
+        if not self.ids:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(os.path.join(self.path, 'floors.f32'), dtype=np.float32, mode='r+',
+                         shape=(len(self.ids),))
+
+    def upsert(self, blog_ids, vectors):
+        """Overwrite rows of known blogs, append the rest; returns their row numbers"""
+        rows, new_ids, new_vectors = [], [], []
+        existing = self.vectors()
+        for blog_id, vector in zip(blog_ids, vectors):
+            if blog_id in self.rows:
+                existing[self.rows[blog_id]] = vector
+                rows.append(self.rows[blog_id])
+            else:
+                rows.append(len(self.ids) + len(new_ids))
+                new_ids.append(blog_id)
+                new_vectors.append(vector)
+        if isinstance(existing, np.memmap):
+            existing.flush()
+        if new_ids:
+            # Vectors and floors first: ids.txt is what defines the row count
+            with open(os.path.join(self.path, 'vectors.f32'), 'ab') as f:
+                f.write(np.asarray(new_vectors, dtype=np.float32).tobytes())
+            with open(os.path.join(self.path, 'floors.f32'), 'ab') as f:
+                f.write(np.zeros(len(new_ids), dtype=np.float32).tobytes())
+            with open(os.path.join(self.path, 'ids.txt'), 'a') as f:
+                f.write(''.join(f'{blog_id}\n' for blog_id in new_ids))
+            for blog_id in new_ids:
+                self.rows[blog_id] = len(self.ids)
+                self.ids.append(blog_id)
+        return rows
+
+
+def document_frequencies(documents):
+    """(Counter of per-term document counts, n_docs) over (id, title, content) rows"""
+    df, n_docs = Counter(), 0
+    for _, title, content in documents:
+        df.update(set(tokenize(title, content)))
+        n_docs += 1
+    return df, n_docs
+
@@ -0,0 +1,55 @@
+import time
+
+import orjson
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import request_timing
+
+# ========================================
+# 🚀 FAST JSON RENDERER
+# ========================================
+#
+# orjson encodes str/int/float/bool, dicts and lists, datetimes, dates and
+# UUIDs in C. Datetimes come out exactly as datetime.isoformat() writes
+# them, so views can hand the driver's values over unconverted. Anything
+# orjson does not know (Decimal, lazy translations, querysets, ...) goes
+# to DRF's own encoder, so output matches rest_framework's JSONRenderer.
+
+_fallback = JSONEncoder().default
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(data, indent=False):
+    started = time.perf_counter()
+    content = orjson.dumps(data, default=_fallback, option=_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+    # Same escaping as DRF: U+2028/2029 are valid JSON but end a line in JavaScript
+    if b'\xe2\x80' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    timing = request_timing.current()
+    if timing is not None:
+        timing.render += time.perf_counter() - started
+    return content
+
+
+class FastJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # The browsable API and "Accept: application/json; indent=4" ask for indented output
+        indent = (renderer_context or {}).get('indent') or 'indent=' in (accepted_media_type or '')
+        return dumps(data, indent=bool(indent))
+
+
+class FastJSONResponse(HttpResponse):
+    """JsonResponse rendered like FastJSONRenderer, for views outside DRF (async_views)"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(dumps(data), **kwargs)
@@ -0,0 +1,165 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# ========================================
+# ⏱️ PER-REQUEST QUERY AND TIME ACCOUNTING
+# ========================================
+#
+# ServerTimingMiddleware (middleware.py) opens a RequestTiming for every
+# request and answers with
+#
+#   Server-Timing: db;dur=4.1;desc="3 queries", app;dur=2.0, render;dur=0.3
+#
+# db      Django queries - through the same hook as connection.execute_wrapper,
+#         installed on every connection as it opens, so queries made on
+#         sync_to_async threads count too - plus asyncpg calls in async_db.py
+# render  JSON encoding in renderers.dumps
+# app     everything else between the middleware and the view
+#
+# The record lives in a ContextVar, which asgiref copies into the threads
+# it runs sync code on. Each request also adds to an in-process per-route
+# summary (/api/diagnostics/) and, with the blog_api.request_timing logger
+# at INFO, is logged as one JSON line.
+
+_current = contextvars.ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    __slots__ = ('started', 'queries', 'db', 'render')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.render = 0.0
+
+    def add_query(self, seconds):
+        self.queries += 1
+        self.db += seconds
+
+
+def current():
+    """The RequestTiming of the request being handled, or None"""
+    return _current.get()
+
+
+def start():
+    """Begin timing a request; returns (timing, token for finish())"""
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def finish(token):
+    _current.reset(token)
+
+
+def _record_query(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add_query(time.perf_counter() - started)
+
+
+def install_query_hook(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(install_query_hook, dispatch_uid='blog_api.request_timing')
+
+
+def server_timing_header(timing, total):
+    """Server-Timing value; app is what is left of ``total`` after db and render"""
+    app = max(total - timing.db - timing.render, 0.0)
+    return (
+        f'db;dur={timing.db * 1000:.2f};desc="{timing.queries} queries", '
+        f'app;dur={app * 1000:.2f}, render;dur={timing.render * 1000:.2f}'
+    )
+
+
+class RouteTotals:
+    __slots__ = ('requests', 'errors', 'queries', 'total', 'db', 'render', 'slowest')
+
+    def __init__(self):
+        self.requests = self.errors = self.queries = 0
+        self.total = self.db = self.render = self.slowest = 0.0
+
+    def as_dict(self):
+        count = self.requests
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'queries_avg': round(self.queries / count, 2),
+            'total_ms_avg': round(self.total / count * 1000, 2),
+            'db_ms_avg': round(self.db / count * 1000, 2),
+            'render_ms_avg': round(self.render / count * 1000, 2),
+            'app_ms_avg': round(max(self.total - self.db - self.render, 0.0) / count * 1000, 2),
+            'total_ms_max': round(self.slowest * 1000, 2),
+        }
+
+
+class RouteStats:
+    """Request counts and time totals per (method, route), for diagnostics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, timing, total, status):
+        with self._lock:
+            totals = self._routes.get(route)
+            if totals is None:
+                totals = self._routes[route] = RouteTotals()
+            totals.requests += 1
+            totals.errors += status >= 500
+            totals.queries += timing.queries
+            totals.total += total
+            totals.db += timing.db
+            totals.render += timing.render
+            totals.slowest = max(totals.slowest, total)
+
+    def summary(self):
+        with self._lock:
+            return {route: totals.as_dict() for route, totals in sorted(self._routes.items())}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_stats = RouteStats()
+
+
+def route_of(request):
+    """'GET api/blogs/<uuid:blog_id>/' - the URL pattern, not the concrete path"""
+    match = getattr(request, 'resolver_match', None)
+    return f'{request.method} {match.route if match is not None else "<unresolved>"}'
+
+
+def record(request, response, timing):
+    """Set the Server-Timing header and add the request to the per-route summary"""
+    total = time.perf_counter() - timing.started
+    response['Server-Timing'] = server_timing_header(timing, total)
+    route = route_of(request)
+    route_stats.record(route, timing, total, response.status_code)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({
+            'route': route,
+            'status': response.status_code,
+            'queries': timing.queries,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(timing.db * 1000, 2),
+            'render_ms': round(timing.render * 1000, 2),
+        }))
+    return response
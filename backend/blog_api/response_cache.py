@@ -0,0 +1,94 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# ========================================
+# 🗄️ VERSIONED RESPONSE CACHE
+# ========================================
+#
+# Cached feed pages and blog details are keyed by a version number instead
+# of being deleted on write. A write bumps the version (one cache.incr),
+# and every entry built from the old version simply stops being looked up
+# and ages out with its TTL. No key scans, works on locmem/file/redis.
+#
+# Only user-independent payloads are cached; per-user flags are overlaid
+# afterwards (see personalization.py).
+#
+# Likes and comments only move a blog's own version. Bumping the feed on
+# every interaction would drop every cached page under any real traffic,
+# so feed pages instead live for FEED_CACHE_TIMEOUT and their counters lag
+# by at most that; creating, editing or deleting a post still bumps it.
+
+RESPONSE_CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+FEED_CACHE_TIMEOUT = getattr(settings, 'FEED_CACHE_TIMEOUT', 30)
+
+FEED_VERSION_KEY = 'cache:feed:version'
+
+
+def _blog_version_key(blog_id):
+    return f'cache:blog:{blog_id}:version'
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a version evicted from the cache is never
+        # re-issued with a number an older entry was stored under. Versions
+        # expire with the entries, which bounds staleness on per-process
+        # caches that never see another worker's writes.
+        cache.add(key, time.time_ns(), timeout=RESPONSE_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key was evicted; any fresh seed invalidates older entries
+        version = time.time_ns()
+        cache.set(key, version, timeout=RESPONSE_CACHE_TIMEOUT)
+        return version
+
+
+def feed_page_key(page_size, page_cursor, variant=''):
+    """Cache key for one feed page under the current feed version"""
+    version = _get_version(FEED_VERSION_KEY)
+    page = hashlib.md5(f'{page_size}:{page_cursor or ""}:{variant}'.encode()).hexdigest()
+    return f'cache:feed:v{version}:{page}'
+
+
+def blog_detail_key(blog_id):
+    """Cache key for a blog detail under the blog's current version"""
+    version = _get_version(_blog_version_key(blog_id))
+    return f'cache:blog:{blog_id}:v{version}'
+
+
+def get_cached(key):
+    return cache.get(key)
+
+
+def set_cached(key, value, timeout=RESPONSE_CACHE_TIMEOUT):
+    cache.set(key, value, timeout=timeout)
+
+
+def set_cached_feed_page(key, page):
+    set_cached(key, page, timeout=FEED_CACHE_TIMEOUT)
+
+
+def invalidate_feed():
+    """A blog was created or removed: every cached feed page is stale"""
+    _bump_version(FEED_VERSION_KEY)
+
+
+def invalidate_blog(blog_id):
+    """A blog was edited or deleted: its detail and the feed are stale"""
+    _bump_version(_blog_version_key(blog_id))
+    _bump_version(FEED_VERSION_KEY)
+
+
+def invalidate_counters(blog_id):
+    """A like or comment moved a blog's counters: only its detail is stale"""
+    _bump_version(_blog_version_key(blog_id))
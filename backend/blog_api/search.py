@@ -0,0 +1,99 @@
+import re
+
+from django.conf import settings
+
+from .fields import needs_author, row_to_dict, select_fragments, select_sql
+from .queries import SEARCH_BLOGS, SEARCH_BLOGS_FTS5, fetch_all
+
+# ========================================
+# 🔎 FULL-TEXT SEARCH
+# ========================================
+#
+# PostgreSQL: blogs.search_vector is a stored generated tsvector over
+# title (weight A) and content (weight B) with a GIN index; matches are
+# ranked with ts_rank and only the returned page gets ts_headline snippets.
+#
+# SQLite (local development / tests): an external-content FTS5 table,
+# blogs_fts, kept in sync by triggers, ranked with bm25 and highlighted
+# with snippet(). Same request, same response shape.
+
+SEARCH_MAX_PAGE = getattr(settings, 'SEARCH_MAX_PAGE', 20)
+SEARCH_QUERY_MAX_LENGTH = 200
+
+HIGHLIGHT_START, HIGHLIGHT_STOP = '<mark>', '</mark>'
+
+SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(
+        title, content, content='blogs', content_rowid='rowid', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_ai AFTER INSERT ON blogs BEGIN
+        INSERT INTO blogs_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_ad AFTER DELETE ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_au AFTER UPDATE OF title, content ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+        INSERT INTO blogs_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+    END
+    """,
+    "INSERT INTO blogs_fts(blogs_fts) VALUES ('rebuild')",
+]
+
+
+def ensure_sqlite_fts(cursor):
+    """Create (and backfill) the FTS5 index for a local SQLite blogs table"""
+    for statement in SQLITE_FTS_DDL:
+        cursor.execute(statement)
+
+
+def _fts5_match_expression(query):
+    """Quote each word so user input can never be parsed as FTS5 syntax"""
+    words = re.findall(r'\w+', query)
+    return ' '.join('"{}"'.format(word) for word in words)
+
+
+def search_blogs(cursor, query, columns, limit, offset):
+    """
+    Ranked search over title and content.
+
+    Returns a list of blog dicts (projected to ``columns``) with ``rank``
+    and ``highlight`` added, best match first. Fetches ``limit`` rows.
+    """
+    if cursor.db.vendor == 'postgresql':
+        return _search_postgres(cursor, query, columns, limit, offset)
+    return _search_sqlite(cursor, query, columns, limit, offset)
+
+
+def _search_postgres(cursor, query, columns, limit, offset):
+    headline_opts = (f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, '
+                     'MaxFragments=2, MaxWords=20, MinWords=5')
+    rows = fetch_all(cursor, SEARCH_BLOGS, [query, limit, offset, headline_opts, headline_opts],
+                     **select_fragments(columns))
+    return [_to_result(columns, row) for row in rows]
+
+
+def _search_sqlite(cursor, query, columns, limit, offset):
+    match = _fts5_match_expression(query)
+    if not match:
+        return []
+    # No public. schema on SQLite
+    join_sql = 'JOIN users u ON b.author_id = u.id' if needs_author(columns) else ''
+    rows = fetch_all(cursor, SEARCH_BLOGS_FTS5,
+                     [HIGHLIGHT_START, HIGHLIGHT_STOP, HIGHLIGHT_START, HIGHLIGHT_STOP, match, limit, offset],
+                     select=select_sql(columns), join=join_sql)
+    return [_to_result(columns, row) for row in rows]
+
+
+def _to_result(columns, row):
+    blog = row_to_dict(columns, row)
+    blog['rank'] = round(float(row.rank), 6)
+    blog['highlight'] = {'title': row.title_highlight, 'content': row.content_highlight}
+    return blog
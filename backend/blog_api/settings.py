@@ -27,11 +27,18 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
+    'apps.users',
+    'blog_api',
 ]
 
+# public.users is the one identity store; existing databases run
+# `python manage.py adopt_user_model` once before migrating onto it
+AUTH_USER_MODEL = 'users.User'
+
 MIDDLEWARE = [
+    'blog_api.middleware.ServerTimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'blog_api.middleware.WhiteNoiseMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -41,7 +48,24 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'blog_api.urls'
+# Server-Timing: db;dur=..., app;dur=..., render;dur=... on every response, plus
+# per-route totals in /api/diagnostics/. REQUEST_TIMING_LOG=True also logs one JSON
+# line per request (logger blog_api.request_timing).
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'True') == 'True'
+REQUEST_TIMING_LOG = os.getenv('REQUEST_TIMING_LOG', 'False') == 'True'
+
+if REQUEST_TIMING_LOG:
+    LOGGING = {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'handlers': {'console': {'class': 'logging.StreamHandler'}},
+        'loggers': {
+            'blog_api.request_timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        },
+    }
+
+# asgi.py switches to blog_api.asgi_urls (async read views)
+ROOT_URLCONF = os.getenv('ROOT_URLCONF', 'blog_api.urls')
 
 TEMPLATES = [
     {
@@ -67,8 +91,10 @@ DATABASE_URL = os.getenv('DATABASE_URL')
 if DATABASE_URL and 'postgresql' in DATABASE_URL:
     # Production - Use PostgreSQL
     import dj_database_url
+    # blog_api.pooled_postgresql: the stock backend with connections reused
+    # from a per-process pool (see blog_api/db_pool.py)
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL)
+        'default': dj_database_url.parse(DATABASE_URL, engine='blog_api.pooled_postgresql')
     }
     print("✅ Using PostgreSQL (Production)")
 else:
@@ -81,6 +107,59 @@ else:
     }
     print("✅ Using SQLite (Local Development)")
 
+# Database connection pool, per process: DB_POOL_SIZE idle connections are kept,
+# up to DB_POOL_MAX_OVERFLOW more are opened under load, and a request waits
+# DB_POOL_TIMEOUT seconds for one before failing. Connections are replaced after
+# DB_POOL_MAX_LIFETIME seconds and pinged on checkout after DB_POOL_CHECK_IDLE idle.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '4'))
+DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', '4'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '10'))
+DB_POOL_MAX_LIFETIME = int(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))
+DB_POOL_CHECK_IDLE = int(os.getenv('DB_POOL_CHECK_IDLE', '30'))
+
+# Hot queries in blog_api/queries.py run as server-side prepared statements, parsed
+# and planned once per connection; at most DB_PREPARED_STATEMENTS_MAX per connection
+DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'True') == 'True'
+DB_PREPARED_STATEMENTS_MAX = int(os.getenv('DB_PREPARED_STATEMENTS_MAX', '64'))
+
+# ASGI only: asyncpg pool per worker for the async read views, and the thread
+# pool every remaining sync call (cache, DRF write views) runs on
+ASYNC_DB_POOL_MIN = int(os.getenv('ASYNC_DB_POOL_MIN', '1'))
+ASYNC_DB_POOL_MAX = int(os.getenv('ASYNC_DB_POOL_MAX', '10'))
+ASYNC_DB_IDLE_LIFETIME = int(os.getenv('ASYNC_DB_IDLE_LIFETIME', '300'))
+SYNC_TO_ASYNC_THREADS = int(os.getenv('SYNC_TO_ASYNC_THREADS', '8'))
+
+# Cache - local memory by default, CACHE_BACKEND=file|redis to share between workers.
+# locmem is per-process: with several gunicorn workers a write only invalidates the
+# worker that handled it, and the others serve stale entries until RESPONSE_CACHE_TIMEOUT.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'blog-api',
+        }
+    }
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300'))
+# Feed pages are not invalidated by likes/comments, so their counters lag by up to this
+FEED_CACHE_TIMEOUT = int(os.getenv('FEED_CACHE_TIMEOUT', '30'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -89,6 +168,28 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# Password hashing: PASSWORD_HASHER picks the algorithm for new hashes. The
+# rest stay listed so existing hashes still verify; they are re-hashed with
+# PASSWORD_HASHER on the next login. argon2 needs argon2-cffi, bcrypt_sha256 bcrypt.
+_PASSWORD_HASHERS = {
+    'pbkdf2_sha256': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt_sha256': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'pbkdf2_sha256')
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
+# Hashing runs on PASSWORD_HASH_WORKERS threads per process with at most
+# PASSWORD_HASH_MAX_QUEUE waiting; further logins/signups get a 503. Keep the
+# two together below GUNICORN_THREADS (gunicorn.conf.py) or the bound never applies.
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 2)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '2'))
+PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', '5'))
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -108,13 +209,70 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Stateless: request.user comes from the token's claims, no DB lookup
+        'blog_api.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        # orjson; datetimes, UUIDs and Decimals are encoded without per-field conversion
+        'blog_api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
+# Feed pagination (keyset on created_at, id)
+FEED_PAGE_SIZE = int(os.getenv('FEED_PAGE_SIZE', '15'))
+FEED_MAX_PAGE_SIZE = int(os.getenv('FEED_MAX_PAGE_SIZE', '50'))
+
+# Per-user liked/wishlisted id sets used to personalize the shared feed. A toggle
+# invalidates the sets only in the cache it ran against, so with per-process locmem
+# the other workers' copies are kept briefly to bound how long their flags lag.
+ENGAGEMENT_CACHE_TIMEOUT = int(os.getenv(
+    'ENGAGEMENT_CACHE_TIMEOUT', '5' if CACHE_BACKEND == 'locmem' else '300'))
+
+# Diagnostics: cached table stats, only attached to the feed when FEED_DEBUG_INFO is on
+DIAGNOSTICS_CACHE_TIMEOUT = int(os.getenv('DIAGNOSTICS_CACHE_TIMEOUT', '60'))
+# Lets /api/diagnostics/?refresh=1 bypass the cache; the endpoint is public, so off by default
+DIAGNOSTICS_ALLOW_REFRESH = os.getenv('DIAGNOSTICS_ALLOW_REFRESH', 'False') == 'True'
+FEED_DEBUG_INFO = os.getenv('FEED_DEBUG_INFO', 'False') == 'True'
+
+# Buffered view counts: flushed every N seconds or after N pending views
+VIEW_COUNT_FLUSH_INTERVAL = float(os.getenv('VIEW_COUNT_FLUSH_INTERVAL', '10'))
+VIEW_COUNT_FLUSH_THRESHOLD = int(os.getenv('VIEW_COUNT_FLUSH_THRESHOLD', '500'))
+VIEW_COUNT_MAX_PENDING = int(os.getenv('VIEW_COUNT_MAX_PENDING', '100000'))
+
+# Trending: time-decayed score, halved every TRENDING_HALF_LIFE_HOURS.
+# Run `manage.py refresh_trending` periodically (e.g. hourly) to rebase the decay.
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', '24'))
+TRENDING_LIKE_WEIGHT = 3.0
+TRENDING_COMMENT_WEIGHT = 5.0
+TRENDING_VIEW_WEIGHT = 0.1
+
+# Home timelines: authors with more followers than this are read at request time
+# instead of being copied into every follower's timeline on post.
+# Run `manage.py trim_timelines` periodically to keep timelines bounded.
+TIMELINE_FANOUT_MAX_FOLLOWERS = int(os.getenv('TIMELINE_FANOUT_MAX_FOLLOWERS', '5000'))
+TIMELINE_MAX_LENGTH = int(os.getenv('TIMELINE_MAX_LENGTH', '500'))
+TIMELINE_FOLLOW_BACKFILL = 20
+
+# Related posts: TF-IDF neighbour lists built by `manage.py build_related_posts`
+# (full rebuild nightly, `--incremental` every few minutes for new/edited posts)
+RELATED_TOP_K = 10
+RELATED_MAX_FEATURES = int(os.getenv('RELATED_MAX_FEATURES', '4096'))
+RELATED_MODEL_DIR = os.getenv('RELATED_MODEL_DIR', str(BASE_DIR / '.cache' / 'related'))
+
+# Co-like recommendations built by `manage.py build_colikes` (full nightly,
+# `--incremental` from cron). Readers' likes beyond COLIKE_MAX_PER_USER newest are ignored.
+COLIKE_TOP_N = 20
+COLIKE_MIN_COUNT = int(os.getenv('COLIKE_MIN_COUNT', '2'))
+COLIKE_MAX_PER_USER = int(os.getenv('COLIKE_MAX_PER_USER', '500'))
+COLIKE_CACHE_SECONDS = int(os.getenv('COLIKE_CACHE_SECONDS', '900'))
+
+# Full-text search: deepest ?page= served (ranked results past this are rarely useful)
+SEARCH_MAX_PAGE = 20
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
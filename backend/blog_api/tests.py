@@ -0,0 +1,1242 @@
+import base64
+import contextlib
+import json
+import threading
+import time
+import uuid
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .async_db import numbered, run_sync
+from .async_views import user_wishlist_view as async_wishlist_view
+from .author_stats import adjust_author_stats, fetch_author_profile, reconcile_author_batch
+from .authentication import ClaimsJWTAuthentication, current_user, tokens_for_user
+from . import db_pool, health, personalization, trending, urls
+from .db_pool import ConnectionPool, PoolTimeout, get_pool
+from .health import diagnostics_view, health_view
+from .passwords import HashingBusy, PasswordHashPool
+from .queries import (
+    BLOG_DETAIL, BLOG_IDS_AFTER, FEED_PAGE, LIKE_BLOG, UNLIKE_BLOG, USER_IDS_AFTER, fetch_one, register,
+)
+from .middleware import ServerTimingMiddleware
+from .renderers import FastJSONRenderer, FastJSONResponse
+from .request_timing import route_stats
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, paginate_rows
+from .colike_matrix import cap_per_user, count_partition, top_n
+from .comments import attach_authors, fetch_comments_page
+from .counters import adjust_comments_count, like_blog, reconcile_batch, unlike_blog
+from .related_model import build_vocabulary, tokenize, top_k_similar, vectorize
+from .timeline import merge_timeline
+from .trending import decay_factor, decay_trending, fetch_trending, unbump_trending
+from .search import ensure_sqlite_fts, search_blogs
+from .fields import VALIDATOR_COLUMNS, InvalidFields, parse_fields, project, row_to_dict, selected_columns
+from .conditional import compute_etag, compute_last_modified, is_conditional
+from .view_counts import ViewCountBuffer
+from .response_cache import blog_detail_key, feed_page_key, invalidate_blog, invalidate_counters, invalidate_feed
+from .personalization import _cache_key, _get_version, get_user_engagement, overlay_user_flags, record_engagement
+
+
+class FeedCursorTestCase(SimpleTestCase):
+
+    def setUp(self):
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        # Rows as the feed query returns them: (id, created_at), newest first
+        self.rows = [(uuid.uuid4(), base - timedelta(minutes=i)) for i in range(6)]
+
+    def position(self, row):
+        return row[1], row[0]
+
+    def test_cursor_roundtrip(self):
+        """Test that a cursor decodes back to the position it was built from"""
+        row_id, created_at = self.rows[0]
+        token = encode_cursor(created_at, row_id, 'prev')
+        self.assertEqual(decode_cursor(token), (created_at, str(row_id), 'prev'))
+
+    def test_invalid_cursor(self):
+        """Test that tampered cursors are rejected"""
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('not-a-cursor')
+
+    def test_cursor_id_must_be_uuid(self):
+        """Test that a well-formed cursor carrying a non-UUID id is rejected"""
+        for row_id in ('x', 42, None):
+            payload = json.dumps({'t': self.rows[0][1].isoformat(), 'id': row_id}).encode()
+            token = base64.urlsafe_b64encode(payload).decode().rstrip('=')
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(token)
+
+    def test_first_page_has_next_only(self):
+        """Test that the probe row produces a next link on the first page"""
+        rows, next_cursor, prev_cursor = paginate_rows(
+            self.rows, 5, 'next', has_cursor=False, position=self.position)
+        self.assertEqual(len(rows), 5)
+        self.assertIsNone(prev_cursor)
+        self.assertEqual(decode_cursor(next_cursor)[1], str(self.rows[4][0]))
+
+    def test_prev_page_is_reversed(self):
+        """Test that walking backwards returns rows newest first"""
+        ascending = list(reversed(self.rows[:3]))
+        rows, next_cursor, prev_cursor = paginate_rows(
+            ascending, 5, 'prev', has_cursor=True, position=self.position)
+        self.assertEqual(rows, self.rows[:3])
+        self.assertIsNotNone(next_cursor)
+        self.assertIsNone(prev_cursor)
+
+
+class UserFlagsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user_id = str(uuid.uuid4())
+        self.blog_ids = [str(uuid.uuid4()) for _ in range(3)]
+        cache.set(_cache_key(self.user_id), (_get_version(self.user_id), {self.blog_ids[0]}, set()))
+
+    def test_overlay_uses_cached_sets(self):
+        """Test that flags are read from the cached id sets without a query"""
+        with mock.patch.object(personalization, 'load_user_engagement') as load:
+            blogs = overlay_user_flags([{'id': blog_id} for blog_id in self.blog_ids], self.user_id)
+        load.assert_not_called()
+        self.assertEqual([b['user_liked'] for b in blogs], [True, False, False])
+        self.assertFalse(any(b['user_wishlisted'] for b in blogs))
+
+    def test_toggle_invalidates_on_commit(self):
+        """Test that a toggle invalidates the cached sets only once its transaction commits"""
+        fresh = ({self.blog_ids[1]}, {self.blog_ids[2]})
+        with mock.patch.object(personalization, 'load_user_engagement', return_value=fresh) as load:
+            with self.captureOnCommitCallbacks(execute=True):
+                record_engagement(self.user_id)
+                self.assertEqual(get_user_engagement(self.user_id), ({self.blog_ids[0]}, set()))
+            self.assertEqual(get_user_engagement(self.user_id), fresh)
+            self.assertEqual(get_user_engagement(self.user_id), fresh)
+        load.assert_called_once_with(self.user_id)
+
+    def test_set_loaded_before_a_toggle_is_not_served(self):
+        """Test that a reload racing a toggle cannot put the old sets back in the cache"""
+        cache.delete(_cache_key(self.user_id))
+        stale, fresh = ({self.blog_ids[0]}, set()), (set(), set())
+
+        def load(user_id):
+            if load.calls == 0:
+                # The toggle commits and invalidates while this reader is mid-load
+                with self.captureOnCommitCallbacks(execute=True):
+                    record_engagement(user_id)
+            load.calls += 1
+            return stale if load.calls == 1 else fresh
+        load.calls = 0
+
+        with mock.patch.object(personalization, 'load_user_engagement', side_effect=load):
+            self.assertEqual(get_user_engagement(self.user_id), stale)
+            self.assertEqual(get_user_engagement(self.user_id), fresh)
+        self.assertEqual(load.calls, 2)
+
+    def test_anonymous_flags_are_false(self):
+        """Test that anonymous viewers get false flags"""
+        blogs = overlay_user_flags([{'id': self.blog_ids[0]}], None)
+        self.assertFalse(blogs[0]['user_liked'])
+
+
+class ResponseCacheVersionTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.blog_id = str(uuid.uuid4())
+
+    def test_keys_are_stable_between_writes(self):
+        """Test that repeated reads map to the same cache entry"""
+        self.assertEqual(feed_page_key(15, None), feed_page_key(15, None))
+        self.assertEqual(blog_detail_key(self.blog_id), blog_detail_key(self.blog_id))
+
+    def test_new_blog_invalidates_feed_only(self):
+        """Test that creating a blog moves the feed to a new version"""
+        feed_key, detail_key = feed_page_key(15, None), blog_detail_key(self.blog_id)
+        invalidate_feed()
+        self.assertNotEqual(feed_page_key(15, None), feed_key)
+        self.assertEqual(blog_detail_key(self.blog_id), detail_key)
+
+    def test_blog_write_invalidates_detail_and_feed(self):
+        """Test that editing a blog moves both its detail and the feed"""
+        feed_key, detail_key = feed_page_key(15, None), blog_detail_key(self.blog_id)
+        invalidate_blog(self.blog_id)
+        self.assertNotEqual(feed_page_key(15, None), feed_key)
+        self.assertNotEqual(blog_detail_key(self.blog_id), detail_key)
+
+    def test_counter_change_keeps_feed(self):
+        """Test that a like or comment moves only the blog's detail, not every feed page"""
+        feed_key, detail_key = feed_page_key(15, None), blog_detail_key(self.blog_id)
+        invalidate_counters(self.blog_id)
+        self.assertEqual(feed_page_key(15, None), feed_key)
+        self.assertNotEqual(blog_detail_key(self.blog_id), detail_key)
+
+    def test_evicted_version_is_not_reused(self):
+        """Test that losing the version key never resurrects old entries"""
+        detail_key = blog_detail_key(self.blog_id)
+        cache.clear()
+        self.assertNotEqual(blog_detail_key(self.blog_id), detail_key)
+
+
+class ConditionalGetTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.blog = {
+            'id': str(uuid.uuid4()),
+            'title': 'Test Blog',
+            'content': 'Long content that is never hashed.',
+            'updated_at': '2025-01-01T12:00:00+00:00',
+            'likes_count': 3,
+            'comments_count': 1,
+            'user_liked': False,
+            'user_wishlisted': False,
+        }
+
+    def test_etag_ignores_content(self):
+        """Test that the ETag depends on updated_at and counters, not the body"""
+        etag = compute_etag([self.blog])
+        self.assertEqual(compute_etag([dict(self.blog, content='changed')]), etag)
+        self.assertNotEqual(compute_etag([dict(self.blog, likes_count=4)]), etag)
+        self.assertNotEqual(compute_etag([dict(self.blog, updated_at='2025-01-02T12:00:00+00:00')]), etag)
+
+    def test_etag_varies_with_viewer_flags(self):
+        """Test that a wishlist toggle changes the viewer's ETag"""
+        self.assertNotEqual(compute_etag([dict(self.blog, user_wishlisted=True)]),
+                            compute_etag([self.blog]))
+
+    def test_last_modified_is_newest_update(self):
+        """Test that Last-Modified is the newest updated_at on the page"""
+        older = dict(self.blog, updated_at='2024-06-01T00:00:00+00:00')
+        self.assertEqual(compute_last_modified([older, self.blog]),
+                         int(datetime(2025, 1, 1, 12, tzinfo=timezone.utc).timestamp()))
+        self.assertIsNone(compute_last_modified([]))
+
+    def test_validator_columns_give_the_full_page_etag(self):
+        """Test that the cheap probe's rows produce the same validators as the full rows"""
+        full_columns = selected_columns(parse_fields('title,content,author.name'))
+        values = {'id': self.blog['id'], 'title': 'Test Blog', 'content': 'x', 'author.name': 'Ann',
+                  'created_at': '2025-01-01T00:00:00+00:00', 'updated_at': self.blog['updated_at'],
+                  'likes_count': 3, 'comments_count': 1}
+        full = row_to_dict(full_columns, [values[column] for column in full_columns])
+        probe = row_to_dict(VALIDATOR_COLUMNS, [values[column] for column in VALIDATOR_COLUMNS])
+        self.assertEqual(compute_etag([probe]), compute_etag([full]))
+        self.assertEqual(compute_last_modified([probe]), compute_last_modified([full]))
+
+    def test_only_revalidations_are_probed(self):
+        """Test that the probe runs only for requests carrying validators"""
+        factory = APIRequestFactory()
+        self.assertFalse(is_conditional(factory.get('/api/blogs/')))
+        self.assertTrue(is_conditional(factory.get('/api/blogs/', HTTP_IF_NONE_MATCH='"abc"')))
+        self.assertTrue(is_conditional(
+            factory.get('/api/blogs/', HTTP_IF_MODIFIED_SINCE='Wed, 01 Jan 2025 00:00:00 GMT')))
+
+
+class ViewCountBufferTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.buffer = ViewCountBuffer(flush_interval=60, flush_threshold=3, max_pending=5)
+        # Keep the background flusher out of unit tests
+        self.buffer._ensure_flusher = lambda: None
+        self.blog_id = str(uuid.uuid4())
+
+    def test_views_are_aggregated_per_blog(self):
+        """Test that repeated views collapse into one pending count"""
+        for _ in range(2):
+            self.buffer.record(self.blog_id)
+        stats = self.buffer.stats()
+        self.assertEqual(stats['pending_views'], 2)
+        self.assertEqual(stats['pending_blogs'], 1)
+
+    def test_threshold_wakes_flusher(self):
+        """Test that reaching the threshold signals an early flush"""
+        for _ in range(3):
+            self.buffer.record(self.blog_id)
+        self.assertTrue(self.buffer._wakeup.is_set())
+
+    def test_failed_flush_loss_is_bounded(self):
+        """Test that views held for retry never exceed max_pending"""
+        self.buffer._requeue(Counter({self.blog_id: 4}), 4)
+        self.buffer._requeue(Counter({self.blog_id: 4}), 4)
+        stats = self.buffer.stats()
+        self.assertEqual(stats['pending_views'], 4)
+        self.assertEqual(stats['dropped_total'], 4)
+
+
+class SparseFieldsetTestCase(SimpleTestCase):
+
+    def test_default_list_shape_has_no_content(self):
+        """Test that list responses leave out content unless requested"""
+        fields = parse_fields(None)
+        self.assertNotIn('content', fields)
+        self.assertNotIn('content', selected_columns(fields))
+
+    def test_projection_reads_only_requested_columns(self):
+        """Test that the SELECT list follows ?fields= plus the keyset/ETag columns"""
+        fields = parse_fields('title,author.name')
+        self.assertEqual(selected_columns(fields), [
+            'id', 'title', 'created_at', 'updated_at', 'author.name', 'likes_count', 'comments_count',
+        ])
+
+    def test_unknown_field_is_rejected(self):
+        """Test that typos in ?fields= are reported"""
+        with self.assertRaises(InvalidFields):
+            parse_fields('id,body')
+
+    def test_rows_are_projected(self):
+        """Test that hidden columns are dropped from the response"""
+        fields = parse_fields('id,author.name')
+        columns = selected_columns(fields)
+        blog_id = uuid.uuid4()
+        row = [blog_id, datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 1, 1, tzinfo=timezone.utc), 'Ann', 2, 0]
+        self.assertEqual(project(row_to_dict(columns, row), fields),
+                         {'id': str(blog_id), 'author': {'name': 'Ann'}})
+
+
+class CommentAuthorsTestCase(SimpleTestCase):
+
+    def test_authors_are_attached_per_comment(self):
+        """Test that hydrated authors replace author ids, including deleted users"""
+        comments = [
+            {'id': 'c1', 'content': 'a', 'author_id': 'u1'},
+            {'id': 'c2', 'content': 'b', 'author_id': 'u2'},
+            {'id': 'c3', 'content': 'c', 'author_id': 'u1'},
+        ]
+        authors = {'u1': {'id': 'u1', 'username': 'ann', 'name': 'Ann'}}
+        attach_authors(comments, authors)
+        self.assertEqual([c['author'] for c in comments], [authors['u1'], None, authors['u1']])
+        self.assertNotIn('author_id', comments[0])
+
+    def test_page_leaves_timestamps_to_the_renderer(self):
+        """Test that comments keep the driver's datetimes and render as isoformat()"""
+        created_at = datetime(2025, 1, 1, 12, 30, 0, 123456, tzinfo=timezone.utc)
+        cursor = ScriptedCursor((('id', 'content', 'created_at', 'author_id'), [('c1', 'a', created_at, 'u1')]))
+        comments, _, _ = fetch_comments_page(cursor, 'b1', None, 15)
+        self.assertIs(comments[0]['created_at'], created_at)
+        rendered = json.loads(FastJSONRenderer().render(comments))
+        self.assertEqual(rendered[0]['created_at'], created_at.isoformat())
+
+
+class HomeTimelineMergeTestCase(SimpleTestCase):
+
+    def setUp(self):
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.at = lambda minutes: base - timedelta(minutes=minutes)
+
+    def test_sources_are_interleaved_newest_first(self):
+        """Test that pushed and pulled posts are merged by (created_at, id)"""
+        pushed = [(self.at(0), 'p0'), (self.at(2), 'p2')]
+        pulled = [(self.at(1), 'c1'), (self.at(3), 'c3')]
+        merged = merge_timeline(pushed, pulled, 'next', 3)
+        self.assertEqual([blog_id for _, blog_id in merged], ['p0', 'c1', 'p2'])
+
+    def test_duplicates_are_dropped(self):
+        """Test that a post present in both sources is returned once"""
+        pushed = [(self.at(0), 'a'), (self.at(1), 'b')]
+        merged = merge_timeline(pushed, [(self.at(0), 'a')], 'next', 10)
+        self.assertEqual([blog_id for _, blog_id in merged], ['a', 'b'])
+
+    def test_prev_direction_is_oldest_first(self):
+        """Test that walking backwards merges in ascending order for paginate_rows"""
+        merged = merge_timeline([(self.at(0), 'a')], [(self.at(5), 'b')], 'prev', 10)
+        self.assertEqual([blog_id for _, blog_id in merged], ['b', 'a'])
+
+
+class RelatedModelTestCase(SimpleTestCase):
+
+    def test_tokenize_weights_title_and_drops_stop_words(self):
+        """Test that title words are repeated and stop words removed"""
+        self.assertEqual(tokenize('Django tips', 'the ORM and you'),
+                         ['django', 'tips'] * 3 + ['orm'])
+
+    def test_vectors_are_normalized(self):
+        """Test that TF-IDF rows have unit length (or are all zero)"""
+        terms, idf = build_vocabulary({'django': 2, 'numpy': 2, 'rare': 1}, 4, max_features=10)
+        self.assertEqual(terms, ['django', 'numpy'])
+        vocabulary = {term: column for column, term in enumerate(terms)}
+        matrix = vectorize([['django', 'django', 'numpy'], ['rare'], []], vocabulary, idf)
+        np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), [1.0, 0.0, 0.0], atol=1e-6)
+
+    def test_blocked_top_k_matches_brute_force(self):
+        """Test that block-wise top-k equals a full sort and never returns the row itself"""
+        rng = np.random.default_rng(7)
+        matrix = rng.random((50, 8), dtype=np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        rows = np.arange(0, 50, 7)
+        indices, scores = top_k_similar(matrix[rows], matrix, 4, query_rows=rows, block_size=6)
+
+        full = matrix[rows] @ matrix.T
+        full[np.arange(len(rows)), rows] = -np.inf
+        expected = np.argsort(-full, axis=1)[:, :4]
+        np.testing.assert_array_equal(indices, expected)
+        np.testing.assert_allclose(scores, np.take_along_axis(full, expected, axis=1), rtol=1e-5)
+
+
+class ClaimsAuthenticationTestCase(SimpleTestCase):
+    """SimpleTestCase refuses queries, so these also prove authentication is DB-free"""
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get('/api/feed/home/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        request.user = user
+        return request
+
+    def test_claims_round_trip(self):
+        """Test that the access token rebuilds the user's id, username, name and email"""
+        user_data = {'id': str(uuid.uuid4()), 'username': 'ann', 'name': None, 'email': 'ann@example.com'}
+        request = self.authenticate(tokens_for_user(user_data).access_token)
+        self.assertEqual(current_user(request), {**user_data, 'name': ''})
+
+    def test_token_without_claims_is_rejected(self):
+        """Test that tokens minted for auth_user ids (no profile claims) must be renewed"""
+        token = AccessToken()
+        token['user_id'] = 1
+        with self.assertRaises(InvalidToken):
+            self.authenticate(token)
+
+
+class CoLikeMatrixTestCase(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        # 40 readers, 12 blogs, sorted by reader as the job loads them
+        likes = sorted({(int(u), int(b)) for u, b in zip(rng.integers(0, 40, 200), rng.integers(0, 12, 200))})
+        self.users = np.array([u for u, _ in likes], dtype=np.int32)
+        self.blogs = np.array([b for _, b in likes], dtype=np.int32)
+        self.expected = Counter()
+        for user in set(self.users.tolist()):
+            liked = self.blogs[self.users == user].tolist()
+            self.expected.update((a, b) for a in liked for b in liked if a != b)
+
+    def test_partitioned_counts_match_brute_force(self):
+        """Test that counting in partitions and small pair batches gives exact co-like counts"""
+        counted = Counter()
+        for partition in range(3):
+            keys, counts = count_partition(self.users, self.blogs, 12, partition, 3, pair_budget=30)
+            self.assertTrue(np.all(keys // 12 % 3 == partition))
+            counted.update({(int(k // 12), int(k % 12)): int(c) for k, c in zip(keys, counts)})
+        self.assertEqual(counted, self.expected)
+
+    def test_top_n_keeps_best_partners(self):
+        """Test that each blog keeps its n best partners at or above the minimum count"""
+        keys, counts = count_partition(self.users, self.blogs, 12, 0, 1, pair_budget=10_000)
+        firsts, partners, co_likes = top_n(keys, counts, 12, 3, min_count=2)
+        for blog in range(12):
+            ranked = sorted(((-c, b) for (a, b), c in self.expected.items() if a == blog and c >= 2))[:3]
+            mine = firsts == blog
+            self.assertEqual(list(zip(-co_likes[mine], partners[mine])), ranked)
+
+    def test_cap_per_user_keeps_newest(self):
+        """Test that only each reader's first (newest) likes are kept"""
+        users = np.array([1, 1, 1, 2, 3, 3], dtype=np.int32)
+        items = np.array([9, 8, 7, 6, 5, 4], dtype=np.int32)
+        users, items = cap_per_user(users, items, 2)
+        self.assertEqual(users.tolist(), [1, 1, 2, 3, 3])
+        self.assertEqual(items.tolist(), [9, 8, 6, 5, 4])
+
+
+class ScriptedCursor:
+    """
+    Stands in for a cursor on the Postgres-only raw SQL: each execute()
+    answers with the next (columns, rows) result and is recorded.
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+        self.db = SimpleNamespace(vendor='sqlite')
+
+    def execute(self, sql, params=None):
+        self.executed.append((' '.join(sql.split()), params))
+        result = self.results.pop(0) if self.results else ((), [])
+        # A bare number is a write's rowcount
+        columns, self.rows = ((), []) if isinstance(result, int) else result
+        self.rowcount = result if isinstance(result, int) else len(self.rows)
+        self.description = [(column,) for column in columns]
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class EngagementCountersTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.user_id, self.blog_id = str(uuid.uuid4()), str(uuid.uuid4())
+
+    def test_like_returns_count_and_created(self):
+        """Test that a like reports the bumped counter and that a row was inserted"""
+        cursor = ScriptedCursor((('likes_count', 'created'), [(4, True)]))
+        self.assertEqual(like_blog(cursor, self.user_id, self.blog_id), (4, True))
+        sql, params = cursor.executed[0]
+        self.assertIn('ON CONFLICT (user_id, blog_id) DO NOTHING', sql)
+        self.assertEqual(params[1:], [self.user_id, self.blog_id, self.blog_id])
+
+    def test_repeat_like_and_missing_blog(self):
+        """Test that a repeated like keeps the count and a missing blog has none"""
+        cursor = ScriptedCursor((('likes_count', 'created'), [(4, False)]),
+                                (('likes_count', 'created'), [(None, False)]))
+        self.assertEqual(like_blog(cursor, self.user_id, self.blog_id), (4, False))
+        self.assertEqual(like_blog(cursor, self.user_id, self.blog_id), (None, False))
+
+    def test_unlike_returns_count_and_deleted(self):
+        """Test that an unlike reports the lowered counter and whether a like existed"""
+        liked_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        columns = ('likes_count', 'deleted', 'liked_at')
+        cursor = ScriptedCursor((columns, [(3, True, liked_at)]),
+                                (columns, [(3, False, None)]),
+                                (columns, [(None, False, None)]))
+        self.assertEqual(unlike_blog(cursor, self.user_id, self.blog_id), (3, True, liked_at))
+        self.assertEqual(unlike_blog(cursor, self.user_id, self.blog_id), (3, False, None))
+        self.assertEqual(unlike_blog(cursor, self.user_id, self.blog_id), (None, False, None))
+        self.assertIn('GREATEST(likes_count - 1, 0)', cursor.executed[0][0])
+
+    def test_reconcile_locks_before_recounting(self):
+        """Test that a batch is locked, recounted from likes/comments, and drifted ids returned"""
+        blog_ids = [self.blog_id, str(uuid.uuid4())]
+        cursor = ScriptedCursor((('id',), [(self.blog_id,)]), (('id',), [(self.blog_id,)]))
+        self.assertEqual(reconcile_batch(cursor, blog_ids), [self.blog_id])
+        (lock_sql, lock_params), (recount_sql, recount_params) = cursor.executed
+        self.assertTrue(lock_sql.endswith('FOR UPDATE'))
+        self.assertIn('FROM public.likes l', recount_sql)
+        self.assertIn('b.likes_count <> c.likes_count OR b.comments_count <> c.comments_count', recount_sql)
+        self.assertEqual(lock_params, recount_params)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'the counter statements are PostgreSQL-only')
+class PostgresCountersTestCase(SimpleTestCase):
+    """
+    The counter statements against a real database. Rows are committed
+    (no TestCase transaction) so a second connection can see and lock them;
+    deleting the user cascades to everything the tests created.
+    """
+
+    databases = {'default'}
+
+    def setUp(self):
+        self.author = get_user_model().objects.create_user(
+            username=f'author-{uuid.uuid4().hex[:8]}', email=f'{uuid.uuid4().hex}@example.com', password='x')
+        self.reader = get_user_model().objects.create_user(
+            username=f'reader-{uuid.uuid4().hex[:8]}', email=f'{uuid.uuid4().hex}@example.com', password='x')
+        self.reader_id = str(self.reader.id)
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO public.blogs (title, content, author_id) VALUES ('Counted', 'Body', %s)
+                RETURNING CAST(id AS text)
+            """, [str(self.author.id)])
+            self.blog_id = cursor.fetchone()[0]
+
+    def tearDown(self):
+        self.author.delete()
+        self.reader.delete()
+
+    def counts(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT b.likes_count, b.comments_count, (SELECT COUNT(*) FROM public.likes l WHERE l.blog_id = b.id)
+                FROM public.blogs b WHERE b.id = %s
+            """, [self.blog_id])
+            return cursor.fetchone()
+
+    def test_double_like_is_not_created(self):
+        """Test that a second like by the same reader inserts nothing and keeps the count"""
+        with connection.cursor() as cursor:
+            self.assertEqual(like_blog(cursor, self.reader_id, self.blog_id), (1, True))
+            self.assertEqual(like_blog(cursor, self.reader_id, self.blog_id), (1, False))
+        self.assertEqual(self.counts(), (1, 0, 1))
+
+    def test_unlike_without_a_like_deletes_nothing(self):
+        """Test that unliking a blog the reader never liked deletes no row and keeps the count"""
+        with connection.cursor() as cursor:
+            like_blog(cursor, str(self.author.id), self.blog_id)
+            self.assertEqual(unlike_blog(cursor, self.reader_id, self.blog_id), (1, False, None))
+        self.assertEqual(self.counts(), (1, 0, 1))
+
+    def test_counters_never_go_below_zero(self):
+        """Test that a counter that drifted to 0 stays at 0 on unlike and comment removal"""
+        with connection.cursor() as cursor:
+            like_blog(cursor, self.reader_id, self.blog_id)
+            cursor.execute("UPDATE public.blogs SET likes_count = 0 WHERE id = %s", [self.blog_id])
+            likes_count, deleted, _ = unlike_blog(cursor, self.reader_id, self.blog_id)
+            self.assertEqual((likes_count, deleted), (0, True))
+            self.assertEqual(adjust_comments_count(cursor, self.blog_id, -1), 0)
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    def concurrent_like(self):
+        """Like from another connection; True if it had to give up waiting for a row lock"""
+        blocked = []
+
+        def like():
+            # Django connections are per thread, so this one is separate
+            try:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL lock_timeout = '200ms'")
+                    like_blog(cursor, self.reader_id, self.blog_id)
+            except OperationalError:
+                blocked.append(True)
+            finally:
+                connection.close()
+
+        writer = threading.Thread(target=like)
+        writer.start()
+        writer.join()
+        return bool(blocked)
+
+    def test_reconcile_locks_rows_until_commit(self):
+        """Test that a batch locks its blogs, drifted or not, and fixes drift before the next like lands"""
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Nothing to fix, but the row is still locked for the recount
+            self.assertEqual(reconcile_batch(cursor, [self.blog_id]), [])
+            self.assertTrue(self.concurrent_like())
+
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE public.blogs SET likes_count = 5 WHERE id = %s", [self.blog_id])
+        with transaction.atomic(), connection.cursor() as cursor:
+            self.assertEqual(reconcile_batch(cursor, [self.blog_id]), [self.blog_id])
+            self.assertTrue(self.concurrent_like())
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+        # Once committed, the like applies its +1 on top of the fixed value
+        self.assertFalse(self.concurrent_like())
+        self.assertEqual(self.counts(), (1, 0, 1))
+
+
+class AuthorStatsTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.user_id, self.blog_id = str(uuid.uuid4()), str(uuid.uuid4())
+
+    def test_like_and_unlike_move_likes_received(self):
+        """Test that the like/unlike statements move the author's total only when a like changed"""
+        like_sql = ' '.join(LIKE_BLOG.sql.split())
+        self.assertIn('INSERT INTO public.author_stats (user_id, likes_received) '
+                      'SELECT author_id, 1 FROM upd', like_sql)
+        self.assertIn('SET likes_received = author_stats.likes_received + 1', like_sql)
+        # upd only has a row when ins did, so a repeated like adds nothing
+        self.assertIn('WHERE id IN (SELECT blog_id FROM ins)', like_sql)
+
+        unlike_sql = ' '.join(UNLIKE_BLOG.sql.split())
+        self.assertIn('SET likes_received = GREATEST(likes_received - 1, 0) '
+                      'WHERE user_id IN (SELECT author_id FROM upd)', unlike_sql)
+        self.assertIn('WHERE id IN (SELECT blog_id FROM del)', unlike_sql)
+
+    def test_adjust_never_goes_negative(self):
+        """Test that post/like/view deltas are upserted and clamped at zero"""
+        cursor = ScriptedCursor(1)
+        adjust_author_stats(cursor, self.user_id, posts=-1, likes=-4, views=-10)
+        sql, params = cursor.executed[0]
+        self.assertIn('ON CONFLICT (user_id) DO UPDATE', sql)
+        self.assertIn('posts_count = GREATEST(author_stats.posts_count + %s, 0)', sql)
+        self.assertEqual(params, [self.user_id, -1, -4, -10, -1, -4, -10])
+
+    def test_profile_leaves_timestamps_to_the_renderer(self):
+        """Test that the profile keeps the driver's created_at and renders it as isoformat()"""
+        created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        cursor = ScriptedCursor((
+            ('id', 'username', 'name', 'created_at', 'posts_count', 'likes_received', 'total_views',
+             'followers_count'),
+            [(self.user_id, 'ann', 'Ann', created_at, 2, 5, 40, 1)],
+        ))
+        profile = fetch_author_profile(cursor, 'ann')
+        self.assertIs(profile['created_at'], created_at)
+        self.assertEqual(json.loads(FastJSONRenderer().render(profile))['created_at'], created_at.isoformat())
+
+    def test_reconcile_recomputes_from_blogs(self):
+        """Test that a batch locks existing rows, recomputes from the blogs and returns drifted ids"""
+        user_ids = [self.user_id, str(uuid.uuid4())]
+        cursor = ScriptedCursor((('user_id',), []), (('user_id',), [(self.user_id,)]))
+        self.assertEqual(reconcile_author_batch(cursor, user_ids), [self.user_id])
+        (lock_sql, lock_params), (recount_sql, recount_params) = cursor.executed
+        self.assertTrue(lock_sql.endswith('FOR UPDATE'))
+        self.assertIn('COUNT(b.id) FILTER (WHERE b.is_published), COALESCE(SUM(b.likes_count), 0), '
+                      'COALESCE(SUM(b.view_count), 0)', recount_sql)
+        # Only rows whose totals differ are rewritten (and reported)
+        self.assertIn('IS DISTINCT FROM (EXCLUDED.posts_count, EXCLUDED.likes_received, EXCLUDED.total_views)',
+                      recount_sql)
+        self.assertEqual(lock_params, recount_params)
+
+
+class TrendingTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.blog_id = str(uuid.uuid4())
+
+    def test_decay_halves_per_half_life(self):
+        """Test that an event loses half its weight per half-life and ancient ones bottom out"""
+        self.assertEqual(decay_factor(0), 1.0)
+        self.assertAlmostEqual(decay_factor(-trending.HALF_LIFE_SECONDS), 0.5)
+        self.assertAlmostEqual(decay_factor(-3 * trending.HALF_LIFE_SECONDS), 0.125)
+        self.assertEqual(decay_factor(-10 ** 9), 2.0 ** trending.MIN_HALF_LIVES)
+        # Anchored to the epoch: later events are worth more, so nothing decays on write
+        self.assertGreater(decay_factor(3600), decay_factor(0))
+
+    def test_epoch_rescale_keeps_current_scores(self):
+        """Test that moving the epoch multiplies every score by one factor and prunes cold blogs"""
+        cursor = ScriptedCursor((('age',), [(Decimal(-trending.HALF_LIFE_SECONDS),)]), 1, 4, 1)
+        self.assertEqual(decay_trending(cursor), (4, 1))
+        (_, _), (prune_sql, prune_params), (rescale_sql, rescale_params), (epoch_sql, _) = cursor.executed
+        self.assertTrue(prune_sql.startswith('DELETE FROM public.blog_trending'))
+        self.assertEqual(prune_params, [0.5, trending.PRUNE_BELOW])
+        self.assertEqual(rescale_params, [0.5])
+        self.assertEqual(epoch_sql, 'UPDATE public.blog_trending_epoch SET epoch = now()')
+
+    def test_fetch_keeps_score_order(self):
+        """Test that the ranking is read best first and scores come back in current units"""
+        columns = selected_columns(parse_fields('id,title'))
+        rows = [('b1', 'One', None, None, 0, 0, 9.87654), ('b2', 'Two', None, None, 0, 0, 1.5)]
+        cursor = ScriptedCursor(((*columns, 'trending_score'), rows))
+        blogs = fetch_trending(cursor, columns, 2)
+        self.assertEqual([(blog['id'], blog['trending_score']) for blog in blogs], [('b1', 9.8765), ('b2', 1.5)])
+        sql, params = cursor.executed[0]
+        self.assertIn('ORDER BY t.score DESC, t.blog_id DESC LIMIT %(limit)s', sql)
+        self.assertIn('WHERE b.is_published = true', sql)
+        self.assertEqual(params['limit'], 2)
+
+    def test_trending_endpoint(self):
+        """Test that the endpoint projects the requested fields and keeps each score"""
+        def fetch(cursor, columns, limit):
+            self.assertEqual(limit, 2)
+            return [{'id': 'b1', 'title': 'One', 'likes_count': 3, 'trending_score': 9.9}]
+
+        request = APIRequestFactory().get('/api/blogs/trending/', {'fields': 'id,title', 'page_size': 2})
+        with mock.patch.object(urls, 'fetch_trending', fetch):
+            response = urls.trending_blogs_view(request)
+        self.assertEqual(response.data, {
+            'count': 1, 'page_size': 2, 'results': [{'id': 'b1', 'title': 'One', 'trending_score': 9.9}],
+        })
+
+    def toggle_like(self, method, unliked):
+        bumps = []
+        request = getattr(APIRequestFactory(), method)(f'/api/blogs/{self.blog_id}/like/')
+        force_authenticate(request, user=SimpleNamespace(
+            is_authenticated=True, id=uuid.uuid4(), username='ann', name='Ann', email='ann@example.com'))
+        with mock.patch.object(urls, 'like_blog', lambda cursor, user_id, blog_id: (1, True)), \
+                mock.patch.object(urls, 'unlike_blog', lambda cursor, user_id, blog_id: unliked), \
+                mock.patch.object(urls, 'bump_trending', lambda cursor, *args: bumps.append(('+', *args))), \
+                mock.patch.object(urls, 'unbump_trending', lambda cursor, *args: bumps.append(('-', *args))):
+            self.assertEqual(urls.toggle_like_view(request, self.blog_id).status_code, 200)
+        return bumps
+
+    def test_unlike_takes_back_the_like(self):
+        """Test that like/unlike cycles cannot farm score: an unlike removes the like's own weight"""
+        liked_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(self.toggle_like('post', None), [('+', self.blog_id, trending.LIKE_WEIGHT)])
+        self.assertEqual(self.toggle_like('delete', (0, True, liked_at)),
+                         [('-', self.blog_id, trending.LIKE_WEIGHT, liked_at)])
+        # Unliking a blog the user had not liked changes nothing
+        self.assertEqual(self.toggle_like('delete', (0, False, None)), [])
+
+    def test_toggle_and_score_commit_together(self):
+        """Test that like/unlike and the trending update run inside the view's own atomic block"""
+        outer, depths = len(connection.atomic_blocks), []
+        request = APIRequestFactory().post(f'/api/blogs/{self.blog_id}/like/')
+        force_authenticate(request, user=SimpleNamespace(
+            is_authenticated=True, id=uuid.uuid4(), username='ann', name='Ann', email='ann@example.com'))
+
+        def record(result):
+            def run(cursor, *args):
+                depths.append(len(connection.atomic_blocks))
+                return result
+            return run
+
+        with mock.patch.object(urls, 'like_blog', record((1, True))), \
+                mock.patch.object(urls, 'bump_trending', record(None)), \
+                mock.patch.object(urls, 'invalidate_counters', record(None)):
+            self.assertEqual(urls.toggle_like_view(request, self.blog_id).status_code, 200)
+        # Counters are invalidated only once the like is committed
+        self.assertEqual(depths, [outer + 1, outer + 1, outer])
+
+    def test_unbump_is_scaled_to_the_event_time(self):
+        """Test that an unlike subtracts the like's weight at its own time, never below zero"""
+        liked_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        cursor = ScriptedCursor(1)
+        unbump_trending(cursor, self.blog_id, trending.LIKE_WEIGHT, liked_at)
+        sql, params = cursor.executed[0]
+        self.assertIn('GREATEST(t.score - %s * power(2, extract(epoch FROM %s - m.epoch) / %s), 0)', sql)
+        self.assertEqual(params, [trending.LIKE_WEIGHT, liked_at, trending.HALF_LIFE_SECONDS, self.blog_id])
+
+
+class ReconcileCountersCommandTestCase(TestCase):
+
+    def test_blogs_then_authors_in_batches(self):
+        """Test that every batch is recounted, authors after blogs, and the totals reported"""
+        from .management.commands import reconcile_counters
+
+        calls = []
+        batches = {BLOG_IDS_AFTER: [['b1', 'b2'], ['b3']], USER_IDS_AFTER: [['u1']]}
+
+        def reconcile(kind):
+            def run(cursor, ids):
+                calls.append((kind, ids))
+                return ids[:1]
+            return run
+
+        out = StringIO()
+        with mock.patch.object(reconcile_counters.Command, 'iter_ids',
+                               lambda self, query, batch_size: iter(batches[query])), \
+                mock.patch.object(reconcile_counters, 'reconcile_batch', reconcile('blogs')), \
+                mock.patch.object(reconcile_counters, 'reconcile_author_batch', reconcile('authors')):
+            call_command('reconcile_counters', batch_size=2, stdout=out)
+        self.assertEqual(calls, [('blogs', ['b1', 'b2']), ('blogs', ['b3']), ('authors', ['u1'])])
+        self.assertIn('2 of 3 blogs, 1 of 1 authors corrected', out.getvalue())
+
+
+class FakeConnection:
+    closed = 0
+    autocommit = True
+
+    class info:
+        transaction_status = 0    # idle
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+
+    def pool(self, **overrides):
+        options = {'size': 1, 'max_overflow': 1, 'timeout': 0.05, 'max_lifetime': 60, 'check_idle': 60}
+        return ConnectionPool(**{**options, **overrides})
+
+    def test_reuse_and_overflow(self):
+        """Test that returned connections are reused and overflow ones are closed"""
+        pool = self.pool()
+        first = pool.checkout(FakeConnection)
+        second = pool.checkout(FakeConnection)
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(FakeConnection)
+        pool.checkin(first)
+        pool.checkin(second)
+        self.assertTrue(second.closed)
+        self.assertIs(pool.checkout(FakeConnection), first)
+        stats = pool.stats()
+        self.assertEqual((stats['created_total'], stats['reused_total'], stats['timeouts_total']), (2, 1, 1))
+
+    def test_expired_and_discarded_connections_are_replaced(self):
+        """Test that connections past their lifetime or flagged unusable are not handed out again"""
+        pool = self.pool(max_lifetime=0)
+        old = pool.checkout(FakeConnection)
+        pool.checkin(old)
+        self.assertTrue(old.closed)
+        pool = self.pool()
+        broken = pool.checkout(FakeConnection)
+        pool.checkin(broken, discard=True)
+        self.assertIsNot(pool.checkout(FakeConnection), broken)
+
+
+class PasswordHashPoolTestCase(SimpleTestCase):
+
+    def test_full_pool_fails_fast(self):
+        """Test that a hash beyond workers + queue is refused instead of waiting"""
+        pool = PasswordHashPool(workers=1, max_queue=0, timeout=5)
+        release = threading.Event()
+        blocker = threading.Thread(target=pool.run, args=(release.wait,))
+        blocker.start()
+        try:
+            while pool.stats()['in_flight'] == 0:
+                time.sleep(0.01)
+            with self.assertRaises(HashingBusy):
+                pool.hash('pass123456')
+        finally:
+            release.set()
+            blocker.join()
+        self.assertEqual(pool.stats()['rejected_total'], 1)
+        self.assertTrue(pool.verify('pass123456', make_password('pass123456'))[0])
+
+    def test_full_pool_answers_503(self):
+        """Test that login and signup beyond workers + queue get a 503 with Retry-After"""
+        pool = PasswordHashPool(workers=1, max_queue=1, timeout=5)
+        release = threading.Event()
+        blockers = [threading.Thread(target=pool.run, args=(release.wait,)) for _ in range(2)]
+        for blocker in blockers:
+            blocker.start()
+        factory = APIRequestFactory()
+        user = SimpleNamespace(id=uuid.uuid4(), password=make_password('pass123456'))
+        try:
+            while pool.stats()['in_flight'] < 2:
+                time.sleep(0.01)
+            with mock.patch.object(urls, 'password_pool', pool), \
+                    mock.patch.object(urls, 'fetch_one', lambda cursor, query, params: user), \
+                    mock.patch.object(urls, 'connection', SimpleNamespace(cursor=contextlib.nullcontext)):
+                responses = [
+                    urls.signup_view(factory.post('/api/auth/signup/', {
+                        'username': 'ann', 'email': 'ann@example.com', 'password': 'pass123456',
+                    }, format='json')),
+                    urls.login_view(factory.post('/api/auth/login/', {
+                        'email': 'ann@example.com', 'password': 'pass123456',
+                    }, format='json')),
+                ]
+        finally:
+            release.set()
+            for blocker in blockers:
+                blocker.join()
+        for response in responses:
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(pool.stats()['rejected_total'], 2)
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+        'django.contrib.auth.hashers.UnsaltedMD5PasswordHasher',
+    ])
+    def test_outdated_hash_is_upgraded(self):
+        """Test that a correct password stored with an older hasher comes back re-hashed"""
+        pool = PasswordHashPool(workers=1, max_queue=0, timeout=5)
+        old = make_password('pass123456', hasher='unsalted_md5')
+        self.assertEqual(pool.verify('wrong-password', old), (False, None))
+        matches, upgraded = pool.verify('pass123456', old)
+        self.assertTrue(matches)
+        self.assertTrue(upgraded.startswith('md5$'))
+        self.assertEqual(pool.verify('pass123456', upgraded), (True, None))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SignupConflictTestCase(TestCase):
+
+    def setUp(self):
+        get_user_model().objects.create_user(username='ann', email='ann@example.com', password='pass123456')
+
+    def signup(self, username, email):
+        request = APIRequestFactory().post('/api/auth/signup/', {
+            'username': username, 'email': email, 'password': 'pass123456',
+        }, format='json')
+        return urls.signup_view(request)
+
+    def test_taken_email_and_username(self):
+        """Test that a duplicate email or username is reported as such"""
+        for username, email, error in [
+            ('ann2', 'ann@example.com', 'Email already exists'),
+            ('ann', 'ann2@example.com', 'Username already exists'),
+        ]:
+            response = self.signup(username, email)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data, {'error': error})
+        self.assertEqual(self.signup('bob', 'bob@example.com').status_code, 201)
+
+    def test_constraint_name_decides(self):
+        """Test that the reported constraint is trusted over the error text"""
+        error = IntegrityError('duplicate key value violates unique constraint (email)')
+        error.__cause__ = Exception()
+        error.__cause__.diag = SimpleNamespace(constraint_name='users_username_key')
+        user = SimpleNamespace(email='ann@example.com')
+        self.assertEqual(urls.signup_conflict(error, user), 'Username already exists')
+
+
+class AsyncReadViewsTestCase(SimpleTestCase):
+
+    def test_placeholders_are_numbered(self):
+        """Test that %s placeholders become asyncpg's $1, $2 in order"""
+        self.assertEqual(numbered('WHERE (a, b) < (%s, %s::uuid) LIMIT %s'),
+                         'WHERE (a, b) < ($1, $2::uuid) LIMIT $3')
+
+    def test_wishlist_requires_authentication(self):
+        """Test that the async wishlist answers like DRF's IsAuthenticated, without a query"""
+        request = APIRequestFactory().get('/api/user/wishlist/')
+        response = async_to_sync(async_wishlist_view)(request)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+
+        request = APIRequestFactory().get('/api/user/wishlist/', HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(async_to_sync(async_wishlist_view)(request).status_code, 401)
+
+
+class QueryRegistryTestCase(SimpleTestCase):
+
+    class FakeConnection:
+        pass
+
+    class FakeCursor:
+        description = [('id',), ('likes_count',), ('author.name',)]
+
+        def __init__(self, connection, vendor='postgresql'):
+            self.db = SimpleNamespace(vendor=vendor, connection=connection, in_atomic_block=False)
+            self.executed = []
+
+        def execute(self, sql, params=None):
+            self.executed.append(sql)
+
+        def fetchone(self):
+            return ('b1', 3, 'Ann')
+
+    def test_rows_are_typed_from_description(self):
+        """Test that rows come back with attribute access and invalid names renamed"""
+        cursor = self.FakeCursor(self.FakeConnection(), vendor='sqlite')
+        row = fetch_one(cursor, FEED_PAGE, ['p'], select='x', join='', keyset='', order='y')
+        self.assertEqual((row.id, row.likes_count, row._2), ('b1', 3, 'Ann'))
+        self.assertTrue(cursor.executed[0].startswith('SELECT x'))
+
+    def test_names_are_unique(self):
+        """Test that a query name cannot be registered twice"""
+        with self.assertRaises(ValueError):
+            register(FEED_PAGE.name, 'SELECT 1')
+
+    def test_statements_are_prepared_once_per_connection(self):
+        """Test that PREPARE runs on first use only, and again on a replacement connection"""
+        connection = self.FakeConnection()
+        for _ in range(3):
+            cursor = self.FakeCursor(connection)
+            fetch_one(cursor, BLOG_DETAIL, ['b1'])
+        self.assertEqual(len(cursor.executed), 1)
+        self.assertTrue(cursor.executed[0].startswith('EXECUTE blog_detail_'))
+
+        cursor = self.FakeCursor(self.FakeConnection())
+        fetch_one(cursor, BLOG_DETAIL, ['b1'])
+        self.assertTrue(cursor.executed[0].startswith('PREPARE blog_detail_'))
+        self.assertIn('WHERE b.id = $1', cursor.executed[0])
+        self.assertTrue(cursor.executed[1].endswith(' (%s)'))
+
+    def test_deallocated_statement_is_prepared_again(self):
+        """Test that EXECUTE of a statement the server forgot re-prepares it"""
+        connection = self.FakeConnection()
+        fetch_one(self.FakeCursor(connection), BLOG_DETAIL, ['b1'])
+
+        class Forgotten(Exception):
+            pgcode = '26000'
+
+        cursor = self.FakeCursor(connection)
+        calls = []
+
+        def execute(sql, params=None):
+            calls.append(sql)
+            if len(calls) == 1:
+                raise OperationalError('prepared statement does not exist') from Forgotten()
+
+        cursor.execute = execute
+        fetch_one(cursor, BLOG_DETAIL, ['b1'])
+        self.assertEqual([sql.split()[0] for sql in calls], ['EXECUTE', 'PREPARE', 'EXECUTE'])
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+
+    def test_output_matches_drf(self):
+        """Test that orjson output decodes to what DRF's JSONRenderer produces"""
+        data = {
+            'id': uuid.uuid4(),
+            'created_at': datetime(2025, 1, 1, 12, 30, 0, 123456, tzinfo=timezone.utc),
+            'price': Decimal('1.50'),
+            'label': gettext_lazy('Blog'),
+            'text': 'line\u2028break',
+            'counts': {1: 2},
+        }
+        fast = FastJSONRenderer().render(data)
+        expected = json.loads(JSONRenderer().render(data))
+        # Timestamps keep the isoformat() the raw-SQL endpoints always sent, not DRF's 'Z'
+        expected['created_at'] = data['created_at'].isoformat()
+        self.assertEqual(json.loads(fast), expected)
+        self.assertNotIn('\u2028'.encode(), fast)
+
+    def test_row_to_dict_keeps_text_ids(self):
+        """Test that ids selected as text pass through and UUIDs still become strings"""
+        columns = ['id', 'author.id']
+        blog_id = uuid.uuid4()
+        self.assertEqual(row_to_dict(columns, [str(blog_id), blog_id]),
+                         {'id': str(blog_id), 'author': {'id': str(blog_id)}})
+
+
+class ServerTimingTestCase(TestCase):
+
+    def setUp(self):
+        route_stats.reset()
+
+    def view(self, request):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.execute('SELECT 2')
+        return FastJSONResponse({'ok': True})
+
+    def test_queries_and_render_are_timed(self):
+        """Test that the header counts the request's queries and the route totals are kept"""
+        request = APIRequestFactory().get('/api/blogs/')
+        request.resolver_match = SimpleNamespace(route='api/blogs/')
+        response = ServerTimingMiddleware(self.view)(request)
+        header = response['Server-Timing']
+        self.assertRegex(header, r'^db;dur=[0-9.]+;desc="2 queries", app;dur=[0-9.]+, render;dur=[0-9.]+$')
+        self.assertEqual(route_stats.summary()['GET api/blogs/']['queries_avg'], 2)
+
+    def test_async_requests_are_timed(self):
+        """Test that sync code called from an async view counts toward the same request"""
+        async def view(request):
+            return await run_sync(self.view, request)
+
+        response = async_to_sync(ServerTimingMiddleware(view))(APIRequestFactory().get('/nowhere/'))
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+        self.assertEqual(route_stats.summary()['GET <unresolved>']['requests'], 1)
+
+
+class BulkBlogsTestCase(TestCase):
+
+    def setUp(self):
+        self.ids = [str(uuid.uuid4()) for _ in range(4)]
+        self.factory = APIRequestFactory()
+
+    def get_by_ids(self, ids, found=()):
+        def fetch(cursor, blog_ids, columns):
+            return {blog_id: {'id': blog_id, 'title': f'Blog {blog_id[:4]}'} for blog_id in blog_ids
+                    if blog_id in found}
+
+        request = self.factory.get('/api/blogs/', {'ids': ','.join(ids), 'fields': 'id,title'})
+        with mock.patch.object(urls, 'fetch_blogs_by_ids', fetch):
+            return urls.blogs_view(request)
+
+    def post_status(self, ids, found=()):
+        Row = namedtuple('Row', 'id likes_count comments_count')
+
+        def fetch(cursor, query, params):
+            return [Row(blog_id, 1, 0) for blog_id in params[0] if blog_id in found]
+
+        request = self.factory.post('/api/blogs/status/', {'ids': ids}, format='json')
+        with mock.patch.object(urls, 'fetch_all', fetch):
+            return urls.blogs_status_view(request)
+
+    def test_results_follow_request_order(self):
+        """Test that hydrated blogs come back in the order asked for and missing ids are listed"""
+        wanted = [self.ids[2], self.ids[0], self.ids[3], self.ids[1]]
+        response = self.get_by_ids(wanted, found=self.ids[:3])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([blog['id'] for blog in response.data['results']],
+                         [self.ids[2], self.ids[0], self.ids[1]])
+        self.assertEqual(response.data['missing'], [self.ids[3]])
+        self.assertEqual(response.data['count'], 3)
+
+    def test_invalid_and_too_many_ids_are_rejected(self):
+        """Test that a malformed id or more than the cap is a 400 before any query"""
+        response = self.get_by_ids([self.ids[0], 'not-a-uuid'])
+        self.assertEqual((response.status_code, response.data['error']), (400, 'Invalid blog id: not-a-uuid'))
+        too_many = [str(uuid.uuid4()) for _ in range(urls.MAX_BULK_IDS + 1)]
+        self.assertEqual(self.get_by_ids(too_many).status_code, 400)
+        self.assertEqual(self.get_by_ids(too_many[:urls.MAX_BULK_IDS]).status_code, 200)
+
+    def test_status_leaves_out_missing_blogs(self):
+        """Test that batch status answers for published blogs only, with viewer flags"""
+        response = self.post_status([self.ids[0], self.ids[1], self.ids[0]], found=[self.ids[1]])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], {self.ids[1]: {
+            'likes_count': 1, 'comments_count': 0, 'user_liked': False, 'user_wishlisted': False,
+        }})
+
+    def test_status_validates_ids(self):
+        """Test that batch status rejects non-lists, malformed ids and more than its cap"""
+        self.assertEqual(self.post_status('abc').status_code, 400)
+        self.assertEqual(self.post_status([self.ids[0], 'x']).status_code, 400)
+        too_many = [str(uuid.uuid4()) for _ in range(urls.MAX_STATUS_IDS + 1)]
+        self.assertEqual(self.post_status(too_many).status_code, 400)
+
+
+class HealthDiagnosticsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_health_reports_database(self):
+        """Test that health answers 200 when the database responds and 503 when it does not"""
+        response = health_view(APIRequestFactory().get('/api/health/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['status'], response.data['database']), ('ok', connection.vendor))
+
+        def unreachable():
+            raise OperationalError('connection refused')
+
+        with mock.patch.object(health, 'connection', SimpleNamespace(cursor=unreachable)), \
+                self.assertLogs('blog_api.health', 'ERROR') as logs:
+            response = health_view(APIRequestFactory().get('/api/health/'))
+        self.assertEqual(response.status_code, 503)
+        # The driver's message goes to the log, not to the client
+        self.assertEqual(response.data, {'status': 'unhealthy', 'database': 'unreachable'})
+        self.assertIn('connection refused', logs.output[0])
+
+    def test_refresh_is_gated(self):
+        """Test that ?refresh=1 is refused unless DIAGNOSTICS_ALLOW_REFRESH is on"""
+        request = lambda: APIRequestFactory().get('/api/diagnostics/', {'refresh': '1'})
+        with mock.patch.object(health, '_load_table_stats', wraps=health._load_table_stats) as load:
+            self.assertEqual(diagnostics_view(request()).status_code, 403)
+            self.assertEqual(load.call_count, 0)
+            with mock.patch.object(health, 'DIAGNOSTICS_ALLOW_REFRESH', True):
+                self.assertEqual(diagnostics_view(request()).status_code, 200)
+                self.assertEqual(diagnostics_view(request()).status_code, 200)
+            self.assertEqual(load.call_count, 2)
+
+    def test_diagnostics_include_pool_stats(self):
+        """Test that diagnostics return the table stats and each process pool's counters"""
+        with mock.patch.dict(db_pool._pools, clear=True):
+            get_pool('default', {'dbname': 'blogtest', 'host': 'db'})
+            response = diagnostics_view(APIRequestFactory().get('/api/diagnostics/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('users', response.data['tables_found'])
+        expected_source = 'pg_class.reltuples' if connection.vendor == 'postgresql' else 'count(*)'
+        self.assertEqual(response.data['source'], expected_source)
+        for key in ('view_counts', 'password_hashing', 'request_timing'):
+            self.assertIn(key, response.data)
+        self.assertEqual(list(response.data['db_pool']), ['default:blogtest'])
+        self.assertEqual(set(response.data['db_pool']['default:blogtest']), {
+            'size', 'max_overflow', 'checked_out', 'idle', 'open', 'created_total', 'reused_total',
+            'closed_total', 'expired_total', 'health_check_failures_total', 'waits_total', 'timeouts_total',
+        })
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 fallback for local SQLite databases')
+class SqliteSearchTestCase(TestCase):
+    """Search against the FTS5 fallback used for local SQLite databases"""
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE blogs (
+                    id TEXT PRIMARY KEY, title TEXT, content TEXT, excerpt TEXT, image TEXT,
+                    author_id TEXT, created_at TEXT, updated_at TEXT, view_count INTEGER,
+                    is_published BOOLEAN, likes_count INTEGER DEFAULT 0, comments_count INTEGER DEFAULT 0
+                )
+            """)
+            # users comes from the users app's migration
+            cursor.execute(
+                "INSERT INTO users (id, username, name, email, password, is_superuser, first_name, last_name,"
+                " is_staff, is_active, date_joined, created_at)"
+                " VALUES ('u1', 'ann', 'Ann', 'ann@example.com', '', 0, '', '', 0, 1, '2025-01-01', '2025-01-01')")
+            self.insert(cursor, 'b1', 'Tuning Postgres indexes', 'Notes on GIN and btree indexes.')
+            ensure_sqlite_fts(cursor)  # backfills b1
+            self.insert(cursor, 'b2', 'Gardening notes', 'Planting tomatoes next to an index card.')
+            self.insert(cursor, 'b3', 'Draft about indexes', 'Unpublished.', published=False)
+
+    def insert(self, cursor, blog_id, title, content, published=True):
+        cursor.execute(
+            "INSERT INTO blogs (id, title, content, author_id, created_at, updated_at, is_published)"
+            " VALUES (%s, %s, %s, 'u1', '2025-01-01', '2025-01-01', %s)",
+            [blog_id, title, content, published])
+
+    def search(self, query):
+        fields = parse_fields('id,title,author.name')
+        with connection.cursor() as cursor:
+            return search_blogs(cursor, query, selected_columns(fields), 10, 0)
+
+    def test_title_matches_rank_first(self):
+        """Test that title hits outrank body hits and drafts are excluded"""
+        results = self.search('index')
+        self.assertEqual([blog['id'] for blog in results], ['b1', 'b2'])
+        self.assertGreater(results[0]['rank'], results[1]['rank'])
+        self.assertEqual(results[0]['author'], {'name': 'Ann'})
+
+    def test_highlight_and_write_sync(self):
+        """Test that snippets are highlighted and updates reach the index"""
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE blogs SET title = 'Tomato harvest' WHERE id = 'b2'")
+        [blog] = self.search('harvest')
+        self.assertEqual(blog['highlight']['title'], 'Tomato <mark>harvest</mark>')
+
+    def test_query_syntax_is_not_interpreted(self):
+        """Test that FTS5 operators in user input are treated as plain words"""
+        self.assertEqual(self.search('"NEAR(( -'), [])
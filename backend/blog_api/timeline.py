@@ -0,0 +1,109 @@
+from django.conf import settings
+
+from .pagination import keyset_clause
+from .queries import (
+    BACKFILL_TIMELINE, DROP_TIMELINE_AUTHOR, FAN_OUT_POST, FOLLOW_AUTHOR, TIMELINE_PULLED,
+    TIMELINE_PUSHED, TRIM_TIMELINES, UNFOLLOW_AUTHOR, execute, fetch_all, fetch_one,
+)
+
+# ========================================
+# 🏠 FOLLOWS & HOME TIMELINE
+# ========================================
+#
+# Hybrid fan-out:
+#   * fan-out-on-write - a new post is copied into public.timeline_entries
+#     for every follower, so reading a home page is one index range scan;
+#   * fan-out-on-read - authors with more than TIMELINE_FANOUT_MAX_FOLLOWERS
+#     followers are skipped at write time, and their recent posts are read
+#     with one bounded index scan per such author when the page is built.
+# Both sources share the (created_at, id) keyset, so they are merged per
+# page with the feed's cursors. public.follower_counts is maintained with
+# every follow/unfollow so the cut-off never needs a COUNT(*).
+#
+# `python manage.py trim_timelines` keeps each timeline at most
+# TIMELINE_MAX_LENGTH entries (plus whatever arrived since the last run).
+
+FANOUT_MAX_FOLLOWERS = getattr(settings, 'TIMELINE_FANOUT_MAX_FOLLOWERS', 5000)
+TIMELINE_MAX_LENGTH = getattr(settings, 'TIMELINE_MAX_LENGTH', 500)
+FOLLOW_BACKFILL = getattr(settings, 'TIMELINE_FOLLOW_BACKFILL', 20)
+
+
+def follow_author(cursor, follower_id, followee_id):
+    """
+    Follow and bump the followee's follower count in one roundtrip.
+
+    Returns (followers_count, created).
+    """
+    row = fetch_one(cursor, FOLLOW_AUTHOR, [follower_id, followee_id, followee_id])
+    followers_count, created = row.followers_count, row.created
+
+    if created and followers_count <= FANOUT_MAX_FOLLOWERS:
+        # Posts from before the follow only reach the timeline through this backfill
+        execute(cursor, BACKFILL_TIMELINE, [follower_id, followee_id, FOLLOW_BACKFILL])
+    return followers_count, created
+
+
+def unfollow_author(cursor, follower_id, followee_id):
+    """
+    Unfollow, decrement the count and drop the author's timeline entries.
+
+    Returns (followers_count, deleted).
+    """
+    row = fetch_one(cursor, UNFOLLOW_AUTHOR, [follower_id, followee_id, followee_id])
+    followers_count, deleted = row.followers_count, row.deleted
+
+    if deleted:
+        execute(cursor, DROP_TIMELINE_AUTHOR, [follower_id, followee_id])
+    return followers_count, deleted
+
+
+def fan_out_post(cursor, blog_id, author_id, created_at):
+    """
+    Push a new post into every follower's timeline.
+
+    Skipped for authors above FANOUT_MAX_FOLLOWERS - their posts are read
+    at request time instead. Returns the number of timelines written.
+    """
+    return execute(cursor, FAN_OUT_POST, [
+        blog_id, author_id, created_at, author_id, author_id, FANOUT_MAX_FOLLOWERS,
+    ]).rowcount
+
+
+def fetch_home_page(cursor, user_id, page_cursor, page_size):
+    """
+    One page of (created_at, blog_id) positions for a user's home feed.
+
+    Reads page_size + 1 rows from each source so the caller can hand the
+    merged result to paginate_rows(). Raises InvalidCursor.
+    """
+    keyset_sql, order_sql, keyset_params, direction = keyset_clause(
+        page_cursor, created_col='t.created_at', id_col='t.blog_id')
+    pushed = fetch_all(cursor, TIMELINE_PUSHED, [user_id, *keyset_params, page_size + 1],
+                       keyset=keyset_sql, order=order_sql)
+
+    # High-follower authors: one index scan of at most page_size + 1 posts each
+    keyset_sql, order_sql, keyset_params, direction = keyset_clause(page_cursor)
+    pulled = fetch_all(cursor, TIMELINE_PULLED, [*keyset_params, page_size + 1, user_id, FANOUT_MAX_FOLLOWERS],
+                       keyset=keyset_sql, order=order_sql)
+
+    return merge_timeline(pushed, pulled, direction, page_size + 1), direction
+
+
+def merge_timeline(pushed, pulled, direction, limit):
+    """
+    Merge (created_at, blog_id) rows from both sources in page order.
+
+    An author who crossed the fan-out threshold can appear in both, so
+    rows are de-duplicated by blog id.
+    """
+    merged = {}
+    for created_at, blog_id in [*pushed, *pulled]:
+        merged[str(blog_id)] = created_at
+    rows = sorted(((created_at, blog_id) for blog_id, created_at in merged.items()),
+                  reverse=direction == 'next')
+    return rows[:limit]
+
+
+def trim_timelines(cursor, user_ids):
+    """Cut the given users' timelines down to TIMELINE_MAX_LENGTH entries"""
+    return execute(cursor, TRIM_TIMELINES, [list(user_ids), TIMELINE_MAX_LENGTH]).rowcount
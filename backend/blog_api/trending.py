@@ -0,0 +1,120 @@
+from django.conf import settings
+
+from .fields import row_to_dict, select_fragments
+from .queries import (
+    BUMP_TRENDING, BUMP_TRENDING_VIEWS, CLEAR_TRENDING, LOCK_TRENDING_EPOCH, PRUNE_TRENDING,
+    REBUILD_TRENDING, RESCALE_TRENDING, RESET_TRENDING_EPOCH, TRENDING_BLOGS, UNBUMP_TRENDING,
+    execute, fetch_all, fetch_one,
+)
+
+# ========================================
+# 🔥 TRENDING RANKING
+# ========================================
+#
+# public.blog_trending holds one score per blog with recent engagement.
+# Scores use an epoch-anchored exponential decay: an event at time t adds
+#
+#     weight * 2 ** ((t - epoch) / half_life)
+#
+# so a newer event is always worth more than an older one and nothing has
+# to be decayed on write - each like, comment or batch of views is a plain
+# additive upsert. Reading the top N is one scan of the (score DESC) index.
+#
+# `python manage.py refresh_trending` runs the periodic full decay: it
+# moves the epoch to now (rescaling every score, which keeps the numbers
+# bounded without changing the order) and prunes blogs that went cold.
+# `--rebuild` recomputes everything from likes/comments/view_count.
+
+HALF_LIFE_HOURS = getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24)
+LIKE_WEIGHT = getattr(settings, 'TRENDING_LIKE_WEIGHT', 3.0)
+COMMENT_WEIGHT = getattr(settings, 'TRENDING_COMMENT_WEIGHT', 5.0)
+VIEW_WEIGHT = getattr(settings, 'TRENDING_VIEW_WEIGHT', 0.1)
+
+# Scores that decayed below this (in "events right now" units) are dropped
+PRUNE_BELOW = 0.01
+
+HALF_LIFE_SECONDS = HALF_LIFE_HOURS * 3600
+
+# Older events are worth nothing; queries.py clamps the SQL decay the same way
+MIN_HALF_LIVES = -60
+
+
+def decay_factor(age_seconds):
+    """What an event ``age_seconds`` old (negative: in the past) is worth now, per unit"""
+    return 2.0 ** max(age_seconds / HALF_LIFE_SECONDS, MIN_HALF_LIVES)
+
+
+def bump_trending(cursor, blog_id, weight):
+    """Add one engagement event to a blog's score"""
+    execute(cursor, BUMP_TRENDING, [blog_id, weight, HALF_LIFE_SECONDS])
+
+
+def unbump_trending(cursor, blog_id, weight, occurred_at):
+    """
+    Take back an event - an unlike, a deleted comment - made at ``occurred_at``.
+
+    Subtracts exactly what bump_trending added for it (scaled from the
+    event's own time, not now), so like/unlike cycles leave the score
+    where it was. A blog already pruned from the ranking is left out.
+    """
+    execute(cursor, UNBUMP_TRENDING, [weight, occurred_at, HALF_LIFE_SECONDS, blog_id])
+
+
+def bump_trending_views(cursor, view_rows):
+    """Add a flushed batch of (blog_id, views) rows in one statement"""
+    if not view_rows:
+        return
+    blog_ids, views = zip(*view_rows)
+    execute(cursor, BUMP_TRENDING_VIEWS, [VIEW_WEIGHT, HALF_LIFE_SECONDS, list(blog_ids), list(views)])
+
+
+def decay_trending(cursor):
+    """
+    Move the epoch to now, rescaling all scores, and prune cold blogs.
+
+    Run inside a transaction. Returns (rescaled, pruned).
+    """
+    age = fetch_one(cursor, LOCK_TRENDING_EPOCH).age
+    factor = decay_factor(float(age))
+
+    pruned = execute(cursor, PRUNE_TRENDING, [factor, PRUNE_BELOW]).rowcount
+    rescaled = execute(cursor, RESCALE_TRENDING, [factor]).rowcount
+    execute(cursor, RESET_TRENDING_EPOCH)
+    return rescaled, pruned
+
+
+def rebuild_trending(cursor):
+    """
+    Recompute every score from the source tables with the epoch at now.
+
+    Likes and comments decay from their own timestamps. view_count has no
+    timestamps, so views decay from the blog's created_at. Run inside a
+    transaction. Returns the number of ranked blogs.
+    """
+    execute(cursor, LOCK_TRENDING_EPOCH)
+    execute(cursor, RESET_TRENDING_EPOCH)
+    execute(cursor, CLEAR_TRENDING)
+    return execute(cursor, REBUILD_TRENDING, {
+        'like': LIKE_WEIGHT,
+        'comment': COMMENT_WEIGHT,
+        'view': VIEW_WEIGHT,
+        'half_life': HALF_LIFE_SECONDS,
+        'prune': PRUNE_BELOW,
+    }).rowcount
+
+
+def fetch_trending(cursor, columns, limit):
+    """
+    Top ``limit`` published blogs by score, best first.
+
+    Walks blog_trending_score_idx and joins each hit by primary key, so the
+    cost depends on ``limit``, not on the number of blogs. Each blog gets a
+    ``trending_score`` in "events right now" units.
+    """
+    blogs = []
+    for row in fetch_all(cursor, TRENDING_BLOGS, {'half_life': HALF_LIFE_SECONDS, 'limit': limit},
+                         **select_fragments(columns)):
+        blog = row_to_dict(columns, row)
+        blog['trending_score'] = round(row.trending_score, 4)
+        blogs.append(blog)
+    return blogs
@@ -6,77 +6,89 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth.models import User
-from django.contrib.auth.hashers import make_password, check_password
-from django.db import connection
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction, IntegrityError
+from django.utils.cache import patch_cache_control
 import uuid
 from datetime import datetime
 
+from .authentication import current_user, tokens_for_user
+from .passwords import HashingBusy, password_pool
+from .pagination import (
+    InvalidCursor, keyset_clause, paginate_rows, get_page_size, build_page_link,
+)
+from .counters import like_blog, unlike_blog
+from .comments import (
+    MAX_COMMENT_LENGTH, fetch_comments_page, load_authors, attach_authors, create_comment,
+)
+from .personalization import overlay_user_flags, record_engagement
+from .health import health_view, diagnostics_view, get_table_stats
+from .response_cache import (
+    feed_page_key, blog_detail_key, get_cached, set_cached, set_cached_feed_page,
+    invalidate_feed, invalidate_blog, invalidate_counters,
+)
+from .view_counts import view_buffer
+from .fields import (
+    InvalidFields, VALIDATOR_COLUMNS, parse_fields, selected_columns, select_fragments, row_to_dict,
+    project, fetch_blogs_by_ids,
+)
+from .queries import (
+    FEED_PAGE, WISHLIST_BLOGS, BLOG_STATUS, BLOG_DETAIL, BLOG_VALIDATORS, BLOG_EXISTS, BLOG_AUTHOR,
+    BLOG_CREATE, BLOG_UPDATE, BLOG_DELETE, WISHLIST_ADD, WISHLIST_REMOVE, USER_FOR_LOGIN, USER_BY_USERNAME, USER_PROFILE,
+    blog_detail, execute, fetch_all, fetch_one,
+)
+from .author_stats import adjust_author_stats, fetch_author_posts, fetch_author_profile
+from .timeline import follow_author, unfollow_author, fan_out_post, fetch_home_page
+from .colikes import COLIKE_TOP_N, COLIKE_CACHE_SECONDS, fetch_colikes
+from .related import RELATED_TOP_K, enqueue_related, fetch_related_ids
+from .trending import LIKE_WEIGHT, bump_trending, fetch_trending, unbump_trending
+from .search import search_blogs, SEARCH_MAX_PAGE, SEARCH_QUERY_MAX_LENGTH
+from .conditional import (
+    compute_etag, compute_last_modified, is_conditional, not_modified_response, set_validators,
+)
+
+User = get_user_model()
+
+# Bulk endpoint limits
+MAX_BULK_IDS = 100
+MAX_STATUS_IDS = 500
+
 # ========================================
 # 🔧 DATABASE HELPER FUNCTIONS
 # ========================================
 
-def get_user_by_email(email):
-    """Get user from Supabase by email"""
+def get_user_by_username(username):
+    """Get public user info from Supabase by username"""
     with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT id, username, email, password, name, created_at 
-            FROM public.users 
-            WHERE email = %s AND is_active = true
-        """, [email])
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': str(row[0]),
-                'username': row[1],
-                'email': row[2],
-                'password': row[3],
-                'name': row[4],
-                'created_at': row[5]
-            }
-    return None
+        row = fetch_one(cursor, USER_BY_USERNAME, [username])
+    return row._asdict() if row else None
 
-def get_user_by_id(user_id):
-    """Get user from Supabase by ID"""
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT id, username, email, name, created_at 
-            FROM public.users 
-            WHERE id = %s AND is_active = true
-        """, [user_id])
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': str(row[0]),
-                'username': row[1],
-                'email': row[2],
-                'name': row[3],
-                'created_at': row[4]
-            }
-    return None
+def user_to_dict(user):
+    """users.User (or a USER_FOR_LOGIN row) -> the user_data dict the views and tokens use"""
+    return {
+        'id': str(user.id),
+        'username': user.username,
+        'email': user.email,
+        'name': user.name,
+    }
 
-def create_user_in_supabase(username, email, password, name):
-    """Create new user in Supabase"""
-    user_id = str(uuid.uuid4())
-    hashed_password = make_password(password)
-    
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            INSERT INTO public.users (id, username, email, password, name, created_at) 
-            VALUES (%s, %s, %s, %s, %s, NOW())
-            RETURNING id, username, email, name, created_at
-        """, [user_id, username, email, hashed_password, name])
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': str(row[0]),
-                'username': row[1],
-                'email': row[2],
-                'name': row[3],
-                'created_at': row[4]
-            }
-    return None
+def parse_blog_ids(values, limit):
+    """Validate a list of blog ids; raises ValueError on bad or too many ids"""
+    ids = []
+    for value in values:
+        value = str(value).strip()
+        if not value:
+            continue
+        try:
+            ids.append(str(uuid.UUID(value)))
+        except ValueError:
+            raise ValueError(f'Invalid blog id: {value}')
+    ids = list(dict.fromkeys(ids))  # de-duplicate, keep order
+    if not ids:
+        raise ValueError('At least one id is required')
+    if len(ids) > limit:
+        raise ValueError(f'At most {limit} ids per request')
+    return ids
 
 # ========================================
 # 🌐 API ENDPOINTS
@@ -95,14 +107,30 @@ def api_root(request):
                 'signup': 'POST /api/auth/signup/',
             },
             'blogs': {
-                'list_create': 'GET|POST /api/blogs/',
+                'list_create': 'GET|POST /api/blogs/?cursor=&page_size=&fields=',
+                'bulk': 'GET /api/blogs/?ids=a,b,c',
+                'status': 'POST /api/blogs/status/',
+                'search': 'GET /api/blogs/search/?q=',
+                'trending': 'GET /api/blogs/trending/?page_size=',
                 'detail': 'GET|PUT|DELETE /api/blogs/{id}/',
                 'like': 'POST|DELETE /api/blogs/{id}/like/',
                 'wishlist': 'POST|DELETE /api/blogs/{id}/wishlist/',
+                'comments': 'GET|POST /api/blogs/{id}/comments/',
+                'related': 'GET /api/blogs/{id}/related/?limit=',
+                'also_liked': 'GET /api/blogs/{id}/also-liked/?limit=',
             },
             'user': {
                 'profile': 'GET|PUT /api/user/profile/',
                 'wishlist': 'GET /api/user/wishlist/',
+                'home_feed': 'GET /api/feed/home/?cursor=&page_size=&fields=',
+            },
+            'authors': {
+                'profile': 'GET /api/authors/{username}/?cursor=&page_size=&fields=',
+                'follow': 'POST|DELETE /api/authors/{username}/follow/',
+            },
+            'health': {
+                'health': 'GET /api/health/',
+                'diagnostics': 'GET /api/diagnostics/',
             }
         },
         'database': 'Connected to Supabase PostgreSQL',
@@ -110,6 +138,14 @@ def api_root(request):
         'status': 'All systems operational ✅'
     })
 
+def hashing_busy_response():
+    """503 for a login/signup refused because the password hashing pool is full"""
+    response = Response({
+        'error': 'Too many sign-in attempts right now - please try again shortly'
+    }, status=503)
+    response['Retry-After'] = '1'
+    return response
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login_view(request):
@@ -122,31 +158,28 @@ def login_view(request):
             'error': 'Email and password are required'
         }, status=400)
     
-    # Get user from Supabase
-    user_data = get_user_by_email(email)
-    if not user_data:
+    # One prepared query on public.users; the password check runs on the hashing pool
+    with connection.cursor() as cursor:
+        user = fetch_one(cursor, USER_FOR_LOGIN, [email])
+    if user is None:
         return Response({
             'error': 'Invalid email or password'
         }, status=401)
-    
-    # Verify password
-    if not check_password(password, user_data['password']):
+    try:
+        matches, upgraded = password_pool.verify(password, user.password)
+    except HashingBusy:
+        return hashing_busy_response()
+    if not matches:
         return Response({
             'error': 'Invalid email or password'
         }, status=401)
+    if upgraded:
+        # Stored with an outdated hasher or cost - replace it with PASSWORD_HASHER's
+        User.objects.filter(pk=user.id).update(password=upgraded)
     
-    # Create or get Django user for JWT
-    django_user, created = User.objects.get_or_create(
-        username=user_data['username'],
-        defaults={
-            'email': user_data['email'],
-            'first_name': user_data['name'] or '',
-            'is_active': True
-        }
-    )
-    
-    # Generate JWT tokens
-    refresh = RefreshToken.for_user(django_user)
+    # Generate JWT tokens - the user's id/username/name ride along as claims
+    user_data = user_to_dict(user)
+    refresh = tokens_for_user(user_data)
     
     return Response({
         'id': user_data['id'],
@@ -158,6 +191,22 @@ def login_view(request):
         'message': 'Login successful!'
     }, status=200)
 
+# public.users unique constraints, by the name PostgreSQL reports them under
+SIGNUP_CONFLICTS = {
+    'users_email_key': 'Email already exists',
+    'users_username_key': 'Username already exists',
+}
+
+def signup_conflict(error, user):
+    """Which unique value a failed signup INSERT collided with"""
+    constraint = getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None)
+    if constraint in SIGNUP_CONFLICTS:
+        return SIGNUP_CONFLICTS[constraint]
+    # SQLite names no constraint - look the email up (an indexed read, failures only)
+    if User.objects.filter(email=user.email).exists():
+        return SIGNUP_CONFLICTS['users_email_key']
+    return SIGNUP_CONFLICTS['users_username_key']
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def signup_view(request):
@@ -178,29 +227,23 @@ def signup_view(request):
             'error': 'Password must be at least 6 characters long'
         }, status=400)
     
-    # Check if user already exists
-    if get_user_by_email(email):
-        return Response({
-            'error': 'Email already exists'
-        }, status=400)
+    try:
+        hashed = password_pool.hash(password)
+    except HashingBusy:
+        return hashing_busy_response()
     
-    # Create user in Supabase
-    user_data = create_user_in_supabase(username, email, password, name)
-    if not user_data:
-        return Response({
-            'error': 'Failed to create user. Please try again.'
-        }, status=500)
-    
-    # Create Django user for JWT
-    django_user = User.objects.create_user(
-        username=username,
-        email=email,
-        first_name=name,
-        password=password
-    )
+    # A single INSERT in its own transaction; the unique constraints catch duplicates
+    user = User(username=User.normalize_username(username), email=User.objects.normalize_email(email),
+                name=name, password=hashed)
+    try:
+        with transaction.atomic():
+            user.save()
+    except IntegrityError as e:
+        return Response({'error': signup_conflict(e, user)}, status=400)
     
-    # Generate JWT tokens
-    refresh = RefreshToken.for_user(django_user)
+    # Generate JWT tokens - the user's id/username/name ride along as claims
+    user_data = user_to_dict(user)
+    refresh = tokens_for_user(user_data)
     
     return Response({
         'id': user_data['id'],
@@ -215,124 +258,92 @@ def signup_view(request):
 @api_view(['GET', 'POST'])
 @permission_classes([AllowAny])
 def blogs_view(request):
-    """Blog List/Create - GET and POST with detailed debugging"""
+    """Blog List/Create - GET and POST"""
+    
+    if request.method == 'GET' and 'ids' in request.query_params:
+        return _blogs_by_ids(request)
     
     if request.method == 'GET':
         try:
-            # Test database connection first
-            with connection.cursor() as cursor:
-                # Check if tables exist
-                cursor.execute("""
-                    SELECT table_name 
-                    FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_type = 'BASE TABLE'
-                    ORDER BY table_name
-                """)
-                tables = [row[0] for row in cursor.fetchall()]
-                
-                # Count records in each table
-                cursor.execute("SELECT COUNT(*) FROM public.users")
-                users_count = cursor.fetchone()[0]
-                
-                cursor.execute("SELECT COUNT(*) FROM public.blogs")
-                blogs_count = cursor.fetchone()[0]
-                
-                # If no blogs, return debug info
-                if blogs_count == 0:
-                    return Response({
-                        'count': 0,
-                        'results': [],
-                        'debug_info': {
-                            'message': 'Connected to Supabase but no blogs found yet',
-                            'database_connection': 'SUCCESS ✅',
-                            'tables_found': tables,
-                            'users_count': users_count,
-                            'blogs_count': blogs_count,
-                            'suggestion': 'Run the SQL insert commands to add test data'
-                        }
-                    })
-                
-                # Get current user if authenticated
-                current_user_id = None
-                if request.user.is_authenticated:
-                    try:
-                        user_data = get_user_by_email(request.user.email)
-                        current_user_id = user_data['id'] if user_data else None
-                    except:
-                        pass
-                
-                # Fetch blogs with all details
-                cursor.execute("""
-                    SELECT 
-                        b.id, b.title, b.content, b.excerpt, b.image, 
-                        b.created_at, b.updated_at, b.view_count, b.is_published,
-                        u.id as author_id, u.username, u.name, u.email,
-                        COALESCE((SELECT COUNT(*) FROM public.likes l WHERE l.blog_id = b.id), 0) as likes_count,
-                        COALESCE((SELECT COUNT(*) FROM public.comments c WHERE c.blog_id = b.id), 0) as comments_count,
-                        CASE 
-                            WHEN %s IS NOT NULL THEN 
-                                EXISTS(SELECT 1 FROM public.likes l WHERE l.blog_id = b.id AND l.user_id = %s::uuid)
-                            ELSE false 
-                        END as user_liked,
-                        CASE 
-                            WHEN %s IS NOT NULL THEN 
-                                EXISTS(SELECT 1 FROM public.wishlist w WHERE w.blog_id = b.id AND w.user_id = %s::uuid)
-                            ELSE false 
-                        END as user_wishlisted
-                    FROM public.blogs b
-                    JOIN public.users u ON b.author_id = u.id
-                    WHERE b.is_published = true
-                    ORDER BY b.created_at DESC
-                    LIMIT 15
-                """, [current_user_id, current_user_id, current_user_id, current_user_id])
-                
-                rows = cursor.fetchall()
-                blogs = []
-                
-                for row in rows:
-                    # Generate excerpt if not exists
-                    excerpt = row[3]
-                    if not excerpt and row[2]:  # If no excerpt, create from content
-                        content_text = row[2][:200] + '...' if len(row[2]) > 200 else row[2]
-                        excerpt = content_text
-                    
-                    blog = {
-                        'id': str(row[0]),
-                        'title': row[1],
-                        'content': row[2],
-                        'excerpt': excerpt,
-                        'image': row[4],
-                        'created_at': row[5].isoformat() if row[5] else None,
-                        'updated_at': row[6].isoformat() if row[6] else None,
-                        'view_count': row[7] or 0,
-                        'is_published': row[8],
-                        'author': {
-                            'id': str(row[9]),
-                            'username': row[10],
-                            'name': row[11] or row[10],  # Use username if name is empty
-                            'email': row[12]
-                        },
-                        'likes_count': row[13] or 0,
-                        'comments_count': row[14] or 0,
-                        'user_liked': bool(row[15]) if current_user_id else False,
-                        'user_wishlisted': bool(row[16]) if current_user_id else False,
-                    }
-                    blogs.append(blog)
-                
+            # Get current user if authenticated
+            current_user_id = None
+            if request.user.is_authenticated:
+                try:
+                    user_data = current_user(request)
+                    current_user_id = user_data['id'] if user_data else None
+                except:
+                    pass
+            
+            # Keyset pagination on (created_at, id) - deep pages cost the same as page 1
+            page_size = get_page_size(request)
+            page_cursor = request.query_params.get('cursor')
+            try:
+                keyset_sql, order_sql, keyset_params, direction = keyset_clause(page_cursor)
+            except InvalidCursor:
                 return Response({
-                    'count': len(blogs),
-                    'results': blogs,
-                    'debug_info': {
-                        'message': f'Successfully loaded {len(blogs)} blogs from Supabase!',
-                        'database_connection': 'SUCCESS ✅',
-                        'total_users': users_count,
-                        'total_blogs': blogs_count,
-                        'current_user_authenticated': bool(current_user_id),
-                        'current_user_id': current_user_id
-                    }
-                })
+                    'error': 'Invalid cursor'
+                }, status=400)
+            
+            # Sparse fieldsets - only the requested columns are read
+            try:
+                fields = parse_fields(request.query_params.get('fields'))
+            except InvalidFields as e:
+                return Response({'error': str(e)}, status=400)
+            columns = selected_columns(fields)
+            
+            # Feed pages are the same for every viewer, so one cached copy serves everyone
+            page_key = feed_page_key(page_size, page_cursor, variant=','.join(columns))
+            cached_page = get_cached(page_key)
+            if cached_page is not None:
+                blogs, next_cursor, prev_cursor = cached_page
+            else:
+                feed_params = [*keyset_params, page_size + 1]
+                with connection.cursor() as cursor:
+                    if is_conditional(request):
+                        # Validator columns only - a revalidation that still matches stops here
+                        rows = fetch_all(cursor, FEED_PAGE, feed_params, keyset=keyset_sql, order=order_sql,
+                                         **select_fragments(VALIDATOR_COLUMNS))
+                        probe, _, _ = feed_page(VALIDATOR_COLUMNS, rows, page_size, direction, page_cursor)
+                        not_modified = not_modified_for(request, probe, current_user_id)
+                        if not_modified is not None:
+                            return not_modified
+                    
+                    # Fetch blogs with the selected columns
+                    rows = fetch_all(cursor, FEED_PAGE, feed_params,
+                                     keyset=keyset_sql, order=order_sql, **select_fragments(columns))
                 
+                blogs, next_cursor, prev_cursor = feed_page(columns, rows, page_size, direction, page_cursor)
+                set_cached_feed_page(page_key, (blogs, next_cursor, prev_cursor))
+            
+            # Per-user flags come from the cached liked/wishlisted id sets
+            overlay_user_flags(blogs, current_user_id)
+            
+            # Conditional GET - answer 304 before anything is serialized
+            etag = compute_etag(blogs)
+            last_modified = compute_last_modified(blogs)
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            
+            data = {
+                'count': len(blogs),
+                'next': build_page_link(request, next_cursor),
+                'previous': build_page_link(request, prev_cursor),
+                'page_size': page_size,
+                'results': [project(blog, fields) for blog in blogs],
+            }
+            
+            # Diagnostics are opt-in; table stats come from the cached /api/diagnostics/ data
+            if settings.FEED_DEBUG_INFO:
+                data['debug_info'] = {
+                    'message': f'Successfully loaded {len(blogs)} blogs from Supabase!',
+                    'table_stats': get_table_stats(),
+                    'current_user_authenticated': bool(current_user_id),
+                    'current_user_id': current_user_id
+                }
+            
+            return set_validators(Response(data), etag, last_modified)
+            
         except Exception as e:
             return Response({
                 'count': 0,
@@ -352,7 +363,7 @@ def blogs_view(request):
             }, status=401)
         
         # Get current user
-        user_data = get_user_by_email(request.user.email)
+        user_data = current_user(request)
         if not user_data:
             return Response({
                 'error': 'User not found'
@@ -376,22 +387,18 @@ def blogs_view(request):
         blog_id = str(uuid.uuid4())
         excerpt = content[:200] + '...' if len(content) > 200 else content
         
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                INSERT INTO public.blogs (id, title, content, excerpt, image, author_id, is_published, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, true, NOW(), NOW())
-                RETURNING id, title, content, excerpt, image, created_at, updated_at
-            """, [blog_id, title, content, excerpt, image, user_data['id']])
-            row = cursor.fetchone()
+        with transaction.atomic(), connection.cursor() as cursor:
+            blog = fetch_one(cursor, BLOG_CREATE, [blog_id, title, content, excerpt, image, user_data['id']])
+            
+            # Push into followers' home timelines (skipped for high-follower authors)
+            fan_out_post(cursor, blog_id, user_data['id'], blog.created_at)
+            enqueue_related(cursor, blog_id)
+            adjust_author_stats(cursor, user_data['id'], posts=1)
+        
+        invalidate_feed()
         
         return Response({
-            'id': str(row[0]),
-            'title': row[1],
-            'content': row[2],
-            'excerpt': row[3],
-            'image': row[4],
-            'created_at': row[5].isoformat(),
-            'updated_at': row[6].isoformat(),
+            **blog._asdict(),
             'author': {
                 'id': user_data['id'],
                 'username': user_data['username'],
@@ -404,72 +411,344 @@ def blogs_view(request):
             'message': 'Blog created successfully!'
         }, status=201)
 
+def feed_page(columns, rows, page_size, direction, page_cursor):
+    """FEED_PAGE rows (with the probe row) -> (blogs, next_cursor, prev_cursor)"""
+    rows, next_cursor, prev_cursor = paginate_rows(
+        rows, page_size, direction,
+        has_cursor=page_cursor is not None,
+        position=lambda row: (row.created_at, row.id),
+    )
+    return [row_to_dict(columns, row) for row in rows], next_cursor, prev_cursor
+
+def not_modified_for(request, blogs, user_id):
+    """304 if the client's validators match these (validator-only) blogs, else None"""
+    overlay_user_flags(blogs, user_id)
+    return not_modified_response(request, compute_etag(blogs), compute_last_modified(blogs))
+
+def _blogs_by_ids(request):
+    """GET /api/blogs/?ids=a,b,c - hydrate many blogs in one query"""
+    try:
+        blog_ids = parse_blog_ids(request.query_params['ids'].split(','), MAX_BULK_IDS)
+        fields = parse_fields(request.query_params.get('fields'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    columns = selected_columns(fields)
+    
+    current_user_id = None
+    if request.user.is_authenticated:
+        user_data = current_user(request)
+        current_user_id = user_data['id'] if user_data else None
+    
+    with connection.cursor() as cursor:
+        found = fetch_blogs_by_ids(cursor, blog_ids, columns)
+    
+    # Keep the order the client asked for
+    blogs = [found[blog_id] for blog_id in blog_ids if blog_id in found]
+    overlay_user_flags(blogs, current_user_id)
+    
+    return Response({
+        'count': len(blogs),
+        'results': [project(blog, fields) for blog in blogs],
+        'missing': [blog_id for blog_id in blog_ids if blog_id not in found],
+    })
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def blogs_status_view(request):
+    """Batch engagement status - POST {"ids": [...]}"""
+    ids = request.data.get('ids')
+    if not isinstance(ids, list):
+        return Response({'error': 'ids must be a list of blog ids'}, status=400)
+    try:
+        blog_ids = parse_blog_ids(ids, MAX_STATUS_IDS)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    
+    current_user_id = None
+    if request.user.is_authenticated:
+        user_data = current_user(request)
+        current_user_id = user_data['id'] if user_data else None
+    
+    with connection.cursor() as cursor:
+        blogs = [row._asdict() for row in fetch_all(cursor, BLOG_STATUS, [blog_ids])]
+    
+    overlay_user_flags(blogs, current_user_id)
+    
+    return Response({
+        'count': len(blogs),
+        'results': {blog.pop('id'): blog for blog in blogs},
+    })
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def trending_blogs_view(request):
+    """Trending Feed - GET /api/blogs/trending/?page_size=&fields="""
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=400)
+    page_size = get_page_size(request)
+    columns = selected_columns(fields)
+    
+    current_user_id = None
+    if request.user.is_authenticated:
+        user_data = current_user(request)
+        current_user_id = user_data['id'] if user_data else None
+    
+    # Scores are precomputed - this is one index scan over blog_trending
+    with connection.cursor() as cursor:
+        blogs = fetch_trending(cursor, columns, page_size)
+    
+    overlay_user_flags(blogs, current_user_id)
+    
+    results = []
+    for blog in blogs:
+        result = project(blog, fields)
+        result['trending_score'] = blog['trending_score']
+        results.append(result)
+    
+    return Response({
+        'count': len(results),
+        'page_size': page_size,
+        'results': results,
+    })
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
+def blog_search_view(request):
+    """Full-text search - GET /api/blogs/search/?q=&page=&page_size=&fields="""
+    query = (request.query_params.get('q') or '').strip()
+    if not query:
+        return Response({'error': 'Search query (q) is required'}, status=400)
+    if len(query) > SEARCH_QUERY_MAX_LENGTH:
+        return Response({
+            'error': f'Search query must be at most {SEARCH_QUERY_MAX_LENGTH} characters'
+        }, status=400)
+    
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=400)
+    try:
+        page = int(request.query_params.get('page', 1))
+    except ValueError:
+        return Response({'error': 'page must be an integer'}, status=400)
+    if not 1 <= page <= SEARCH_MAX_PAGE:
+        return Response({'error': f'page must be between 1 and {SEARCH_MAX_PAGE}'}, status=400)
+    
+    page_size = get_page_size(request)
+    columns = selected_columns(fields)
+    
+    current_user_id = None
+    if request.user.is_authenticated:
+        user_data = current_user(request)
+        current_user_id = user_data['id'] if user_data else None
+    
+    with connection.cursor() as cursor:
+        # One probe row past the page tells us whether there is a next page
+        blogs = search_blogs(cursor, query, columns, page_size + 1, (page - 1) * page_size)
+    has_next = len(blogs) > page_size and page < SEARCH_MAX_PAGE
+    blogs = blogs[:page_size]
+    
+    overlay_user_flags(blogs, current_user_id)
+    
+    results = []
+    for blog in blogs:
+        result = project(blog, fields)
+        result['rank'] = blog['rank']
+        result['highlight'] = blog['highlight']
+        results.append(result)
+    
+    return Response({
+        'query': query,
+        'count': len(results),
+        'page': page,
+        'next': build_page_link(request, str(page + 1) if has_next else None, param='page'),
+        'results': results,
+    })
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([AllowAny])
 def blog_detail_view(request, blog_id):
-    """Blog Detail - GET only for now"""
+    """Blog Detail - GET, PUT (author only), DELETE (author only)"""
+    
+    if request.method in ['PUT', 'DELETE']:
+        return _update_or_delete_blog(request, blog_id)
     
     # Get current user if authenticated
     current_user_id = None
     if request.user.is_authenticated:
-        user_data = get_user_by_email(request.user.email)
+        user_data = current_user(request)
         current_user_id = user_data['id'] if user_data else None
     
-    with connection.cursor() as cursor:
-        # Increment view count
-        cursor.execute("UPDATE public.blogs SET view_count = view_count + 1 WHERE id = %s", [blog_id])
-        
-        # Get blog details
-        cursor.execute("""
-            SELECT 
-                b.id, b.title, b.content, b.excerpt, b.image, 
-                b.created_at, b.updated_at, b.view_count,
-                u.id as author_id, u.username, u.name, u.email,
-                COALESCE((SELECT COUNT(*) FROM public.likes l WHERE l.blog_id = b.id), 0) as likes_count,
-                COALESCE((SELECT COUNT(*) FROM public.comments c WHERE c.blog_id = b.id), 0) as comments_count,
-                CASE 
-                    WHEN %s IS NOT NULL THEN 
-                        EXISTS(SELECT 1 FROM public.likes l WHERE l.blog_id = b.id AND l.user_id = %s::uuid)
-                    ELSE false 
-                END as user_liked,
-                CASE 
-                    WHEN %s IS NOT NULL THEN 
-                        EXISTS(SELECT 1 FROM public.wishlist w WHERE w.blog_id = b.id AND w.user_id = %s::uuid)
-                    ELSE false 
-                END as user_wishlisted
-            FROM public.blogs b
-            JOIN public.users u ON b.author_id = u.id
-            WHERE b.id = %s AND b.is_published = true
-        """, [current_user_id, current_user_id, current_user_id, current_user_id, blog_id])
-        
-        row = cursor.fetchone()
+    detail_key = blog_detail_key(blog_id)
+    blog = get_cached(detail_key)
+    if blog is None:
+        with connection.cursor() as cursor:
+            if is_conditional(request):
+                # Validator columns only - a revalidation that still matches stops here
+                row = fetch_one(cursor, BLOG_VALIDATORS, [blog_id])
+                if not row:
+                    return Response({
+                        'error': 'Blog not found'
+                    }, status=404)
+                not_modified = not_modified_for(request, [row._asdict()], current_user_id)
+                if not_modified is not None:
+                    view_buffer.record(blog_id)
+                    return not_modified
+            
+            row = fetch_one(cursor, BLOG_DETAIL, [blog_id])
         if not row:
             return Response({
                 'error': 'Blog not found'
             }, status=404)
         
-        blog = {
-            'id': str(row[0]),
-            'title': row[1],
-            'content': row[2],
-            'excerpt': row[3],
-            'image': row[4],
-            'created_at': row[5].isoformat(),
-            'updated_at': row[6].isoformat(),
-            'view_count': row[7],
-            'author': {
-                'id': str(row[8]),
-                'username': row[9],
-                'name': row[10] or row[9],
-                'email': row[11]
-            },
-            'likes_count': row[12],
-            'comments_count': row[13],
-            'user_liked': bool(row[14]) if current_user_id else False,
-            'user_wishlisted': bool(row[15]) if current_user_id else False,
-        }
+        blog = blog_detail(row)
+        set_cached(detail_key, blog)
+    
+    # Views are buffered in memory and flushed in batches, not written per read
+    view_buffer.record(blog_id)
+    
+    overlay_user_flags([blog], current_user_id)
+    
+    # Conditional GET - answer 304 before anything is serialized
+    etag = compute_etag([blog])
+    last_modified = compute_last_modified([blog])
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    
+    return set_validators(Response(blog), etag, last_modified)
+
+def _update_or_delete_blog(request, blog_id):
+    """PUT/DELETE branch of blog_detail_view - author only"""
+    if not request.user.is_authenticated:
+        return Response({
+            'error': 'Authentication required'
+        }, status=401)
+    
+    user_data = current_user(request)
+    if not user_data:
+        return Response({
+            'error': 'User not found'
+        }, status=404)
+    
+    with connection.cursor() as cursor:
+        row = fetch_one(cursor, BLOG_AUTHOR, [blog_id])
+        if not row:
+            return Response({'error': 'Blog not found'}, status=404)
+        if row.author_id != user_data['id']:
+            return Response({'error': 'Permission denied'}, status=403)
+        
+        if request.method == 'DELETE':
+            with transaction.atomic():
+                deleted = fetch_one(cursor, BLOG_DELETE, [blog_id])
+                if deleted:
+                    # The post's likes and views leave the author's totals with it
+                    adjust_author_stats(cursor, user_data['id'], posts=-1 if deleted.is_published else 0,
+                                        likes=-deleted.likes_count, views=-(deleted.view_count or 0))
+            invalidate_blog(blog_id)
+            return Response({'message': 'Blog deleted successfully!'})
+        
+        title = request.data.get('title')
+        content = request.data.get('content')
+        image = request.data.get('image', '')
+        
+        if not title or not content:
+            return Response({
+                'error': 'Title and content are required'
+            }, status=400)
+        
+        excerpt = content[:200] + '...' if len(content) > 200 else content
+        
+        blog = fetch_one(cursor, BLOG_UPDATE, [title, content, excerpt, image, blog_id])
+        enqueue_related(cursor, blog_id)
     
-    return Response(blog)
+    invalidate_blog(blog_id)
+    
+    return Response({
+        **blog._asdict(),
+        'message': 'Blog updated successfully!'
+    })
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def related_blogs_view(request, blog_id):
+    """Related Posts - GET /api/blogs/{id}/related/?limit=&fields="""
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=400)
+    try:
+        limit = int(request.query_params.get('limit', 5))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=400)
+    limit = max(1, min(limit, RELATED_TOP_K))
+    columns = selected_columns(fields)
+    
+    current_user_id = None
+    if request.user.is_authenticated:
+        user_data = current_user(request)
+        current_user_id = user_data['id'] if user_data else None
+    
+    with connection.cursor() as cursor:
+        # Precomputed neighbours - an index lookup, no similarity maths here
+        related = fetch_related_ids(cursor, str(blog_id), limit)
+        found = fetch_blogs_by_ids(cursor, [related_id for related_id, _ in related], columns)
+    
+    blogs = [found[related_id] for related_id, _ in related if related_id in found]
+    overlay_user_flags(blogs, current_user_id)
+    
+    scores = dict(related)
+    results = []
+    for blog in blogs:
+        result = project(blog, fields)
+        result['similarity'] = scores[blog['id']]
+        results.append(result)
+    
+    return Response({
+        'count': len(results),
+        'results': results,
+    })
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def also_liked_view(request, blog_id):
+    """Readers Who Liked This Also Liked - GET /api/blogs/{id}/also-liked/?limit=&fields="""
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=400)
+    try:
+        limit = int(request.query_params.get('limit', 5))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=400)
+    limit = max(1, min(limit, COLIKE_TOP_N))
+    columns = selected_columns(fields)
+    
+    with connection.cursor() as cursor:
+        # Precomputed by build_colikes - one index range scan plus one hydration query
+        colikes = fetch_colikes(cursor, str(blog_id), limit)
+        found = fetch_blogs_by_ids(cursor, [related_id for related_id, _ in colikes], columns)
+    blogs = [found[related_id] for related_id, _ in colikes if related_id in found]
+    
+    # Same answer for every reader, so no per-user flags and shared caches may keep it
+    co_likes = dict(colikes)
+    etag = compute_etag(blogs, extra=','.join(str(co_likes[blog['id']]) for blog in blogs))
+    last_modified = compute_last_modified(blogs)
+    response = not_modified_response(request, etag, last_modified)
+    if response is None:
+        results = []
+        for blog in blogs:
+            result = project(blog, fields)
+            result['co_likes'] = co_likes[blog['id']]
+            results.append(result)
+        response = set_validators(Response({
+            'count': len(results),
+            'results': results,
+        }), etag, last_modified)
+    patch_cache_control(response, public=True, max_age=COLIKE_CACHE_SECONDS)
+    return response
 
 @api_view(['POST', 'DELETE'])
 @permission_classes([IsAuthenticated])
@@ -477,48 +756,49 @@ def toggle_like_view(request, blog_id):
     """Toggle Like - POST to like, DELETE to unlike"""
     
     # Get current user
-    user_data = get_user_by_email(request.user.email)
+    user_data = current_user(request)
     if not user_data:
         return Response({'error': 'User not found'}, status=404)
     
-    with connection.cursor() as cursor:
-        if request.method == 'POST':
-            # Like the blog
-            like_id = str(uuid.uuid4())
-            try:
-                cursor.execute("""
-                    INSERT INTO public.likes (id, user_id, blog_id, created_at)
-                    VALUES (%s, %s, %s, NOW())
-                """, [like_id, user_data['id'], blog_id])
-                
-                # Get updated like count
-                cursor.execute("SELECT COUNT(*) FROM public.likes WHERE blog_id = %s", [blog_id])
-                likes_count = cursor.fetchone()[0]
-                
-                return Response({
-                    'likes_count': likes_count,
-                    'user_liked': True,
-                    'message': 'Blog liked!'
-                })
-            except:
-                return Response({'error': 'Already liked'}, status=400)
-                
-        elif request.method == 'DELETE':
-            # Unlike the blog
-            cursor.execute("""
-                DELETE FROM public.likes 
-                WHERE user_id = %s AND blog_id = %s
-            """, [user_data['id'], blog_id])
-            
-            # Get updated like count
-            cursor.execute("SELECT COUNT(*) FROM public.likes WHERE blog_id = %s", [blog_id])
-            likes_count = cursor.fetchone()[0]
+    if request.method == 'POST':
+        # Like, counters and trending score commit together (insert and counter bump are one statement)
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                likes_count, created = like_blog(cursor, user_data['id'], blog_id)
+                if created:
+                    bump_trending(cursor, blog_id, LIKE_WEIGHT)
+                    record_engagement(user_data['id'])
+        except IntegrityError:
+            return Response({'error': 'Blog not found'}, status=404)
+        
+        if likes_count is None:
+            return Response({'error': 'Blog not found'}, status=404)
+        if not created:
+            return Response({'error': 'Already liked'}, status=400)
+        
+        invalidate_counters(blog_id)
+        return Response({
+            'likes_count': likes_count,
+            'user_liked': True,
+            'message': 'Blog liked!'
+        })
             
-            return Response({
-                'likes_count': likes_count,
-                'user_liked': False,
-                'message': 'Blog unliked!'
-            })
+    elif request.method == 'DELETE':
+        # Unlike, counters and trending score commit together (delete and decrement are one statement)
+        with transaction.atomic(), connection.cursor() as cursor:
+            likes_count, deleted, liked_at = unlike_blog(cursor, user_data['id'], blog_id)
+            record_engagement(user_data['id'])
+            if deleted:
+                # Take back exactly what the like added, so toggling cannot farm score
+                unbump_trending(cursor, blog_id, LIKE_WEIGHT, liked_at)
+        if deleted:
+            invalidate_counters(blog_id)
+        
+        return Response({
+            'likes_count': likes_count or 0,
+            'user_liked': False,
+            'message': 'Blog unliked!'
+        })
 
 @api_view(['POST', 'DELETE'])
 @permission_classes([IsAuthenticated])
@@ -526,7 +806,7 @@ def toggle_wishlist_view(request, blog_id):
     """Toggle Wishlist - POST to add, DELETE to remove"""
     
     # Get current user
-    user_data = get_user_by_email(request.user.email)
+    user_data = current_user(request)
     if not user_data:
         return Response({'error': 'User not found'}, status=404)
     
@@ -535,10 +815,8 @@ def toggle_wishlist_view(request, blog_id):
             # Add to wishlist
             wishlist_id = str(uuid.uuid4())
             try:
-                cursor.execute("""
-                    INSERT INTO public.wishlist (id, user_id, blog_id, created_at)
-                    VALUES (%s, %s, %s, NOW())
-                """, [wishlist_id, user_data['id'], blog_id])
+                execute(cursor, WISHLIST_ADD, [wishlist_id, user_data['id'], blog_id])
+                record_engagement(user_data['id'])
                 
                 return Response({
                     'user_wishlisted': True,
@@ -549,37 +827,219 @@ def toggle_wishlist_view(request, blog_id):
                 
         elif request.method == 'DELETE':
             # Remove from wishlist
-            cursor.execute("""
-                DELETE FROM public.wishlist 
-                WHERE user_id = %s AND blog_id = %s
-            """, [user_data['id'], blog_id])
+            execute(cursor, WISHLIST_REMOVE, [user_data['id'], blog_id])
+            record_engagement(user_data['id'])
             
             return Response({
                 'user_wishlisted': False,
                 'message': 'Removed from wishlist!'
             })
 
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def blog_comments_view(request, blog_id):
+    """Blog Comments - GET to list (keyset paginated), POST to add"""
+    
+    if request.method == 'GET':
+        page_size = get_page_size(request)
+        page_cursor = request.query_params.get('cursor')
+        
+        with connection.cursor() as cursor:
+            try:
+                comments, next_cursor, prev_cursor = fetch_comments_page(
+                    cursor, blog_id, page_cursor, page_size)
+            except InvalidCursor:
+                return Response({'error': 'Invalid cursor'}, status=400)
+            
+            if not comments and page_cursor is None:
+                # Only an empty first page needs to tell "no comments" from "no blog"
+                if fetch_one(cursor, BLOG_EXISTS, [blog_id]) is None:
+                    return Response({'error': 'Blog not found'}, status=404)
+            
+            # One users query for the whole page
+            authors = load_authors(cursor, [comment['author_id'] for comment in comments])
+        
+        return Response({
+            'count': len(comments),
+            'next': build_page_link(request, next_cursor),
+            'previous': build_page_link(request, prev_cursor),
+            'page_size': page_size,
+            'results': attach_authors(comments, authors),
+        })
+    
+    elif request.method == 'POST':
+        if not request.user.is_authenticated:
+            return Response({
+                'error': 'Authentication required to comment'
+            }, status=401)
+        
+        user_data = current_user(request)
+        if not user_data:
+            return Response({'error': 'User not found'}, status=404)
+        
+        content = (request.data.get('content') or '').strip()
+        if not content:
+            return Response({'error': 'Content is required'}, status=400)
+        if len(content) > MAX_COMMENT_LENGTH:
+            return Response({
+                'error': f'Comment must be at most {MAX_COMMENT_LENGTH} characters'
+            }, status=400)
+        
+        # Comment row and blogs.comments_count commit together
+        with transaction.atomic(), connection.cursor() as cursor:
+            comment, comments_count = create_comment(cursor, blog_id, user_data['id'], content)
+        if comment is None:
+            return Response({'error': 'Blog not found'}, status=404)
+        
+        invalidate_counters(blog_id)
+        
+        comment['author'] = {
+            'id': user_data['id'],
+            'username': user_data['username'],
+            'name': user_data['name'] or user_data['username'],
+        }
+        return Response({
+            **comment,
+            'comments_count': comments_count,
+            'message': 'Comment added!'
+        }, status=201)
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def author_profile_view(request, username):
+    """Author Page - GET /api/authors/{username}/?cursor=&page_size=&fields="""
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=400)
+    columns = selected_columns(fields)
+    page_size = get_page_size(request)
+    page_cursor = request.query_params.get('cursor')
+    
+    current_user_id = None
+    if request.user.is_authenticated:
+        user_data = current_user(request)
+        current_user_id = user_data['id'] if user_data else None
+    
+    with connection.cursor() as cursor:
+        # Profile and totals in one indexed read - no aggregates over blogs
+        author = fetch_author_profile(cursor, username)
+        if not author:
+            return Response({'error': 'Author not found'}, status=404)
+        try:
+            posts, next_cursor, prev_cursor = fetch_author_posts(
+                cursor, author['id'], columns, page_cursor, page_size)
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor'}, status=400)
+    
+    overlay_user_flags(posts, current_user_id)
+    
+    return Response({
+        **author,
+        'posts': {
+            'count': len(posts),
+            'next': build_page_link(request, next_cursor),
+            'previous': build_page_link(request, prev_cursor),
+            'page_size': page_size,
+            'results': [project(blog, fields) for blog in posts],
+        },
+    })
+
+@api_view(['POST', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def follow_author_view(request, username):
+    """Follow Author - POST to follow, DELETE to unfollow"""
+    
+    user_data = current_user(request)
+    if not user_data:
+        return Response({'error': 'User not found'}, status=404)
+    
+    author = get_user_by_username(username)
+    if not author:
+        return Response({'error': 'Author not found'}, status=404)
+    if author['id'] == user_data['id']:
+        return Response({'error': 'You cannot follow yourself'}, status=400)
+    
+    with transaction.atomic(), connection.cursor() as cursor:
+        if request.method == 'POST':
+            followers_count, created = follow_author(cursor, user_data['id'], author['id'])
+            if not created:
+                return Response({'error': 'Already following'}, status=400)
+            message = f"Following {author['username']}!"
+        else:
+            followers_count, _ = unfollow_author(cursor, user_data['id'], author['id'])
+            message = f"Unfollowed {author['username']}"
+    
+    return Response({
+        'followers_count': followers_count,
+        'following': request.method == 'POST',
+        'message': message
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def home_feed_view(request):
+    """Home Feed - posts from followed authors, GET /api/feed/home/?cursor=&page_size=&fields="""
+    
+    user_data = current_user(request)
+    if not user_data:
+        return Response({'error': 'User not found'}, status=404)
+    
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=400)
+    columns = selected_columns(fields)
+    page_size = get_page_size(request)
+    page_cursor = request.query_params.get('cursor')
+    
+    with connection.cursor() as cursor:
+        try:
+            # Pushed timeline entries merged with posts of high-follower authors
+            rows, direction = fetch_home_page(cursor, user_data['id'], page_cursor, page_size)
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor'}, status=400)
+        rows, next_cursor, prev_cursor = paginate_rows(
+            rows, page_size, direction,
+            has_cursor=page_cursor is not None,
+            position=lambda row: row,
+        )
+        found = fetch_blogs_by_ids(cursor, [blog_id for _, blog_id in rows], columns)
+    
+    # Unpublished or deleted posts simply drop out of the page
+    blogs = [found[blog_id] for _, blog_id in rows if blog_id in found]
+    overlay_user_flags(blogs, user_data['id'])
+    
+    return Response({
+        'count': len(blogs),
+        'next': build_page_link(request, next_cursor),
+        'previous': build_page_link(request, prev_cursor),
+        'page_size': page_size,
+        'results': [project(blog, fields) for blog in blogs],
+    })
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_profile_view(request):
     """User Profile - GET only"""
     
-    user_data = get_user_by_email(request.user.email)
+    user_data = current_user(request)
     if not user_data:
         return Response({'error': 'User not found'}, status=404)
     
-    # Get user's blog count
+    # Post count is maintained in author_stats - primary key reads, not a COUNT(*)
     with connection.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM public.blogs WHERE author_id = %s", [user_data['id']])
-        blogs_count = cursor.fetchone()[0]
+        row = fetch_one(cursor, USER_PROFILE, [user_data['id']])
+    if not row:
+        return Response({'error': 'User not found'}, status=404)
     
     return Response({
         'id': user_data['id'],
         'username': user_data['username'],
         'email': user_data['email'],
         'name': user_data['name'],
-        'created_at': user_data['created_at'].isoformat(),
-        'blogs_count': blogs_count,
+        'created_at': row.created_at,
+        'blogs_count': row.blogs_count,
     })
 
 @api_view(['GET'])
@@ -587,40 +1047,22 @@ def user_profile_view(request):
 def user_wishlist_view(request):
     """User Wishlist - GET only"""
     
-    user_data = get_user_by_email(request.user.email)
+    user_data = current_user(request)
     if not user_data:
         return Response({'error': 'User not found'}, status=404)
     
+    try:
+        fields = parse_fields(request.query_params.get('fields'))
+    except InvalidFields as e:
+        return Response({'error': str(e)}, status=400)
+    columns = selected_columns(fields)
+    
     with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT 
-                b.id, b.title, b.content, b.excerpt, b.image, 
-                b.created_at, u.username, u.name
-            FROM public.wishlist w
-            JOIN public.blogs b ON w.blog_id = b.id
-            JOIN public.users u ON b.author_id = u.id
-            WHERE w.user_id = %s
-            ORDER BY w.created_at DESC
-        """, [user_data['id']])
-        
-        rows = cursor.fetchall()
-        blogs = []
-        
-        for row in rows:
-            excerpt = row[3] or (row[2][:200] + '...' if len(row[2]) > 200 else row[2])
-            
-            blogs.append({
-                'id': str(row[0]),
-                'title': row[1],
-                'content': row[2],
-                'excerpt': excerpt,
-                'image': row[4],
-                'created_at': row[5].isoformat(),
-                'author': {
-                    'username': row[6],
-                    'name': row[7] or row[6]
-                }
-            })
+        rows = fetch_all(cursor, WISHLIST_BLOGS, [user_data['id']], **select_fragments(columns))
+    blogs = [row_to_dict(columns, row) for row in rows]
+    
+    overlay_user_flags(blogs, user_data['id'])
+    blogs = [project(blog, fields) for blog in blogs]
     
     return Response({
         'count': len(blogs),
@@ -647,13 +1089,28 @@ urlpatterns = [
     
     # ✅ Blog Endpoints
     path('api/blogs/', blogs_view, name='blogs'),                          # GET|POST /api/blogs/
-    path('api/blogs/<uuid:blog_id>/', blog_detail_view, name='blog-detail'), # GET /api/blogs/{id}/
+    path('api/blogs/search/', blog_search_view, name='blogs-search'),    # GET /api/blogs/search/?q=
+    path('api/blogs/trending/', trending_blogs_view, name='blogs-trending'),  # GET /api/blogs/trending/
+    path('api/blogs/status/', blogs_status_view, name='blogs-status'),   # POST /api/blogs/status/
+    path('api/blogs/<uuid:blog_id>/', blog_detail_view, name='blog-detail'), # GET|PUT|DELETE /api/blogs/{id}/
     path('api/blogs/<uuid:blog_id>/like/', toggle_like_view, name='toggle-like'),         # POST|DELETE /api/blogs/{id}/like/
     path('api/blogs/<uuid:blog_id>/wishlist/', toggle_wishlist_view, name='toggle-wishlist'), # POST|DELETE /api/blogs/{id}/wishlist/
+    path('api/blogs/<uuid:blog_id>/comments/', blog_comments_view, name='blog-comments'),  # GET|POST /api/blogs/{id}/comments/
+    path('api/blogs/<uuid:blog_id>/related/', related_blogs_view, name='blog-related'),    # GET /api/blogs/{id}/related/
+    path('api/blogs/<uuid:blog_id>/also-liked/', also_liked_view, name='blog-also-liked'), # GET /api/blogs/{id}/also-liked/
+    
+    # ✅ Health Endpoints
+    path('api/health/', health_view, name='health'),                       # GET /api/health/
+    path('api/diagnostics/', diagnostics_view, name='diagnostics'),        # GET /api/diagnostics/
     
     # ✅ User Endpoints
     path('api/user/profile/', user_profile_view, name='user-profile'),     # GET /api/user/profile/
     path('api/user/wishlist/', user_wishlist_view, name='user-wishlist'),  # GET /api/user/wishlist/
+    path('api/feed/home/', home_feed_view, name='home-feed'),               # GET /api/feed/home/
+    
+    # ✅ Author Endpoints
+    path('api/authors/<str:username>/', author_profile_view, name='author-profile'),      # GET /api/authors/{username}/
+    path('api/authors/<str:username>/follow/', follow_author_view, name='follow-author'),  # POST|DELETE /api/authors/{username}/follow/
 ]
 
 # Static files for development
@@ -0,0 +1,140 @@
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .author_stats import add_author_views
+from .queries import FLUSH_VIEW_COUNTS, execute
+from .trending import bump_trending_views
+
+logger = logging.getLogger(__name__)
+
+# ========================================
+# 👀 BUFFERED VIEW COUNTS
+# ========================================
+#
+# Reading a blog used to run UPDATE ... SET view_count = view_count + 1,
+# turning every read into a row-locking write. Views are now counted in
+# memory and written in one batched UPDATE ... FROM unnest(...) every
+# VIEW_COUNT_FLUSH_INTERVAL seconds, or sooner once
+# VIEW_COUNT_FLUSH_THRESHOLD views are pending.
+#
+# Loss is bounded: a crashed worker loses at most one interval of views,
+# and if the database is unreachable at most VIEW_COUNT_MAX_PENDING views
+# are held for retry (anything beyond that is dropped and counted).
+
+
+class ViewCountBuffer:
+
+    def __init__(self, flush_interval, flush_threshold, max_pending):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._pending = 0
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+        self.flushed_total = 0
+        self.dropped_total = 0
+        self.last_flush_at = None
+        self.last_error = None
+
+    def record(self, blog_id):
+        """Count one view; never touches the database"""
+        self._ensure_flusher()
+        with self._lock:
+            self._counts[str(blog_id)] += 1
+            self._pending += 1
+            full = self._pending >= self.flush_threshold
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all pending views in a single statement"""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            pending, self._pending = self._pending, 0
+        if not counts:
+            return 0
+
+        # Sorted ids give every worker the same lock order - no deadlocks
+        rows = sorted(counts.items())
+        blog_ids, views = zip(*rows)
+        try:
+            # Counters, trending scores and author totals move together, or the batch is retried whole
+            with transaction.atomic(), connection.cursor() as cursor:
+                execute(cursor, FLUSH_VIEW_COUNTS, [list(blog_ids), list(views)])
+                bump_trending_views(cursor, rows)
+                add_author_views(cursor, rows)
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning('View count flush failed, keeping %s views for retry: %s', pending, e)
+            self._requeue(counts, pending)
+            return 0
+
+        self.flushed_total += pending
+        self.last_flush_at = datetime.now()
+        self.last_error = None
+        return pending
+
+    def stats(self):
+        with self._lock:
+            pending, pending_blogs = self._pending, len(self._counts)
+        return {
+            'pending_views': pending,
+            'pending_blogs': pending_blogs,
+            'flushed_total': self.flushed_total,
+            'dropped_total': self.dropped_total,
+            'last_flush_at': self.last_flush_at.isoformat() if self.last_flush_at else None,
+            'last_error': self.last_error,
+            'flush_interval_seconds': self.flush_interval,
+            'flush_threshold': self.flush_threshold,
+        }
+
+    def _requeue(self, counts, pending):
+        with self._lock:
+            if self._pending + pending > self.max_pending:
+                self.dropped_total += pending
+                return
+            self._counts.update(counts)
+            self._pending += pending
+
+    def _ensure_flusher(self):
+        # Started lazily and per process, so it survives gunicorn's fork
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='view-count-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                # This thread owns its own connection; don't leave it open between flushes
+                connection.close()
+
+
+view_buffer = ViewCountBuffer(
+    flush_interval=getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 10),
+    flush_threshold=getattr(settings, 'VIEW_COUNT_FLUSH_THRESHOLD', 500),
+    max_pending=getattr(settings, 'VIEW_COUNT_MAX_PENDING', 100000),
+)
+
+# Flush whatever is left when the worker shuts down gracefully
+atexit.register(view_buffer.flush)
@@ -8,5 +8,6 @@ pip install -r requirements.txt
 # Collect static files
 python manage.py collectstatic --no-input
 
-# Run migrations
+# Run migrations (adopt_user_model is a no-op once public.users is adopted)
+python manage.py adopt_user_model
 python manage.py migrate
@@ -5,9 +5,11 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_api.settings')
 django.setup()
 
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
 from django.db import transaction
 
+User = get_user_model()
+
 def create_test_data():
     """Create test data for local development"""
     
@@ -21,11 +23,12 @@ def create_test_data():
     with transaction.atomic():
         for user_data in users_data:
             user, created = User.objects.get_or_create(
-                username=user_data['username'],
+                email=user_data['email'],
                 defaults={
-                    'email': user_data['email'],
+                    'username': user_data['username'],
                     'first_name': user_data['first_name'],
                     'last_name': user_data['last_name'],
+                    'name': f"{user_data['first_name']} {user_data['last_name']}",
                 }
             )
             if created:
@@ -0,0 +1,14 @@
+import os
+
+# Threaded workers: each process serves GUNICORN_THREADS requests at once.
+# Login/signup hashes run on the per-process pool in blog_api/passwords.py
+# (PASSWORD_HASH_WORKERS running + PASSWORD_HASH_MAX_QUEUE waiting), which is
+# smaller than the thread count, so a burst beyond it is answered 503 while
+# the other threads keep serving reads. With sync workers a process never
+# has more than one hash in flight and that bound could not apply.
+# DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW should cover the thread count.
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))